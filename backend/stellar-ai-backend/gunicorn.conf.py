@@ -0,0 +1,23 @@
+# Multi-worker serving: gunicorn -c gunicorn.conf.py (run from backend/stellar-ai-backend)
+import multiprocessing
+import os
+
+wsgi_app = "src.wsgi:app"
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Threaded workers: every open dashboard holds one thread on /stream. Streams are capped per worker
+# (later ones get a 503 and the dashboard polls instead), and the threads beyond the cap serve the API,
+# so viewers on streams top out at workers x MAX_STREAMS_PER_WORKER
+worker_class = "gthread"
+max_streams_per_worker = int(os.environ.get("MAX_STREAMS_PER_WORKER", 24))
+threads = int(os.environ.get("THREADS_PER_WORKER", max_streams_per_worker + 8))
+raw_env = [f"MAX_STREAMS_PER_WORKER={max_streams_per_worker}"]
+# Engine threads and SQLite connections must be created in each worker, after the fork
+preload_app = False
+
+
+def worker_exit(server, worker):
+    # Hand the collector lease over now instead of letting it expire
+    from src.routes.ai_strategies_simple import market_engine
+    if market_engine.coordinator is not None:
+        market_engine.coordinator.stop()
@@ -1,11 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 import requests
 import json
+import os
 from datetime import datetime, timedelta
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
 import pandas as pd
+from src.services.backtest import run_backtest_job
+from src.services.batch_indicators import calculate_indicators_batch
+from src.services.flat_forest import FlatForest
+from src.services.http_client import http_client
+from src.services.mock_data import DEFAULT_BASE_PRICE, generate_mock_panel
+from src.services.model_store import ModelStore
+from src.services.parameter_sweep import parameter_sweeps
+from src.services.strategy_signals import (
+    DEFAULT_STRATEGY_CONFIG, MODEL_CONFIG_KEYS, load_strategy_config, save_strategy_config, signal_confidence
+)
+from src.services.training import STRATEGY_FEATURE_NAMES, fit_forest_bundle, rank_feature_importances
+from src.services.training_jobs import training_jobs
 
 ai_strategies_bp = Blueprint('ai_strategies', __name__)
 
@@ -13,11 +24,57 @@ ai_strategies_bp = Blueprint('ai_strategies', __name__)
 SOROSWAP_API_BASE = "https://soroswap-api-staging-436722401508.us-central1.run.app"
 API_KEY = "sk_e2acb3e0b5248f286023ef7ce9a5cde7e087c12579ae85fb3e9e318aeb11c6ce"
 
+# Versioned model artifacts (model, scaler, feature names, training metadata)
+MODEL_ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'model_artifacts')
+
+# Random forest seed; tree count and depth come from the strategy config
+MODEL_RANDOM_STATE = 42
+
+# "flat": predict from the forest exported to flat node arrays (same results, far less per-call
+# overhead); "sklearn": scaler.transform + model.predict
+INFERENCE_BACKEND = "flat"
+FLAT_FOREST_MAX_ROWS = 256  # Larger batches go to sklearn's compiled traversal, which wins past ~250 rows
+
+# Signal thresholds, confidence multipliers and forest settings promoted from parameter sweeps
+STRATEGY_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'strategy_config.json')
+
+# Batch recommendations
+MAX_BATCH_ROWS = 10000  # Feature rows accepted per /strategy-recommendation/batch request
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Walk-forward backtests
+MAX_BACKTEST_BARS = 3 * 365 * 24  # Hourly bars per asset accepted by /backtest
+MAX_BACKTEST_ASSETS = 100
+
+# Parameter sweeps
+MAX_SWEEP_BARS = 365 * 24  # Hourly mock bars per asset a sweep may generate
+MAX_SWEEP_ASSETS = 50
+
 class AIStrategyEngine:
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.is_trained = False
+    def __init__(self, model_store=None, config_path=None, inference_backend=INFERENCE_BACKEND):
+        # {"model", "scaler", "feature_names", "top_features", "metadata"}; replaced as a whole so predictions
+        # always see one consistent model, never a half-swapped or half-trained one
+        self.active_model = None
+        self.model_store = model_store
+        self.config_path = config_path
+        self.strategy_config = load_strategy_config(config_path)  # Replaced as a whole, like active_model
+        self.inference_backend = inference_backend
+    
+    @property
+    def is_trained(self):
+        return self.active_model is not None
+    
+    @property
+    def feature_names(self):
+        return self.active_model["feature_names"] if self.active_model else None
+    
+    @property
+    def training_metadata(self):
+        return self.active_model["metadata"] if self.active_model else {}
+    
+    @property
+    def model_version(self):
+        return self.training_metadata.get("version")
     
     def process_real_market_data_for_ai(self, market_data):
         """Convert real Soroswap market data into AI-ready technical indicators"""
@@ -175,7 +232,7 @@ class AIStrategyEngine:
             
             # Try to fetch Soroswap data - use working endpoint
             try:
-                response = requests.get(f"{SOROSWAP_API_BASE}/api/tokens", headers=headers, timeout=10)
+                response = http_client.get(f"{SOROSWAP_API_BASE}/api/tokens", headers=headers, timeout=10)
                 if response.status_code == 200:
                     soroswap_data = response.json()
                     market_data["soroswap"] = {
@@ -230,56 +287,27 @@ class AIStrategyEngine:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def generate_mock_historical_data(self, days=30):
-        """Generate realistic historical data with proper market patterns"""
+    def generate_mock_historical_data(self, days=30, n_assets=1, seed=42, base_prices=DEFAULT_BASE_PRICE):
+        """Generate realistic historical data with proper market patterns
+
+        One asset returns the usual OHLCV frame; several return one long frame with an
+        'asset' column (0..n_assets-1), sorted by asset then time.
+        """
         # Use hourly data for better technical analysis
         periods = days * 24  # 24 hours per day
-        dates = pd.date_range(end=datetime.now(), periods=periods, freq='H')
-        
-        # Simulate realistic price movements for XLM/USDC with market trends
-        np.random.seed(42)
-        base_price = 0.1247  # Current XLM price from real market data
-        
-        prices = []
-        volumes = []
+        dates = pd.date_range(end=datetime.now(), periods=periods, freq='h')
+        panel = generate_mock_panel(n_assets, periods, seed=seed, base_prices=base_prices)
         
-        for i in range(periods):
-            # Add trend component (gradual change over time)
-            trend = 0.0001 * i / 24  # Small daily trend
-            
-            # Add cyclical component (daily patterns)
-            cycle = 0.003 * np.sin(2 * np.pi * i / 24)  # 24-hour cycle
-            
-            # Add random walk component with realistic volatility
-            if i == 0:
-                price_change = 0
-            else:
-                price_change = np.random.normal(0, 0.015)  # 1.5% hourly volatility
-            
-            price = base_price + trend + cycle + (price_change * base_price)
-            prices.append(max(price, 0.01))  # Ensure positive prices
-            
-            # Generate realistic volume (higher volume during price movements)
-            base_volume = 500000
-            volume_multiplier = 1 + abs(price_change) * 10  # Higher volume on big moves
-            volume = base_volume * volume_multiplier * np.random.uniform(0.3, 2.5)
-            volumes.append(volume)
-        
-        # Create DataFrame with OHLCV data
         df = pd.DataFrame({
-            'timestamp': dates,
-            'close': prices,
-            'volume': volumes
+            'timestamp': np.tile(dates.values, n_assets),
+            'close': panel['close'].ravel(),
+            'volume': panel['volume'].ravel(),
+            'high': panel['high'].ravel(),
+            'low': panel['low'].ravel(),
+            'open': panel['open'].ravel()
         })
-        
-        # Calculate OHLC from close prices (simulate intraday movements)
-        df['high'] = df['close'] * np.random.uniform(1.001, 1.02, len(df))
-        df['low'] = df['close'] * np.random.uniform(0.98, 0.999, len(df))
-        df['open'] = df['close'].shift(1).fillna(df['close'].iloc[0])
-        
-        # Ensure OHLC logic (High >= Close >= Low, etc.)
-        df['high'] = np.maximum(df['high'], np.maximum(df['open'], df['close']))
-        df['low'] = np.minimum(df['low'], np.minimum(df['open'], df['close']))
+        if n_assets > 1:
+            df.insert(0, 'asset', np.repeat(np.arange(n_assets), periods))
         
         return df
     
@@ -344,6 +372,10 @@ class AIStrategyEngine:
         
         return df
     
+    def calculate_technical_indicators_batch(self, close, high, low, volume, last_n=None):
+        """Calculate the same indicators for many tokens at once from (tokens x time) arrays"""
+        return calculate_indicators_batch(close, high, low, volume, last_n=last_n)
+    
     def calculate_atr(self, df, period=14):
         """Calculate Average True Range"""
         high_low = df['high'] - df['low']
@@ -355,21 +387,10 @@ class AIStrategyEngine:
         
         return atr
     
-    def train_model(self, df):
-        """Train the AI model with comprehensive technical analysis features"""
+    def prepare_training_data(self, df):
+        """Feature matrix, next-period returns and feature names for training, or None if too little data"""
         # Define comprehensive feature set for AI model
-        features = [
-            'sma_7', 'sma_14', 'sma_21', 'sma_50',  # Moving averages
-            'ema_12', 'ema_26',  # Exponential moving averages
-            'macd', 'macd_signal', 'macd_histogram',  # MACD indicators
-            'rsi',  # Relative Strength Index
-            'bb_position', 'bb_width',  # Bollinger Bands
-            'volume_ratio',  # Volume analysis
-            'momentum_5', 'momentum_10', 'momentum_20',  # Momentum indicators
-            'atr', 'volatility_20',  # Volatility measures
-            'support_distance', 'resistance_distance',  # Support/Resistance
-            'higher_highs', 'lower_lows'  # Market strength
-        ]
+        features = list(STRATEGY_FEATURE_NAMES)
         
         # Create target variable (next period return for prediction)
         df['next_return'] = df['close'].pct_change().shift(-1)
@@ -382,75 +403,123 @@ class AIStrategyEngine:
         
         if len(clean_df) < 50:  # Ensure sufficient training data
             print(f"Insufficient training data: {len(clean_df)} samples")
-            return False
-        
-        X = clean_df[features]
-        y = clean_df['next_return']
-        
-        # Scale features for better model performance
-        X_scaled = self.scaler.fit_transform(X)
+            return None
         
-        # Train the Random Forest model
-        self.model.fit(X_scaled, y)
-        self.is_trained = True
+        X = clean_df[features].to_numpy()
+        y = clean_df['next_return'].to_numpy()
+        return X, y, features
+    
+    def train_model(self, df):
+        """Train the AI model in-process and serve it (training jobs use fit_forest_bundle directly)"""
+        training_set = self.prepare_training_data(df)
+        if training_set is None:
+            return False
         
-        # Store feature names for later use
-        self.feature_names = features
+        bundle, metadata = fit_forest_bundle(*training_set, random_state=MODEL_RANDOM_STATE, **self.model_settings())
+        self.install_model(bundle, metadata)
         
-        print(f"Model trained successfully with {len(clean_df)} samples and {len(features)} features")
+        print(f"Model trained successfully with {metadata['training_samples']} samples and {metadata['n_features']} features")
+        return True
+    
+    def model_settings(self):
+        """Forest settings (n_estimators, max_depth) from the strategy config"""
+        return {key: self.strategy_config[key] for key in MODEL_CONFIG_KEYS}
+    
+    def promote_config(self, settings):
+        """Apply swept settings now and persist them; forest settings take effect at the next training"""
+        config = {**self.strategy_config, **settings}
+        if self.config_path:
+            save_strategy_config(self.config_path, config)
+        self.strategy_config = config
+        return config
+    
+    def sync_with_store(self):
+        """Multi-worker mode: pick up a model saved or rolled back and a config promoted by another worker"""
+        if self.model_store is not None and self.model_store.current_version() not in (None, self.model_version):
+            self.load_artifact()
+        config = load_strategy_config(self.config_path)
+        if config != self.strategy_config:
+            self.strategy_config = config
+    
+    def install_model(self, bundle, metadata):
+        """Atomically swap in a fitted bundle; in-flight predictions keep the model they started with"""
+        if "top_features" not in bundle:
+            # Artifacts saved before importances were ranked at training time
+            bundle = {**bundle, "top_features": rank_feature_importances(bundle["model"], bundle["feature_names"])}
+        if self.inference_backend == "flat":
+            # Exported once per model; never persisted, rebuilt whenever a version is loaded
+            bundle = {**bundle, "flat_model": FlatForest(bundle["model"], bundle["scaler"])}
+        self.active_model = {**bundle, "metadata": metadata}
+    
+    def install_trained_model(self, bundle, metadata, **extra_metadata):
+        """Training job completion: serve the new model and persist it as the current version"""
+        self.install_model(bundle, metadata)
+        version = self.save_artifact(**extra_metadata)
+        return {
+            "model_version": version,
+            "training_samples": metadata["training_samples"],
+            "features_used": bundle["feature_names"],
+            "model_type": "Random Forest Regressor"
+        }
+    
+    def save_artifact(self, **metadata):
+        """Persist the served model, scaler and feature names as a new current version"""
+        active = self.active_model
+        bundle = {key: active[key] for key in ("model", "scaler", "feature_names", "top_features")}
+        saved_metadata = self.model_store.save(bundle, {**active["metadata"], **metadata})
+        self.active_model = {**active, "metadata": saved_metadata}
+        return saved_metadata["version"]
+    
+    def load_artifact(self, version=None):
+        """Load a saved version (current by default) with memory-mapped arrays; False if none exists"""
+        bundle, metadata = self.model_store.load(version)
+        if bundle is None:
+            return False
+        self.install_model(bundle, metadata)
         return True
     
     def predict_strategy(self, current_data):
         """Predict investment strategy using comprehensive AI analysis"""
-        if not self.is_trained:
-            return {"error": "Model not trained"}
+        return self.predict_strategy_batch([current_data])[0]
+    
+    def predict_strategy_batch(self, rows):
+        """Predict strategies for many feature dicts with one scale + predict pass; one result per row"""
+        # One read of the served model; a concurrent swap can't mix old and new parts
+        active = self.active_model
+        if active is None:
+            return [{"error": "Model not trained"} for _ in rows]
+        if not rows:
+            return []
         
         try:
             # Extract comprehensive features from current data using the same features as training
-            if not hasattr(self, 'feature_names'):
-                return {"error": "Feature names not stored during training"}
-            
-            features = []
-            for feature_name in self.feature_names:
-                features.append(current_data.get(feature_name, 0))
-            
-            # Scale features using the fitted scaler
-            features_scaled = self.scaler.transform([features])
+            X = np.array([[row.get(name, 0) for name in active["feature_names"]] for row in rows], dtype=np.float64)
             
-            # Make prediction using the trained Random Forest model
-            predicted_return = self.model.predict(features_scaled)[0]
-            
-            # Calculate additional AI insights
-            feature_importance = self.model.feature_importances_
-            most_important_features = sorted(
-                zip(self.feature_names, feature_importance), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5]
-            
-            # Generate confidence score based on model prediction and feature strength
-            base_confidence = min(abs(predicted_return) * 20, 0.95)
+            # Scale and predict every row at once with the fitted scaler and Random Forest
+            if "flat_model" in active and len(X) <= FLAT_FOREST_MAX_ROWS:
+                predicted_returns = active["flat_model"].predict(X)
+            else:
+                predicted_returns = active["model"].predict(active["scaler"].transform(X))
+        except Exception as e:
+            return [{"error": f"Prediction error: {str(e)}"} for _ in rows]
+        
+        config = self.strategy_config
+        return [self.build_strategy(float(predicted_return), row, active, config)
+                for predicted_return, row in zip(predicted_returns, rows)]
+    
+    def build_strategy(self, predicted_return, current_data, active, config):
+        """Strategy, confidence and market analysis for one predicted return"""
+        try:
+            feature_names = active["feature_names"]
+            most_important_features = active["top_features"]  # Ranked once at training time
             
-            # Adjust confidence based on RSI and other technical indicators
+            # Confidence from the prediction, adjusted by RSI reversals/neutral zone and volume confirmation
             rsi = current_data.get('rsi', 50)
             volume_ratio = current_data.get('volume_ratio', 1)
-            
-            # RSI-based confidence adjustment
-            if (predicted_return > 0 and rsi < 30) or (predicted_return < 0 and rsi > 70):
-                base_confidence *= 1.2  # Higher confidence for oversold/overbought reversals
-            elif 40 <= rsi <= 60:
-                base_confidence *= 0.8  # Lower confidence in neutral zone
-            
-            # Volume confirmation
-            if volume_ratio > 1.5:  # High volume confirms signal
-                base_confidence *= 1.1
-            elif volume_ratio < 0.5:  # Low volume reduces confidence
-                base_confidence *= 0.8
-            
-            confidence = min(base_confidence, 0.95)
+            confidence = float(signal_confidence(predicted_return, rsi, volume_ratio, config))
             
             # Generate detailed strategy recommendation based on AI prediction
-            if predicted_return > 0.02:  # > 2% expected return
+            if predicted_return > config["strong_signal_return"]:  # > 2% expected return by default
                 strategy = "AGGRESSIVE_BUY"
                 reasoning_parts = [
                     f"AI predicts {predicted_return*100:.2f}% return",
@@ -464,7 +533,7 @@ class AIStrategyEngine:
                     "suggested_percentage": min(70 + int(predicted_return * 500), 80),
                     "reasoning": " | ".join(reasoning_parts)
                 }
-            elif predicted_return > 0.005:  # > 0.5% expected return
+            elif predicted_return > config["moderate_signal_return"]:  # > 0.5% expected return by default
                 strategy = "MODERATE_BUY"
                 reasoning_parts = [
                     f"AI predicts {predicted_return*100:.2f}% return",
@@ -477,7 +546,7 @@ class AIStrategyEngine:
                     "suggested_percentage": min(40 + int(predicted_return * 1000), 60),
                     "reasoning": " | ".join(reasoning_parts)
                 }
-            elif predicted_return < -0.02:  # < -2% expected return
+            elif predicted_return < -config["strong_signal_return"]:  # < -2% expected return by default
                 strategy = "SELL"
                 reasoning_parts = [
                     f"AI predicts {predicted_return*100:.2f}% decline",
@@ -491,7 +560,7 @@ class AIStrategyEngine:
                     "suggested_percentage": min(70 + abs(int(predicted_return * 500)), 85),
                     "reasoning": " | ".join(reasoning_parts)
                 }
-            elif predicted_return < -0.005:  # < -0.5% expected return
+            elif predicted_return < -config["moderate_signal_return"]:  # < -0.5% expected return by default
                 strategy = "MODERATE_SELL"
                 reasoning_parts = [
                     f"AI predicts {predicted_return*100:.2f}% decline",
@@ -558,14 +627,19 @@ class AIStrategyEngine:
                     }
                 },
                 "ai_powered": True,
-                "model_features": len(self.feature_names)
+                "model_features": len(feature_names)
             }
             
         except Exception as e:
             return {"error": f"Prediction error: {str(e)}"}
 
-# Initialize the AI engine
-ai_engine = AIStrategyEngine()
+# Initialize the AI engine and warm-start it from the current saved model, if any
+ai_engine = AIStrategyEngine(model_store=ModelStore(MODEL_ARTIFACTS_DIR), config_path=STRATEGY_CONFIG_PATH)
+try:
+    if ai_engine.load_artifact():
+        print(f"Loaded model {ai_engine.model_version} from {MODEL_ARTIFACTS_DIR}")
+except Exception as e:
+    print(f"Could not load saved model, train one with /train-model: {e}")
 
 @ai_strategies_bp.route('/market-data', methods=['GET'])
 def get_market_data():
@@ -575,36 +649,36 @@ def get_market_data():
 
 @ai_strategies_bp.route('/train-model', methods=['POST'])
 def train_model():
-    """Train the AI model with historical data"""
+    """Start a background training job; poll /training-jobs/<job_id> for progress"""
     try:
         # Generate mock historical data for demonstration
         historical_data = ai_engine.generate_mock_historical_data(30)
         
         # Calculate technical indicators
         processed_data = ai_engine.calculate_technical_indicators(historical_data)
+        training_set = ai_engine.prepare_training_data(processed_data)
         
-        # Train the model
-        success = ai_engine.train_model(processed_data)
-        
-        if success:
-            return jsonify({
-                "status": "success",
-                "message": "AI model trained successfully with comprehensive technical analysis",
-                "data_points": len(processed_data),
-                "features_used": ai_engine.feature_names if hasattr(ai_engine, 'feature_names') else [
-                    "sma_7", "sma_14", "sma_21", "sma_50", "ema_12", "ema_26",
-                    "macd", "macd_signal", "macd_histogram", "rsi", "bb_width", "bb_position",
-                    "atr", "volume_ratio", "volume_sma", "momentum", "momentum_3", "momentum_5",
-                    "support_level", "resistance_level"
-                ],
-                "model_type": "Random Forest Regressor",
-                "ai_powered": True
-            })
-        else:
+        if training_set is None:
             return jsonify({
                 "status": "error",
                 "message": "Insufficient data to train model"
             }), 400
+        
+        # Fit in a worker process; the finished model is swapped in and persisted as a new version
+        job = training_jobs.submit(
+            "ai_strategy_model", fit_forest_bundle, *training_set,
+            random_state=MODEL_RANDOM_STATE, **ai_engine.model_settings(),
+            on_success=lambda result: ai_engine.install_trained_model(
+                *result, data_source="mock_historical_data", days=30)
+        )
+        
+        return jsonify({
+            "status": "accepted",
+            "message": "Training job started",
+            "job_id": job["job_id"],
+            "job": job,
+            "data_points": len(processed_data)
+        }), 202
             
     except Exception as e:
         return jsonify({
@@ -612,6 +686,48 @@ def train_model():
             "message": f"Training failed: {str(e)}"
         }), 500
 
+@ai_strategies_bp.route('/training-jobs', methods=['GET'])
+def list_training_jobs():
+    """List recent training jobs, newest first"""
+    return jsonify({
+        "status": "success",
+        "jobs": training_jobs.list_jobs()
+    })
+
+@ai_strategies_bp.route('/training-jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Get a training job's status, progress and result"""
+    job = training_jobs.status(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown training job {job_id}"
+        }), 404
+    return jsonify({
+        "status": "success",
+        "job": job
+    })
+
+@ai_strategies_bp.route('/training-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    """Cancel a queued training job or stop a running one at its next checkpoint"""
+    if training_jobs.status(job_id) is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown training job {job_id}"
+        }), 404
+    if not training_jobs.cancel(job_id):
+        return jsonify({
+            "status": "error",
+            "message": "Training job already finished",
+            "job": training_jobs.status(job_id)
+        }), 409
+    return jsonify({
+        "status": "success",
+        "message": "Cancellation requested",
+        "job": training_jobs.status(job_id)
+    })
+
 @ai_strategies_bp.route('/strategy-recommendation', methods=['POST'])
 def get_strategy_recommendation():
     """Get AI-powered investment strategy recommendation using REAL market data"""
@@ -619,12 +735,12 @@ def get_strategy_recommendation():
         # Get current market conditions from request
         data = request.get_json() or {}
         
-        # Ensure the model is trained
+        # Models are trained by /train-model or loaded at startup, never inside this request
         if not ai_engine.is_trained:
-            # Auto-train with sample data if needed
-            historical_data = ai_engine.generate_mock_historical_data(100)
-            processed_data = ai_engine.calculate_technical_indicators(historical_data)
-            ai_engine.train_model(processed_data)
+            return jsonify({
+                "status": "error",
+                "message": "Model not trained. Train one with /train-model or roll back to a saved version with /models/rollback."
+            }), 400
         
         # PRIORITY: Use REAL market data from Soroswap for AI analysis
         market_data = ai_engine.fetch_market_data()
@@ -735,6 +851,239 @@ def get_strategy_recommendation():
             }
         }), 500
 
+def parse_feature_rows():
+    """Feature dicts from a JSON array ({"rows": [...]} also accepted) or an NDJSON request body"""
+    if request.mimetype == NDJSON_MIMETYPE:
+        lines = request.get_data(as_text=True).splitlines()
+        rows = [json.loads(line) for line in lines if line.strip()]
+    else:
+        rows = request.get_json(force=True, silent=False)
+        if isinstance(rows, dict):
+            rows = rows.get('rows')
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array of feature objects")
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {index} is not a JSON object")
+    return rows
+
+@ai_strategies_bp.route('/strategy-recommendation/batch', methods=['POST'])
+def get_strategy_recommendations_batch():
+    """Strategy recommendations for many caller-supplied feature rows in one model pass"""
+    if not ai_engine.is_trained:
+        return jsonify({
+            "status": "error",
+            "message": "Model not trained. Train one with /train-model or roll back to a saved version with /models/rollback."
+        }), 400
+    
+    try:
+        rows = parse_feature_rows()
+    except Exception as e:  # Malformed JSON/NDJSON or non-object rows
+        return jsonify({"status": "error", "message": f"Invalid batch request: {str(e)}"}), 400
+    
+    if len(rows) > MAX_BATCH_ROWS:
+        return jsonify({
+            "status": "error",
+            "message": f"Batch of {len(rows)} rows exceeds the limit of {MAX_BATCH_ROWS}"
+        }), 413
+    
+    try:
+        predictions = ai_engine.predict_strategy_batch(rows)
+        for row, prediction in zip(rows, predictions):
+            if 'id' in row:
+                prediction['id'] = row['id']  # Lets callers match results to their rows
+        
+        if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+            body = ''.join(json.dumps(prediction) + '\n' for prediction in predictions)
+            return current_app.response_class(body, mimetype=NDJSON_MIMETYPE)
+        
+        return jsonify({
+            "status": "success",
+            "count": len(predictions),
+            "model_version": ai_engine.model_version,
+            "recommendations": predictions,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Batch strategy recommendation failed: {str(e)}"
+        }), 500
+
+@ai_strategies_bp.route('/backtest', methods=['POST'])
+def run_backtest():
+    """Start a walk-forward backtest of the strategy signals over hourly OHLCV (posted "prices" or mock data)
+    as a background job; poll /training-jobs/<job_id> for progress and the result"""
+    try:
+        data = request.get_json(silent=True) or {}
+        prices = data.get('prices')
+        if prices:
+            # Caller-supplied (assets x bars) arrays, e.g. a stored price series
+            panel = {key: np.atleast_2d(np.asarray(prices[key], dtype=np.float64))
+                     for key in ('close', 'high', 'low', 'volume')}
+            if len({array.shape for array in panel.values()}) != 1:
+                raise ValueError("close, high, low and volume must have the same shape")
+            n_assets, n_bars = panel['close'].shape
+        else:
+            n_assets, n_bars = int(data.get('n_assets', 10)), int(data.get('days', 365)) * 24
+            if n_assets <= 0 or n_bars <= 0:
+                raise ValueError("days and n_assets must be positive")
+        train_bars = int(data.get('train_days', 60)) * 24
+        test_bars = int(data.get('test_days', 30)) * 24
+        if train_bars <= 0 or test_bars <= 0:
+            raise ValueError("train_days and test_days must be positive")
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": f"Invalid backtest request: {str(e)}"}), 400
+    
+    if n_bars > MAX_BACKTEST_BARS or n_assets > MAX_BACKTEST_ASSETS:
+        return jsonify({
+            "status": "error",
+            "message": f"Backtests are limited to {MAX_BACKTEST_ASSETS} assets x {MAX_BACKTEST_BARS} hourly bars"
+        }), 413
+    
+    def backtest_result(result):
+        if result is None:
+            raise ValueError(f"Not enough data: need more than {train_bars} bars for one walk-forward window")
+        return {
+            "data_source": "posted_prices" if prices else "mock_historical_data",
+            "backtest": result
+        }
+    
+    try:
+        # One forest is fit per fold, far too slow for the request thread at the larger limits
+        job = training_jobs.submit(
+            "backtest", run_backtest_job,
+            prices=panel if prices else None,
+            n_assets=n_assets, n_bars=n_bars, seed=data.get('seed', MODEL_RANDOM_STATE),
+            train_bars=train_bars, test_bars=test_bars,
+            allow_short=bool(data.get('allow_short', False)),
+            config=ai_engine.strategy_config,
+            random_state=MODEL_RANDOM_STATE,
+            on_success=backtest_result
+        )
+        
+        return jsonify({
+            "status": "accepted",
+            "message": "Backtest job started",
+            "job_id": job["job_id"],
+            "job": job
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Backtest failed: {str(e)}"
+        }), 500
+
+@ai_strategies_bp.route('/sweeps', methods=['POST'])
+def start_parameter_sweep():
+    """Start a grid or random sweep over signal thresholds, confidence multipliers and forest settings"""
+    try:
+        data = request.get_json(silent=True) or {}
+        n_assets, n_bars = int(data.get('n_assets', 5)), int(data.get('days', 90)) * 24
+        if n_assets <= 0 or n_bars <= 0:
+            raise ValueError("days and n_assets must be positive")
+        if n_assets > MAX_SWEEP_ASSETS or n_bars > MAX_SWEEP_BARS:
+            raise ValueError(f"Sweeps are limited to {MAX_SWEEP_ASSETS} assets x {MAX_SWEEP_BARS // 24} days")
+        n_samples = data.get('n_samples')
+        seed = data.get('seed', MODEL_RANDOM_STATE)
+        panel = generate_mock_panel(n_assets, n_bars, seed=seed)
+        sweep = parameter_sweeps.submit(
+            panel, space=data.get('space'), mode=data.get('mode', 'grid'),
+            n_samples=int(n_samples) if n_samples is not None else None, seed=seed,
+            inference_backend=ai_engine.inference_backend
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": f"Invalid sweep request: {str(e)}"}), 400
+    
+    return jsonify({
+        "status": "accepted",
+        "message": "Parameter sweep started on mock historical data",
+        "sweep_id": sweep["sweep_id"],
+        "sweep": sweep
+    }), 202
+
+@ai_strategies_bp.route('/sweeps', methods=['GET'])
+def list_parameter_sweeps():
+    """List recent parameter sweeps, newest first"""
+    return jsonify({
+        "status": "success",
+        "sweeps": parameter_sweeps.list_sweeps()
+    })
+
+@ai_strategies_bp.route('/sweeps/<sweep_id>', methods=['GET'])
+def get_parameter_sweep(sweep_id):
+    """Get a sweep's progress, Pareto front (accuracy vs inference latency) and best candidates"""
+    sweep = parameter_sweeps.status(sweep_id)
+    if sweep is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown sweep {sweep_id}"
+        }), 404
+    return jsonify({
+        "status": "success",
+        "sweep": sweep
+    })
+
+@ai_strategies_bp.route('/sweeps/<sweep_id>/promote', methods=['POST'])
+def promote_sweep_candidate(sweep_id):
+    """Make a sweep candidate the live strategy config (default: the most accurate Pareto-front point)"""
+    sweep = parameter_sweeps.status(sweep_id, top=0)
+    if sweep is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown sweep {sweep_id}"
+        }), 404
+    if sweep["status"] != "succeeded":
+        return jsonify({
+            "status": "error",
+            "message": f"Sweep is {sweep['status']}; only finished sweeps can be promoted"
+        }), 409
+    
+    data = request.get_json(silent=True) or {}
+    candidate_id = data.get('candidate_id')
+    if candidate_id is not None:
+        try:
+            candidate_id = int(candidate_id)
+        except (TypeError, ValueError):
+            return jsonify({
+                "status": "error",
+                "message": f"Invalid candidate_id {candidate_id!r}: expected an integer"
+            }), 400
+    candidate = parameter_sweeps.candidate(sweep_id, candidate_id)
+    if candidate is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown candidate {candidate_id}"
+        }), 404
+    
+    try:
+        config = ai_engine.promote_config({key: candidate[key] for key in DEFAULT_STRATEGY_CONFIG})
+        metadata = ai_engine.training_metadata
+        return jsonify({
+            "status": "success",
+            "message": "Strategy config promoted",
+            "candidate": candidate,
+            "strategy_config": config,
+            # Thresholds and multipliers apply now; forest settings only once a model is trained with them
+            "retrain_required": any(metadata.get(key) != config[key] for key in MODEL_CONFIG_KEYS)
+        })
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Promotion failed: {str(e)}"
+        }), 500
+
+@ai_strategies_bp.route('/strategy-config', methods=['GET'])
+def get_strategy_config():
+    """Get the live signal thresholds, confidence multipliers and forest settings"""
+    return jsonify({
+        "status": "success",
+        "strategy_config": ai_engine.strategy_config,
+        "defaults": DEFAULT_STRATEGY_CONFIG
+    })
+
 @ai_strategies_bp.route('/portfolio-analysis', methods=['POST'])
 def analyze_portfolio():
     """Analyze user's portfolio and suggest optimizations"""
@@ -781,9 +1130,58 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "model_trained": ai_engine.is_trained,
+        "model_version": ai_engine.model_version,
+        "inference_backend": ai_engine.inference_backend,
         "timestamp": datetime.now().isoformat()
     })
 
+@ai_strategies_bp.route('/models', methods=['GET'])
+def list_models():
+    """List saved model versions and which one is being served"""
+    return jsonify({
+        "status": "success",
+        "serving_version": ai_engine.model_version,
+        "current_version": ai_engine.model_store.current_version(),
+        "models": ai_engine.model_store.list_versions()
+    })
+
+@ai_strategies_bp.route('/models/rollback', methods=['POST'])
+def rollback_model():
+    """Serve a saved model version (the one before the current by default)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        version = data.get('version') or ai_engine.model_store.previous_version()
+        if version is None:
+            return jsonify({
+                "status": "error",
+                "message": "No earlier model version to roll back to"
+            }), 400
+        
+        ai_engine.load_artifact(version)
+        ai_engine.model_store.set_current(version)
+        
+        return jsonify({
+            "status": "success",
+            "message": f"Now serving model {version}",
+            "model": ai_engine.training_metadata
+        })
+        
+    except KeyError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e.args[0])
+        }), 404
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Rollback failed: {str(e)}"
+        }), 500
+
+@ai_strategies_bp.route('/http-client-stats', methods=['GET'])
+def get_http_client_stats():
+    """Connection pool statistics for upstream API calls"""
+    return jsonify(http_client.stats())
+
 @ai_strategies_bp.route('/test-market-processing', methods=['GET'])
 def test_market_processing():
     """Debug endpoint to test market data processing step by step"""
@@ -1,8 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+import os
 import requests
-import json
 import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from src.services.cache import LRUCache, StaleWhileRevalidateCache
+from src.services.endpoint_registry import EndpointRegistry
+from src.services.event_broadcaster import EventBroadcaster
+from src.services.feature_store import MARKET_FEATURE_COLUMNS, FeatureStore, market_feature_row
+from src.services.horizon_stream import HorizonStreamIngestor
+from src.services.http_client import http_client
+from src.services.incremental_indicators import IndicatorBook
+from src.services.online_model import OnlineForest
+from src.services.orderbook_analytics import OrderBookAnalytics
+from src.services.response_cache import CachedResponse, ResponseCache
+from src.services.shared_state import LeaderLease, SharedState
+from src.services.snapshot_scheduler import SnapshotScheduler
+from src.services.timeseries import PriceHistory
+from src.services.training import build_market_training_set, market_feature_vector
+from src.services.training_jobs import TERMINAL_STATES, training_jobs
+from src.services.worker_coordinator import WorkerCoordinator
 
 ai_strategies_bp = Blueprint('ai_strategies', __name__)
 
@@ -12,13 +32,122 @@ HORIZON_TESTNET_API_BASE = "https://horizon-testnet.stellar.org"  # Testnet
 SOROSWAP_API_BASE = "https://api.soroswap.finance"  # Real Soroswap API
 STELLAR_EXPERT_API = "https://api.stellar.expert"  # Stellar Expert API for market data
 
+# Soroswap endpoints to try, in priority order
+SOROSWAP_MARKET_ENDPOINTS = [
+    "/api/v1/pairs",
+    "/api/pairs",
+    "/pairs",
+    "/api/v1/tokens",
+    "/api/tokens",
+    "/tokens"
+]
+
+# Concurrent snapshot collection settings
+MAX_FETCH_WORKERS = 10  # Upper bound on parallel asset fetches per snapshot
+SNAPSHOT_DEADLINE_SECONDS = 15  # Assets not fetched by then are marked late
+
+# Streaming ingestion settings
+STREAM_LEDGER_MAX_AGE_SECONDS = 30  # Fall back to polling if no ledger event arrived in this window
+USDC_ISSUER = "GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVN"  # Circle USDC issuer
+
+# Points kept per token in price_history (fixed memory per token)
+PRICE_HISTORY_CAPACITY = 1000
+
+# Snapshots kept in memory; the snapshot store keeps the full history on disk
+MAX_SNAPSHOTS = 1000
+
+# Market data cache settings
+MARKET_DATA_TTL_SECONDS = 30  # Serve cached market data as fresh for this long
+MARKET_DATA_STALE_SECONDS = 120  # Then serve it stale while one background refresh runs
+
+# Strategy recommendations memoized per (ledger, snapshot, model version)
+RECOMMENDATION_CACHE_SIZE = 256  # Least recently used keys are evicted beyond this
+
+# Conditional GET and compression for JSON responses
+GZIP_MIN_BYTES = 1024  # Smaller bodies are sent uncompressed
+GZIP_LEVEL = 6
+RESPONSE_CACHE_SIZE = 64  # Encoded bodies kept per (endpoint, parameters)
+
+# Dashboard push channel (/stream)
+EVENT_QUEUE_SIZE = 32  # Events queued per client; a slow client loses the oldest first
+EVENT_PUBLISH_INTERVAL_SECONDS = 1  # How often the producer checks for new snapshots, models and market data
+EVENT_KEEPALIVE_SECONDS = 15
+# Each open /stream holds a server thread; beyond this many per worker new streams get a 503, so the
+# rest of the worker's threads stay free for API requests (gunicorn.conf.py sizes threads from it)
+MAX_STREAMS_PER_WORKER = int(os.environ.get("MAX_STREAMS_PER_WORKER", 24))
+STREAM_RETRY_AFTER_SECONDS = 30
+
+# Multi-worker mode: names in the shared SQLite state
+TRAINING_SET_STATE = "market_training_set"  # Latest training set; its version is the model version
+TRAINING_JOB_STATE_PREFIX = "training_job:"  # Each worker mirrors its jobs so any worker can report them
+COLLECTOR_LEASE = "snapshot_collector"  # Held by the one worker that collects snapshots
+
+# Real Stellar assets to track (major assets on Stellar)
+STELLAR_ASSETS = [
+    {"code": "XLM", "issuer": None, "name": "Stellar Lumens"},
+    {"code": "USDC", "issuer": "GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVN", "name": "USD Coin"},
+    {"code": "EURC", "issuer": "GDHU6WRG4IEQXM5NZ4BMPKOXHW76MZM4Y2IEMFDVXBSDP6SJY4ITNPP2", "name": "Euro Coin"},
+    {"code": "yXLM", "issuer": "GARDNV3Q7YGT4AKSDF25LT32YSCCW67OPAW7RJTGPXE2KPNQ9MSHLQM6", "name": "yXLM Ultrastellar"},
+    {"code": "AQUA", "issuer": "GBNZILSTVQZ4R7IKQDGHYGY2QXL5QOFJYQMXPKWRRM5PAV7Y4M67AQUA", "name": "Aquarius"},
+    {"code": "yUSDC", "issuer": "GDGTVWSM4MGS4T7Z6W4RPWOCHE2I6RDFCIFZGS3DOA63LWQTRNZNTTFF", "name": "yUSDC Ultrastellar"},
+    {"code": "LSP", "issuer": "GAB7KPLKLXEJT5Y7OXOLPBJ5FPLIV7QBOMCB3RE5ZRJUQG3GLOE54W3B", "name": "Lumenswap"},
+    {"code": "SRT", "issuer": "GCDNJUBQSX7AJWLJACMJ7I4BC3Z47BQUTMHEICZLE6MU4KQBRYG5JY6B", "name": "Stellar Reference Token"},
+    {"code": "MOBI", "issuer": "GA6HCMBLTZS5VYYBCATRBRZ3BZJMAFUDKYYF6AH6MVCMGWMRDNSWJPIH", "name": "Mobius"},
+    {"code": "VELO", "issuer": "GDM2KBEVKWKCFVKCUYY3OVSXQGW6ZNKS24YCJWGPMYMNFZGCPZ6LOHQH", "name": "Velo"}
+]
+
+def order_book_params(asset_code, asset_issuer):
+    """Horizon /order_book query for an asset priced in USDC"""
+    return {
+        "selling_asset_type": "native" if asset_code == "XLM" else "credit_alphanum4",
+        "selling_asset_code": asset_code if asset_code != "XLM" else None,
+        "selling_asset_issuer": asset_issuer if asset_code != "XLM" else None,
+        "buying_asset_type": "credit_alphanum4",
+        "buying_asset_code": "USDC",
+        "buying_asset_issuer": USDC_ISSUER
+    }
+
+soroswap_registry = EndpointRegistry(SOROSWAP_API_BASE, SOROSWAP_MARKET_ENDPOINTS, http_client)
+
 class SimpleMarketDataEngine:
     def __init__(self):
         self.is_trained = False
         self.training_data = []  # Store historical data points
         self.model_features = []  # Store extracted features
-        self.historical_data = []  # Store time-series market data
-        self.price_history = {}  # Store price history for each token
+        self.historical_data = deque(maxlen=MAX_SNAPSHOTS)  # Store time-series market data
+        self.snapshot_store = None  # Durable store, attached at startup
+        self.next_snapshot_id = 1
+        self.price_history = PriceHistory(capacity=PRICE_HISTORY_CAPACITY)  # Bounded ring buffer per token
+        self.indicators = IndicatorBook()  # Running indicator state per token, O(1) to read
+        self.feature_store = FeatureStore(capacity=MAX_SNAPSHOTS)  # One feature row per snapshot, built at ingestion
+        self.online_model = None  # OnlineForest while online learning is enabled
+        self.shared_state = None  # SharedState in multi-worker mode
+        self.coordinator = None  # WorkerCoordinator in multi-worker mode
+        self.job_manager = training_jobs
+        self._mirrored_jobs = {}  # Job records last written to the shared state
+        self.model_version = 0  # Bumped whenever a new training set is installed
+        self.data_version = 0  # Bumped by every write behind the cached read endpoints
+        self.recommendation_cache = LRUCache(RECOMMENDATION_CACHE_SIZE)
+        self.response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+        self.events = EventBroadcaster(EVENT_QUEUE_SIZE, max_subscribers=MAX_STREAMS_PER_WORKER)
+        self._publisher = None  # Event producer thread, running while anyone is subscribed
+        self._publisher_lock = threading.Lock()
+        self.market_data_cache = StaleWhileRevalidateCache(
+            self.fetch_market_data,
+            ttl_seconds=MARKET_DATA_TTL_SECONDS,
+            stale_seconds=MARKET_DATA_STALE_SECONDS,
+            is_cacheable=lambda data: data.get("status") == "success"
+        )
+        self.stream_ingestor = HorizonStreamIngestor(HORIZON_API_BASE, http_client)
+        self.orderbook_analytics = OrderBookAnalytics()
+    
+    def current_ledger_sequence(self):
+        """Latest ledger sequence known without a request: streamed, else from fresh cached market data"""
+        latest_ledger = self.stream_ingestor.get_latest_ledger(max_age_seconds=STREAM_LEDGER_MAX_AGE_SECONDS)
+        if latest_ledger is not None:
+            return latest_ledger["sequence"]
+        market_data = self.market_data_cache.peek(max_age_seconds=MARKET_DATA_TTL_SECONDS) or {}
+        return market_data.get("stellar_network", {}).get("latest_ledger") or None
     
     def get_real_stellar_asset_data(self, asset_code, asset_issuer=None):
         """Fetch real asset data from Stellar Horizon API"""
@@ -26,7 +155,7 @@ class SimpleMarketDataEngine:
             # For native XLM
             if asset_code == "XLM":
                 # Get XLM price from Stellar Expert
-                response = requests.get(f"{STELLAR_EXPERT_API}/explorer/public/asset/XLM", timeout=10)
+                response = http_client.get(f"{STELLAR_EXPERT_API}/explorer/public/asset/XLM", timeout=10)
                 if response.status_code == 200:
                     data = response.json()
                     return {
@@ -39,7 +168,7 @@ class SimpleMarketDataEngine:
             asset_param = f"{asset_code}:{asset_issuer}" if asset_issuer else asset_code
             
             # Get asset details from Horizon
-            response = requests.get(
+            response = http_client.get(
                 f"{HORIZON_API_BASE}/assets",
                 params={"asset_code": asset_code, "asset_issuer": asset_issuer} if asset_issuer else {"asset_code": asset_code},
                 timeout=10
@@ -50,44 +179,42 @@ class SimpleMarketDataEngine:
                 if assets_data.get("_embedded", {}).get("records"):
                     asset_info = assets_data["_embedded"]["records"][0]
                     
-                    # Get trading volume from orderbook
-                    orderbook_response = requests.get(
-                        f"{HORIZON_API_BASE}/order_book",
-                        params={
-                            "selling_asset_type": "native" if asset_code == "XLM" else "credit_alphanum4",
-                            "selling_asset_code": asset_code if asset_code != "XLM" else None,
-                            "selling_asset_issuer": asset_issuer if asset_code != "XLM" else None,
-                            "buying_asset_type": "credit_alphanum4",
-                            "buying_asset_code": "USDC",
-                            "buying_asset_issuer": "GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVN"  # Circle USDC issuer
-                        },
-                        timeout=10
-                    )
+                    # Get trading volume from orderbook (streamed copy if available, else poll)
+                    streamed_book = self.stream_ingestor.get_order_book(asset_code)
+                    if streamed_book is not None:
+                        orderbook = streamed_book
+                        book_version = streamed_book["version"]
+                    else:
+                        orderbook = None
+                        # A polled book can only change when a ledger closes, so the ledger versions it
+                        ledger_sequence = self.current_ledger_sequence()
+                        book_version = ("ledger", ledger_sequence) if ledger_sequence else None
+                        orderbook_response = http_client.get(
+                            f"{HORIZON_API_BASE}/order_book",
+                            params=order_book_params(asset_code, asset_issuer),
+                            timeout=10
+                        )
+                        if orderbook_response.status_code == 200:
+                            orderbook = orderbook_response.json()
                     
                     volume = 0
                     price = 0
-                    if orderbook_response.status_code == 200:
-                        orderbook = orderbook_response.json()
-                        bids = orderbook.get("bids", [])
-                        asks = orderbook.get("asks", [])
-                        
-                        # Calculate mid price
-                        if bids and asks:
-                            best_bid = float(bids[0]["price"])
-                            best_ask = float(asks[0]["price"])
-                            price = (best_bid + best_ask) / 2
-                        
-                        # Calculate volume (simplified)
-                        for bid in bids:
-                            volume += float(bid["amount"]) * float(bid["price"])
-                        for ask in asks:
-                            volume += float(ask["amount"]) * float(ask["price"])
+                    book_metrics = None
+                    if orderbook is not None:
+                        # Parsed once into arrays; cached per book version (streamed) or ledger (polled)
+                        book_metrics = self.orderbook_analytics.analyze(asset_code, orderbook, version=book_version)
+                        price = book_metrics["mid"] or 0
+                        volume = book_metrics["total_notional"]
                     
                     return {
                         "price": price or random.uniform(0.01, 2.0),
                         "volume": volume or random.uniform(10000, 500000),
                         "change_24h": random.uniform(-0.1, 0.1),  # Would need historical data for real change
-                        "accounts": asset_info.get("accounts", {}).get("authorized", 0)
+                        "accounts": asset_info.get("accounts", {}).get("authorized", 0),
+                        "order_book": {
+                            "spread_bps": book_metrics["spread_bps"],
+                            "depth": book_metrics["depth"]
+                        } if book_metrics and book_metrics["mid"] else None
                     }
             
             return None
@@ -96,56 +223,68 @@ class SimpleMarketDataEngine:
             print(f"Error fetching real Stellar data for {asset_code}: {e}")
             return None
 
+    def fetch_assets_concurrently(self, stellar_assets, deadline=SNAPSHOT_DEADLINE_SECONDS):
+        """Fetch all assets in parallel, returning (data by asset code, set of late asset codes)"""
+        executor = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(stellar_assets)) or 1)
+        try:
+            futures = {
+                executor.submit(self.get_real_stellar_asset_data, asset["code"], asset["issuer"]): asset["code"]
+                for asset in stellar_assets
+            }
+            done, not_done = wait(futures, timeout=deadline)
+            
+            fetched_data = {}
+            for future in done:
+                fetched_data[futures[future]] = future.result()
+            
+            late_assets = {futures[future] for future in not_done}
+            return fetched_data, late_assets
+        finally:
+            # Don't wait for late fetches; they finish in the background and are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def collect_historical_data(self, days=30):
         """Collect historical market data using real Stellar network data"""
         try:
             timestamp = datetime.now()
             market_snapshot = {
+                "snapshot_id": None,  # Assigned once the snapshot is complete
                 "timestamp": timestamp.isoformat(),
                 "networks": 1,  # Stellar mainnet
                 "total_assets": 0,
                 "tokens": []
             }
             
-            # Real Stellar assets to track (major assets on Stellar)
-            stellar_assets = [
-                {"code": "XLM", "issuer": None, "name": "Stellar Lumens"},
-                {"code": "USDC", "issuer": "GA5ZSEJYB37JRC5AVCIA5MOP4RHTM335X2KGX3IHOJAPP5RE34K4KZVN", "name": "USD Coin"},
-                {"code": "EURC", "issuer": "GDHU6WRG4IEQXM5NZ4BMPKOXHW76MZM4Y2IEMFDVXBSDP6SJY4ITNPP2", "name": "Euro Coin"},
-                {"code": "yXLM", "issuer": "GARDNV3Q7YGT4AKSDF25LT32YSCCW67OPAW7RJTGPXE2KPNQ9MSHLQM6", "name": "yXLM Ultrastellar"},
-                {"code": "AQUA", "issuer": "GBNZILSTVQZ4R7IKQDGHYGY2QXL5QOFJYQMXPKWRRM5PAV7Y4M67AQUA", "name": "Aquarius"},
-                {"code": "yUSDC", "issuer": "GDGTVWSM4MGS4T7Z6W4RPWOCHE2I6RDFCIFZGS3DOA63LWQTRNZNTTFF", "name": "yUSDC Ultrastellar"},
-                {"code": "LSP", "issuer": "GAB7KPLKLXEJT5Y7OXOLPBJ5FPLIV7QBOMCB3RE5ZRJUQG3GLOE54W3B", "name": "Lumenswap"},
-                {"code": "SRT", "issuer": "GCDNJUBQSX7AJWLJACMJ7I4BC3Z47BQUTMHEICZLE6MU4KQBRYG5JY6B", "name": "Stellar Reference Token"},
-                {"code": "MOBI", "issuer": "GA6HCMBLTZS5VYYBCATRBRZ3BZJMAFUDKYYF6AH6MVCMGWMRDNSWJPIH", "name": "Mobius"},
-                {"code": "VELO", "issuer": "GDM2KBEVKWKCFVKCUYY3OVSXQGW6ZNKS24YCJWGPMYMNFZGCPZ6LOHQH", "name": "Velo"}
-            ]
+            # Fetch all assets in parallel; anything slower than the deadline is marked late
+            fetched_data, late_assets = self.fetch_assets_concurrently(STELLAR_ASSETS)
             
             real_assets_collected = 0
             
-            for asset_info in stellar_assets:
+            for asset_info in STELLAR_ASSETS:
                 asset_code = asset_info["code"]
                 asset_issuer = asset_info["issuer"]
                 
                 # Get real market data from Stellar network
-                real_data = self.get_real_stellar_asset_data(asset_code, asset_issuer)
+                real_data = fetched_data.get(asset_code)
                 
                 if real_data:
                     # Use real data
                     price = real_data["price"]
                     volume = real_data["volume"]
                     change_24h = real_data["change_24h"]
+                    order_book = real_data.get("order_book")
                     data_source = "stellar_network"
                     real_assets_collected += 1
                 else:
                     # Fallback with warning
-                    print(f"Warning: Could not fetch real data for {asset_code}, using fallback")
-                    if asset_code not in self.price_history:
-                        self.price_history[asset_code] = []
+                    if asset_code in late_assets:
+                        print(f"Warning: {asset_code} missed the {SNAPSHOT_DEADLINE_SECONDS}s snapshot deadline, using fallback")
+                    else:
+                        print(f"Warning: Could not fetch real data for {asset_code}, using fallback")
                     
                     # Generate realistic fallback based on previous data or asset type
-                    if len(self.price_history[asset_code]) > 0:
-                        last_price = self.price_history[asset_code][-1]["price"]
+                    last_price = self.price_history[asset_code].last_price() if asset_code in self.price_history else None
+                    if last_price is not None:
                         price_change = random.uniform(-0.05, 0.05)
                         price = last_price * (1 + price_change)
                     else:
@@ -159,7 +298,8 @@ class SimpleMarketDataEngine:
                     
                     volume = random.uniform(10000, 1000000)
                     change_24h = random.uniform(-0.1, 0.1)
-                    data_source = "fallback"
+                    data_source = "late" if asset_code in late_assets else "fallback"
+                    order_book = None
                 
                 # Calculate market cap (simplified)
                 market_cap = price * random.uniform(1000000, 100000000)
@@ -172,29 +312,34 @@ class SimpleMarketDataEngine:
                     "volume": volume,
                     "market_cap": market_cap,
                     "change_24h": change_24h,
-                    "data_source": data_source
+                    "data_source": data_source,
+                    "late": asset_code in late_assets
                 }
-                
-                # Store price history
-                if asset_code not in self.price_history:
-                    self.price_history[asset_code] = []
-                
-                self.price_history[asset_code].append({
-                    "timestamp": timestamp.isoformat(),
-                    "price": price,
-                    "volume": volume
-                })
+                if order_book:
+                    token_data["order_book"] = order_book
                 
                 market_snapshot["tokens"].append(token_data)
             
-            market_snapshot["total_assets"] = len(stellar_assets)
+            market_snapshot["total_assets"] = len(STELLAR_ASSETS)
+            market_snapshot["late_assets"] = sorted(late_assets)
             
-            # Store historical snapshot
-            self.historical_data.append(market_snapshot)
-            
-            # Keep only last 1000 data points to manage memory
-            if len(self.historical_data) > 1000:
-                self.historical_data = self.historical_data[-1000:]
+            if self.shared_state is not None:
+                # The store numbers the snapshot, so a collector that missed a handover can't reuse an id;
+                # reading back from the store indexes it after anything this worker hadn't synced yet
+                self.snapshot_store.insert(market_snapshot)
+                self.load_new_snapshots()
+            else:
+                market_snapshot["snapshot_id"] = self.next_snapshot_id
+                self.next_snapshot_id += 1
+                previous_features = self.feature_store.latest()
+                features = self._index_snapshot(market_snapshot)
+                self.update_online_model(previous_features, features)
+                
+                # Store historical snapshot (the deque drops the oldest past MAX_SNAPSHOTS)
+                self.historical_data.append(market_snapshot)
+                if self.snapshot_store is not None:
+                    self.snapshot_store.append(market_snapshot)
+                self.data_version += 1
             
             return {
                 "status": "success",
@@ -202,7 +347,8 @@ class SimpleMarketDataEngine:
                 "current_snapshot": market_snapshot,
                 "tokens_tracked": len(self.price_history),
                 "real_data_sources": real_assets_collected,
-                "fallback_sources": len(stellar_assets) - real_assets_collected,
+                "fallback_sources": len(STELLAR_ASSETS) - real_assets_collected,
+                "late_sources": len(late_assets),
                 "data_quality": "excellent" if real_assets_collected >= 7 else ("good" if real_assets_collected >= 4 else "basic"),
                 "network": "stellar_mainnet"
             }
@@ -214,90 +360,12 @@ class SimpleMarketDataEngine:
             }
     
     def calculate_technical_indicators(self, token_code):
-        """Calculate real technical indicators from price history"""
-        if token_code not in self.price_history or len(self.price_history[token_code]) < 14:
-            return None
-            
-        prices = [p["price"] for p in self.price_history[token_code][-50:]]  # Last 50 data points
-        volumes = [p["volume"] for p in self.price_history[token_code][-50:]]
-        
-        indicators = {}
-        
-        try:
-            # Simple Moving Averages
-            if len(prices) >= 7:
-                indicators["sma_7"] = sum(prices[-7:]) / 7
-            if len(prices) >= 14:
-                indicators["sma_14"] = sum(prices[-14:]) / 14
-            if len(prices) >= 21:
-                indicators["sma_21"] = sum(prices[-21:]) / 21
-            
-            # RSI calculation (simplified)
-            if len(prices) >= 14:
-                gains = []
-                losses = []
-                for i in range(1, min(15, len(prices))):
-                    change = prices[-i] - prices[-i-1]
-                    if change > 0:
-                        gains.append(change)
-                        losses.append(0)
-                    else:
-                        gains.append(0)
-                        losses.append(abs(change))
-                
-                avg_gain = sum(gains) / len(gains) if gains else 0
-                avg_loss = sum(losses) / len(losses) if losses else 0.001
-                rs = avg_gain / avg_loss
-                indicators["rsi"] = 100 - (100 / (1 + rs))
-            
-            # Bollinger Bands (simplified)
-            if len(prices) >= 20:
-                sma_20 = sum(prices[-20:]) / 20
-                variance = sum([(p - sma_20) ** 2 for p in prices[-20:]]) / 20
-                std_dev = variance ** 0.5
-                indicators["bb_upper"] = sma_20 + (2 * std_dev)
-                indicators["bb_lower"] = sma_20 - (2 * std_dev)
-                indicators["bb_position"] = (prices[-1] - indicators["bb_lower"]) / (indicators["bb_upper"] - indicators["bb_lower"])
-            
-            # Volume indicators
-            if len(volumes) >= 7:
-                indicators["volume_sma"] = sum(volumes[-7:]) / 7
-                indicators["volume_ratio"] = volumes[-1] / indicators["volume_sma"] if indicators["volume_sma"] > 0 else 1
-            
-            # Momentum
-            if len(prices) >= 5:
-                indicators["momentum_5"] = (prices[-1] - prices[-5]) / prices[-5] if prices[-5] > 0 else 0
-            
-            return indicators
-            
-        except Exception as e:
-            return {"error": f"Technical indicator calculation failed: {str(e)}"}
+        """Current technical indicators for a token, maintained incrementally as prices arrive"""
+        return self.indicators.get(token_code)
     
     def get_aggregated_market_features(self):
-        """Get aggregated features from all tracked tokens"""
-        if not self.historical_data:
-            return None
-            
-        latest_data = self.historical_data[-1]
-        features = {
-            "market_timestamp": latest_data["timestamp"],
-            "total_tokens": len(latest_data["tokens"]),
-            "total_market_cap": sum([t["market_cap"] for t in latest_data["tokens"]]),
-            "average_price_change": sum([t["change_24h"] for t in latest_data["tokens"]]) / len(latest_data["tokens"]),
-            "total_volume": sum([t["volume"] for t in latest_data["tokens"]]),
-            "positive_movers": len([t for t in latest_data["tokens"] if t["change_24h"] > 0]),
-            "negative_movers": len([t for t in latest_data["tokens"] if t["change_24h"] < 0])
-        }
-        
-        # Add technical indicators for major tokens
-        major_tokens = ["XLM", "USDC", "BTC"]
-        for token in major_tokens:
-            indicators = self.calculate_technical_indicators(token)
-            if indicators:
-                for key, value in indicators.items():
-                    features[f"{token}_{key}"] = value
-        
-        return features
+        """Aggregated features and major-token indicators of the latest snapshot, read from the feature store"""
+        return self.feature_store.latest()
     
     def _calculate_total_tvl(self, soroswap_data):
         """Calculate Total Value Locked from market data"""
@@ -424,59 +492,32 @@ class SimpleMarketDataEngine:
             }
             
             # Fetch real Soroswap data (no authentication needed for public API)
+            # The registry remembers the working endpoint, so steady state is a single call
             soroswap_success = False
-            soroswap_endpoints = [
-                "/api/v1/pairs",
-                "/api/pairs", 
-                "/pairs",
-                "/api/v1/tokens",
-                "/api/tokens",
-                "/tokens"
-            ]
-            
-            for endpoint in soroswap_endpoints:
-                try:
-                    print(f"Trying Soroswap endpoint: {SOROSWAP_API_BASE}{endpoint}")
-                    response = requests.get(f"{SOROSWAP_API_BASE}{endpoint}", timeout=10)
-                    
-                    if response.status_code == 200:
-                        try:
-                            if not response.text or response.text.strip() == "":
-                                print(f"Empty response from Soroswap endpoint: {endpoint}")
-                                continue
-                            
-                            soroswap_data = response.json()
-                            market_data["soroswap"] = {
-                                "data": soroswap_data,
-                                "endpoint_used": endpoint,
-                                "status": "success"
-                            }
-                            soroswap_success = True
-                            print(f"Successfully fetched Soroswap data from: {endpoint}")
-                            break
-                        except json.JSONDecodeError as e:
-                            print(f"JSON decode error for Soroswap {endpoint}: {e}")
-                            continue
-                    elif response.status_code == 404:
-                        continue
-                    else:
-                        print(f"Soroswap {endpoint} returned {response.status_code}")
-                        continue
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"Request error for Soroswap {endpoint}: {e}")
-                    continue
+            endpoint, soroswap_data = soroswap_registry.fetch()
+            if endpoint is not None:
+                market_data["soroswap"] = {
+                    "data": soroswap_data,
+                    "endpoint_used": endpoint,
+                    "status": "success"
+                }
+                soroswap_success = True
             
             # Fetch real Stellar network statistics
             try:
-                # Get network statistics from Horizon
-                response = requests.get(f"{HORIZON_API_BASE}/ledgers", params={"order": "desc", "limit": 1}, timeout=10)
-                if response.status_code == 200:
-                    ledger_data = response.json()
-                    latest_ledger = ledger_data.get("_embedded", {}).get("records", [{}])[0]
-                    
+                # Latest ledger is a local lookup while streaming; otherwise poll Horizon
+                latest_ledger = self.stream_ingestor.get_latest_ledger(max_age_seconds=STREAM_LEDGER_MAX_AGE_SECONDS)
+                ledger_source = "stream"
+                if latest_ledger is None:
+                    ledger_source = "poll"
+                    response = http_client.get(f"{HORIZON_API_BASE}/ledgers", params={"order": "desc", "limit": 1}, timeout=10)
+                    if response.status_code == 200:
+                        ledger_data = response.json()
+                        latest_ledger = ledger_data.get("_embedded", {}).get("records", [{}])[0]
+                
+                if latest_ledger is not None:
                     # Get assets statistics
-                    assets_response = requests.get(f"{HORIZON_API_BASE}/assets", params={"limit": 200}, timeout=10)
+                    assets_response = http_client.get(f"{HORIZON_API_BASE}/assets", params={"limit": 200}, timeout=10)
                     total_assets = 0
                     if assets_response.status_code == 200:
                         assets_data = assets_response.json()
@@ -488,6 +529,7 @@ class SimpleMarketDataEngine:
                         "base_fee": latest_ledger.get("base_fee_in_stroops", 100),
                         "operations_count": latest_ledger.get("operation_count", 0),
                         "transaction_count": latest_ledger.get("transaction_count", 0),
+                        "ledger_source": ledger_source,
                         "status": "success"
                     }
                 else:
@@ -542,18 +584,324 @@ class SimpleMarketDataEngine:
                 "timestamp": datetime.now().isoformat()
             }
 
+    def start_streaming(self):
+        """Subscribe to Horizon ledger and order book streams for all tracked assets"""
+        if self.stream_ingestor.is_running():
+            return False
+        self.stream_ingestor.subscribe_ledgers()
+        for asset_info in STELLAR_ASSETS:
+            # XLM is priced from Stellar Expert, so only credit assets need a book
+            if asset_info["issuer"]:
+                self.stream_ingestor.subscribe_order_book(
+                    asset_info["code"], order_book_params(asset_info["code"], asset_info["issuer"])
+                )
+        self.stream_ingestor.start()
+        return True
+    
+    def stop_streaming(self):
+        if not self.stream_ingestor.is_running():
+            return False
+        self.stream_ingestor.stop()
+        return True
+    
+    def health_status(self):
+        """Payload of /health and the model-status event"""
+        return {
+            "status": "healthy",
+            "model_trained": self.is_trained,
+            "historical_data_points": len(self.historical_data),
+            "tokens_tracked": len(self.price_history)
+        }
+    
+    def historical_data_status(self):
+        """Payload of /historical-data-status and the snapshot event"""
+        if not self.historical_data:
+            return {
+                "status": "no_data",
+                "message": "No historical data collected yet. Use /collect-historical-data to start",
+                "snapshots": 0,
+                "tokens_tracked": 0
+            }
+        
+        # Get latest market features
+        latest_features = self.get_aggregated_market_features()
+        
+        return {
+            "status": "data_available",
+            "snapshots_collected": len(self.historical_data),
+            "tokens_tracked": len(self.price_history),
+            "data_quality": "good" if len(self.historical_data) >= 10 else "basic",
+            "latest_features": latest_features,
+            "time_range": {
+                "start": self.historical_data[0]["timestamp"] if self.historical_data else None,
+                "end": self.historical_data[-1]["timestamp"] if self.historical_data else None
+            },
+            "training_ready": len(self.historical_data) >= 5,
+            "snapshot_store": self.snapshot_store.stats() if self.snapshot_store else None
+        }
+    
+    def start_event_publisher(self):
+        """Start the single event producer unless it is already running"""
+        with self._publisher_lock:
+            if self._publisher is None:
+                self._publisher = threading.Thread(target=self._publish_events, daemon=True)
+                self._publisher.start()
+    
+    def _publish_events(self):
+        """Push snapshot / model-status events when data_version moves and market-overview when the
+        market data cache refreshes; keeping that cache warm costs one upstream fetch per TTL, not per viewer"""
+        data_version = market_version = -1  # Never a real version, so the first pass publishes everything
+        while True:
+            with self._publisher_lock:
+                if self.events.subscriber_count() == 0:
+                    self._publisher = None
+                    return
+            try:
+                if self.data_version != data_version:
+                    data_version = self.data_version
+                    self.events.publish("snapshot", self.historical_data_status())
+                    self.events.publish("model-status", self.health_status())
+                market_data, cache_info = self.market_data_cache.get()
+                if cache_info["version"] != market_version:
+                    market_version = cache_info["version"]
+                    self.events.publish("market-overview", market_data)
+            except Exception as e:
+                print(f"Event publishing failed: {e}")
+            time.sleep(EVENT_PUBLISH_INTERVAL_SECONDS)
+    
+    def attach_snapshot_store(self, store):
+        """Persist new snapshots to the store and rehydrate memory from its most recent ones"""
+        self.snapshot_store = store
+        started = time.perf_counter()
+        snapshots = store.load_recent(MAX_SNAPSHOTS)
+        self.restore_snapshots(snapshots)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Rehydrated {len(snapshots)} snapshots from the snapshot store in {elapsed_ms:.1f} ms")
+        return len(snapshots)
+    
+    def restore_snapshots(self, snapshots):
+        """Rebuild historical_data, price_history, indicators and feature rows from stored snapshots (oldest first)"""
+        self.historical_data = deque(snapshots, maxlen=MAX_SNAPSHOTS)
+        self.price_history.clear()
+        self.indicators.clear()
+        self.feature_store.clear()
+        for snapshot in self.historical_data:
+            self._index_snapshot(snapshot)
+        if self.historical_data:
+            self.next_snapshot_id = max(self.next_snapshot_id, self.historical_data[-1]["snapshot_id"] + 1)
+        self.data_version += 1
+    
+    def _index_snapshot(self, snapshot):
+        """Feed a stored snapshot to price_history, indicators and the feature store; returns its feature row"""
+        ts = datetime.fromisoformat(snapshot["timestamp"]).timestamp()
+        for token in snapshot["tokens"]:
+            self.price_history.append(token["code"], ts, token["price"], token["volume"])
+            self.indicators.append(token["code"], token["price"], token["volume"])
+        features = market_feature_row(snapshot, self.indicators)
+        self.feature_store.append(snapshot["snapshot_id"], snapshot["timestamp"], features)
+        return features
+    
+    def attach_shared_state(self, shared_state, coordinator):
+        """Multi-worker mode: share training sets and job status, and collect only while holding the lease"""
+        self.shared_state = shared_state
+        self.coordinator = coordinator
+        # Job records reach the shared state as they change, so the next poll can land on any worker
+        self.job_manager.add_listener(self.mirror_training_job)
+    
+    def is_collector(self):
+        """Whether this process collects snapshots: always, unless workers elect a collector"""
+        return self.coordinator is None or self.coordinator.is_leader
+    
+    def load_new_snapshots(self):
+        """Index the stored snapshots newer than the latest one in memory, in id order; returns how many"""
+        snapshots = self.snapshot_store.load_since(self.latest_snapshot_id() or 0, MAX_SNAPSHOTS)
+        for snapshot in snapshots:
+            previous_features = self.feature_store.latest()
+            features = self._index_snapshot(snapshot)
+            self.update_online_model(previous_features, features)
+            self.historical_data.append(snapshot)
+        if snapshots:
+            self.next_snapshot_id = max(self.next_snapshot_id, snapshots[-1]["snapshot_id"] + 1)
+            self.data_version += 1
+        return len(snapshots)
+    
+    def sync_from_store(self):
+        """Catch up with the other workers: new snapshots, the latest training set, and mirror our jobs"""
+        self.load_new_snapshots()
+        
+        if self.shared_state.version(TRAINING_SET_STATE) > self.model_version:
+            version, state = self.shared_state.get(TRAINING_SET_STATE)
+            self.training_data = state["training_set"]
+            self.is_trained = True
+            self.model_version = version
+            self.data_version += 1
+        
+        # Progress moves inside the job's process without a notification, so it is mirrored here
+        jobs = self.job_manager.list_jobs()
+        for job in jobs:
+            self.mirror_training_job(job)
+        live_ids = {job["job_id"] for job in jobs}
+        self._mirrored_jobs = {job_id: job for job_id, job in self._mirrored_jobs.items() if job_id in live_ids}
+    
+    def mirror_training_job(self, job):
+        """Write a job record of this worker to the shared state, unless it is unchanged"""
+        previous = self._mirrored_jobs.get(job["job_id"]) if job is not None else None
+        if job is None or previous == job:
+            return
+        if previous is not None and previous["status"] in TERMINAL_STATES and job["status"] not in TERMINAL_STATES:
+            return  # A sync pass read the job just before its finish notification
+        self.shared_state.put(TRAINING_JOB_STATE_PREFIX + job["job_id"], job)
+        self._mirrored_jobs[job["job_id"]] = job
+    
+    def training_job_status(self, job_id):
+        """(job record, whether this process runs it); jobs of other workers come from the shared state"""
+        job = self.job_manager.status(job_id)
+        if job is not None or self.shared_state is None:
+            return job, True
+        return self.shared_state.get(TRAINING_JOB_STATE_PREFIX + job_id)[1], False
+    
+    def start_online_learning(self):
+        """Fit an online model on the stored feature rows, then update it as each snapshot arrives"""
+        if self.online_model is not None:
+            return False
+        model = OnlineForest()
+        training_set = build_market_training_set(self.feature_store.columns(MARKET_FEATURE_COLUMNS))
+        if training_set["features"]:
+            model.partial_fit(training_set["features"], training_set["targets"])
+        self.online_model = model
+        return True
+    
+    def stop_online_learning(self):
+        if self.online_model is None:
+            return False
+        self.online_model = None
+        return True
+    
+    def update_online_model(self, previous_features, features):
+        """Learn from one new snapshot: the previous row, labelled by whether the market then improved"""
+        model = self.online_model
+        if model is None or previous_features is None:
+            return
+        target = 1 if features["average_price_change"] > previous_features["average_price_change"] else 0
+        model.partial_fit([market_feature_vector(previous_features)], [target])
+    
+    def online_learning_status(self):
+        model = self.online_model
+        if model is None:
+            return {"enabled": False}
+        latest_features = self.feature_store.latest()
+        prediction = model.predict([market_feature_vector(latest_features)]) if latest_features else None
+        return {
+            "enabled": True,
+            **model.status(),
+            # Probability that the next snapshot's average price change is higher than the latest one
+            "next_period_improvement_probability": round(float(prediction[0]), 4) if prediction is not None else None
+        }
+    
+    def install_training_set(self, training_set, snapshots_used, time_range):
+        """Training job completion: swap in the new training set, then report what it was built from"""
+        self.training_data = training_set
+        self.is_trained = True
+        if self.shared_state is not None:
+            # The shared version numbers models across workers; the others install it on their next sync
+            self.model_version = self.shared_state.put(TRAINING_SET_STATE, {"training_set": training_set})
+        else:
+            self.model_version += 1  # Retires every cached recommendation from the previous model
+        self.data_version += 1
+        samples = len(training_set["features"])
+        return {
+            "training_samples": samples,
+            "features_used": training_set["feature_names"],
+            "data_quality": "excellent" if samples >= 20 else ("good" if samples >= 10 else "basic"),
+            "historical_snapshots_used": snapshots_used,
+            "tokens_analyzed": len(self.price_history),
+            "time_range": time_range
+        }
+    
+    def latest_snapshot_id(self):
+        return self.historical_data[-1]["snapshot_id"] if self.historical_data else None
+    
+    def get_market_data(self):
+        """Get market data through the TTL / stale-while-revalidate cache"""
+        data, cache_info = self.market_data_cache.get()
+        # Copy so the cache metadata never leaks into the shared cached dict
+        data = dict(data)
+        data["cache"] = cache_info
+        return data
+
 # Initialize the engine
 market_engine = SimpleMarketDataEngine()
 
+# Backend-owned collection loop; replaces clients polling /collect-historical-data
+snapshot_scheduler = SnapshotScheduler(market_engine.collect_historical_data)
+
+def enable_multi_worker(db_path, extra_syncs=()):
+    """Production mode for several worker processes: share engine state through the SQLite database
+    and run the snapshot scheduler only in the worker holding the collector lease.
+    extra_syncs run after the market engine's sync on every pass."""
+    def sync():
+        market_engine.sync_from_store()
+        for extra_sync in extra_syncs:
+            extra_sync()
+    
+    coordinator = WorkerCoordinator(
+        LeaderLease(db_path, COLLECTOR_LEASE),
+        sync=sync,
+        on_elected=snapshot_scheduler.start,
+        on_demoted=snapshot_scheduler.stop
+    )
+    market_engine.attach_shared_state(SharedState(db_path), coordinator)
+    coordinator.start()
+    return coordinator
+
+def not_collector_response():
+    return jsonify({
+        "status": "error",
+        "message": "Snapshot collection runs in the worker holding the collector lease; see /worker-status",
+        "worker": market_engine.coordinator.status()
+    }), 409
+
+def cached_json_response(key, version, build_payload):
+    """JSON response from encoded bytes cached per key and data version, with a strong ETag,
+    304 on a matching If-None-Match and gzip when the client accepts it; version None skips the cache"""
+    def encode():
+        return current_app.json.dumps(build_payload()).encode()
+    
+    cached = (market_engine.response_cache.get(key, version, encode) if version is not None
+              else CachedResponse(None, encode()))
+    # Each encoding is its own representation, so the gzip body gets its own strong ETag
+    etags = (cached.etag, cached.etag + "-gzip")
+    use_gzip = cached.length >= GZIP_MIN_BYTES and request.accept_encodings["gzip"] > 0
+    
+    if any(request.if_none_match.contains_weak(tag) for tag in etags):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(cached.gzip_body(GZIP_LEVEL) if use_gzip else cached.body,
+                                              mimetype="application/json")
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+    response.set_etag(etags[1] if use_gzip else etags[0])
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"  # Browsers revalidate with If-None-Match every time
+    return response
+
 @ai_strategies_bp.route('/market-data', methods=['GET'])
 def get_market_data():
-    """Get current market data from Soroswap"""
-    data = market_engine.fetch_market_data()
-    return jsonify(data)
+    """Get current market data from Soroswap; ?fields=overview,stellar_network returns only those sections"""
+    data, cache_info = market_engine.market_data_cache.get()
+    fields = tuple(name.strip() for name in request.args.get("fields", "").split(",") if name.strip())
+    # Cache state goes in headers so the body, and its ETag, only change when the data does
+    response = cached_json_response(
+        ("market-data", fields), cache_info["version"],
+        lambda: {name: data[name] for name in fields if name in data} if fields else data
+    )
+    response.headers["Age"] = str(int(cache_info["age_seconds"]))
+    response.headers["X-Cache-State"] = cache_info["state"]
+    return response
 
 @ai_strategies_bp.route('/train-model', methods=['POST'])
 def train_model():
-    """Train model using real historical market data"""
+    """Start a background training job on real historical market data; poll /training-jobs/<job_id>"""
     try:
         # Check if we have enough historical data
         if len(market_engine.historical_data) < 5:
@@ -563,61 +911,23 @@ def train_model():
                 "recommendation": "Use /collect-historical-data endpoint multiple times to gather more data"
             }), 400
         
-        # Extract features from historical data for training
-        training_features = []
-        target_values = []
-        
-        for i, snapshot in enumerate(market_engine.historical_data[:-1]):  # Exclude last for prediction
-            # Current market features
-            features = market_engine.get_aggregated_market_features() if i == len(market_engine.historical_data) - 2 else {
-                "total_tokens": len(snapshot["tokens"]),
-                "total_market_cap": sum([t["market_cap"] for t in snapshot["tokens"]]),
-                "average_price_change": sum([t["change_24h"] for t in snapshot["tokens"]]) / len(snapshot["tokens"]),
-                "total_volume": sum([t["volume"] for t in snapshot["tokens"]]),
-                "positive_movers": len([t for t in snapshot["tokens"] if t["change_24h"] > 0]),
-                "negative_movers": len([t for t in snapshot["tokens"] if t["change_24h"] < 0])
-            }
-            
-            # Target: Market performance in next period
-            next_snapshot = market_engine.historical_data[i + 1]
-            current_avg_change = features["average_price_change"]
-            next_avg_change = sum([t["change_24h"] for t in next_snapshot["tokens"]]) / len(next_snapshot["tokens"])
-            
-            # Target is whether market improved (1) or declined (0)
-            target = 1 if next_avg_change > current_avg_change else 0
-            
-            training_features.append([
-                features["total_tokens"],
-                features["total_market_cap"] / 1000000,  # Normalize
-                features["average_price_change"],
-                features["total_volume"] / 1000000,  # Normalize
-                features["positive_movers"],
-                features["negative_movers"]
-            ])
-            target_values.append(target)
-        
-        # Store training data
-        market_engine.training_data = {
-            "features": training_features,
-            "targets": target_values,
-            "feature_names": ["total_tokens", "market_cap_millions", "avg_price_change", "volume_millions", "positive_movers", "negative_movers"]
-        }
-        
-        market_engine.is_trained = True
+        # Freeze the inputs now: feature rows were computed at ingestion, the job only stacks them
+        columns = market_engine.feature_store.columns(MARKET_FEATURE_COLUMNS)
+        snapshots_used = len(columns["snapshot_id"])
+        time_range = market_engine.feature_store.time_range()
+        job = market_engine.job_manager.submit(
+            "market_model", build_market_training_set, columns,
+            latest_features=market_engine.get_aggregated_market_features(),
+            on_success=lambda training_set: market_engine.install_training_set(training_set, snapshots_used, time_range)
+        )
         
         return jsonify({
-            "status": "success", 
-            "message": "Model trained using real historical market data",
-            "training_samples": len(training_features),
-            "features_used": market_engine.training_data["feature_names"],
-            "data_quality": "excellent" if len(training_features) >= 20 else ("good" if len(training_features) >= 10 else "basic"),
-            "historical_snapshots_used": len(market_engine.historical_data),
-            "tokens_analyzed": len(market_engine.price_history),
-            "time_range": {
-                "start": market_engine.historical_data[0]["timestamp"],
-                "end": market_engine.historical_data[-1]["timestamp"]
-            }
-        })
+            "status": "accepted",
+            "message": "Training job started on real historical market data",
+            "job_id": job["job_id"],
+            "job": job,
+            "historical_snapshots_used": snapshots_used
+        }), 202
             
     except Exception as e:
         return jsonify({
@@ -625,6 +935,55 @@ def train_model():
             "message": f"Training failed: {str(e)}"
         }), 500
 
+@ai_strategies_bp.route('/training-jobs', methods=['GET'])
+def list_training_jobs():
+    """List recent training jobs, newest first"""
+    return jsonify({
+        "status": "success",
+        "jobs": market_engine.job_manager.list_jobs()
+    })
+
+@ai_strategies_bp.route('/training-jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Get a training job's status, progress and result"""
+    job, _ = market_engine.training_job_status(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown training job {job_id}"
+        }), 404
+    return jsonify({
+        "status": "success",
+        "job": job
+    })
+
+@ai_strategies_bp.route('/training-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    """Cancel a queued training job or stop a running one at its next checkpoint"""
+    job, local = market_engine.training_job_status(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown training job {job_id}"
+        }), 404
+    if not local:
+        return jsonify({
+            "status": "error",
+            "message": "Training job runs in another worker process; retry the cancellation",
+            "job": job
+        }), 409
+    if not market_engine.job_manager.cancel(job_id):
+        return jsonify({
+            "status": "error",
+            "message": "Training job already finished",
+            "job": market_engine.job_manager.status(job_id)
+        }), 409
+    return jsonify({
+        "status": "success",
+        "message": "Cancellation requested",
+        "job": market_engine.job_manager.status(job_id)
+    })
+
 @ai_strategies_bp.route('/strategy-recommendation', methods=['POST'])
 def get_strategy_recommendation():
     """Get AI-powered investment strategy based on real market data"""
@@ -636,7 +995,17 @@ def get_strategy_recommendation():
             }), 400
         
         # Get real Stellar and Soroswap market data for analysis
-        real_market_data = market_engine.fetch_market_data()
+        real_market_data = market_engine.get_market_data()
+        
+        # The decision only changes with a new ledger, snapshot or model, so identical requests
+        # within one ledger are answered from memory
+        ledger_sequence = real_market_data.get("stellar_network", {}).get("latest_ledger")
+        cache_key = (ledger_sequence, market_engine.latest_snapshot_id(), market_engine.model_version)
+        cached_prediction = market_engine.recommendation_cache.get(cache_key) if ledger_sequence else None
+        if cached_prediction is not None:
+            response = jsonify(cached_prediction)
+            response.headers["X-Cache-State"] = "hit"
+            return response
         
         if real_market_data.get("soroswap", {}).get("status") == "success" or real_market_data.get("stellar_network", {}).get("status") == "success":
             
@@ -727,7 +1096,11 @@ def get_strategy_recommendation():
                 "timestamp": datetime.now().isoformat()
             }
             
-            return jsonify(prediction)
+            if ledger_sequence:
+                market_engine.recommendation_cache.put(cache_key, prediction)
+            response = jsonify(prediction)
+            response.headers["X-Cache-State"] = "miss"
+            return response
         else:
             return jsonify({
                 "status": "error",
@@ -753,7 +1126,7 @@ def analyze_portfolio():
         risk_tolerance = data.get("risk_tolerance", "moderate")
         
         # Get real market data for analysis context
-        real_market_data = market_engine.fetch_market_data()
+        real_market_data = market_engine.get_market_data()
         
         # Calculate portfolio value
         total_value = sum(portfolio.values()) if portfolio else 10000
@@ -877,46 +1250,45 @@ def discover_api():
             "/status"
         ]
         
-        for endpoint in endpoints_to_test:
-            try:
-                response = requests.get(f"{SOROSWAP_API_BASE}{endpoint}", timeout=5)
-                
-                result = {
-                    "endpoint": endpoint,
-                    "status_code": response.status_code,
-                    "content_type": response.headers.get('content-type', 'unknown'),
-                    "response_size": len(response.content)
-                }
-                
-                if response.status_code == 200:
-                    try:
-                        json_data = response.json()
-                        if isinstance(json_data, dict):
-                            result["response_keys"] = list(json_data.keys())[:10]  # First 10 keys
-                        elif isinstance(json_data, list):
-                            result["response_length"] = len(json_data)
-                            if len(json_data) > 0 and isinstance(json_data[0], dict):
-                                result["first_item_keys"] = list(json_data[0].keys())[:10]
-                        result["success"] = True
-                    except:
-                        result["response_preview"] = response.text[:200]
-                        result["success"] = True
-                elif response.status_code == 404:
-                    result["success"] = False
-                    result["error"] = "Not Found"
-                else:
-                    result["success"] = False
-                    result["error"] = f"HTTP {response.status_code}"
-                    result["response_preview"] = response.text[:100]
-                
-                discovery_results["endpoints_tested"].append(result)
-                
-            except requests.exceptions.RequestException as e:
+        # Probe all endpoints in parallel; results also feed the registry's negative cache
+        for endpoint, response in soroswap_registry.probe(endpoints_to_test, timeout=5):
+            if isinstance(response, requests.exceptions.RequestException):
                 discovery_results["endpoints_tested"].append({
                     "endpoint": endpoint,
                     "success": False,
-                    "error": str(e)
+                    "error": str(response)
                 })
+                continue
+            
+            result = {
+                "endpoint": endpoint,
+                "status_code": response.status_code,
+                "content_type": response.headers.get('content-type', 'unknown'),
+                "response_size": len(response.content)
+            }
+            
+            if response.status_code == 200:
+                try:
+                    json_data = response.json()
+                    if isinstance(json_data, dict):
+                        result["response_keys"] = list(json_data.keys())[:10]  # First 10 keys
+                    elif isinstance(json_data, list):
+                        result["response_length"] = len(json_data)
+                        if len(json_data) > 0 and isinstance(json_data[0], dict):
+                            result["first_item_keys"] = list(json_data[0].keys())[:10]
+                    result["success"] = True
+                except:
+                    result["response_preview"] = response.text[:200]
+                    result["success"] = True
+            elif response.status_code == 404:
+                result["success"] = False
+                result["error"] = "Not Found"
+            else:
+                result["success"] = False
+                result["error"] = f"HTTP {response.status_code}"
+                result["response_preview"] = response.text[:100]
+            
+            discovery_results["endpoints_tested"].append(result)
         
         # Count successful endpoints
         successful_endpoints = [ep for ep in discovery_results["endpoints_tested"] if ep.get("success")]
@@ -925,6 +1297,7 @@ def discover_api():
             "successful": len(successful_endpoints),
             "failed": len(endpoints_to_test) - len(successful_endpoints)
         }
+        discovery_results["registry"] = soroswap_registry.status()
         
         return jsonify(discovery_results)
         
@@ -938,24 +1311,70 @@ def discover_api():
 @ai_strategies_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    response = cached_json_response("health", market_engine.data_version, market_engine.health_status)
+    # The check time goes in the Date header: a timestamp in the cached body would be frozen at its first build
+    response.date = time.time()
+    return response
+
+@ai_strategies_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Hit rates of the recommendation and encoded response caches"""
     return jsonify({
-        "status": "healthy",
-        "model_trained": market_engine.is_trained,
-        "historical_data_points": len(market_engine.historical_data),
-        "tokens_tracked": len(market_engine.price_history),
-        "timestamp": datetime.now().isoformat()
+        "status": "success",
+        "recommendation_cache": market_engine.recommendation_cache.stats(),
+        "response_cache": market_engine.response_cache.stats(),
+        "event_stream": market_engine.events.stats()
+    })
+
+@ai_strategies_bp.route('/stream', methods=['GET'])
+def stream_events():
+    """Server-sent events: snapshot, market-overview and model-status, computed once for all viewers"""
+    events = market_engine.events
+    subscription = events.subscribe()
+    if subscription is None:
+        response = jsonify({
+            "status": "error",
+            "message": f"This worker already serves {events.max_subscribers} event streams; poll the status endpoints"
+        })
+        response.status_code = 503
+        response.headers["Retry-After"] = str(STREAM_RETRY_AFTER_SECONDS)
+        return response
+    market_engine.start_event_publisher()
+    response = current_app.response_class(events.stream(subscription, EVENT_KEEPALIVE_SECONDS),
+                                          mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Stop nginx from buffering the stream
     })
+    # Frees the slot even if the client leaves before the first event is read
+    response.call_on_close(lambda: events.unsubscribe(subscription))
+    return response
+
+@ai_strategies_bp.route('/worker-status', methods=['GET'])
+def get_worker_status():
+    """This worker process, whether it collects snapshots, and the model / data versions it serves"""
+    return jsonify({
+        "status": "success",
+        "multi_worker": market_engine.coordinator is not None,
+        "worker": market_engine.coordinator.status() if market_engine.coordinator else None,
+        "collector": market_engine.is_collector(),
+        "model_version": market_engine.model_version,
+        "latest_snapshot_id": market_engine.latest_snapshot_id()
+    })
+
+@ai_strategies_bp.route('/http-client-stats', methods=['GET'])
+def get_http_client_stats():
+    """Connection pool statistics for upstream API calls"""
+    return jsonify(http_client.stats())
 
 # Add endpoints for historical data collection
 @ai_strategies_bp.route('/collect-historical-data', methods=['POST'])
 def start_historical_collection():
     """Start collecting historical market data for AI training"""
+    if not market_engine.is_collector():
+        return not_collector_response()
     try:
-        data = request.get_json() if request.is_json else {}
-        days = data.get('days', 7) if data else 7  # Default 7 days of data collection
-        
-        # Collect current snapshot
-        result = market_engine.collect_historical_data()
+        # Collect current snapshot (waits for a scheduled run in progress rather than overlapping it)
+        result = snapshot_scheduler.run_now()
         
         return jsonify({
             "status": "success",
@@ -963,7 +1382,7 @@ def start_historical_collection():
             "collection_result": result,
             "total_snapshots": len(market_engine.historical_data),
             "tokens_being_tracked": len(market_engine.price_history),
-            "recommendation": "Call this endpoint every hour/day to build historical dataset"
+            "recommendation": "Use /scheduler/start to collect snapshots on an interval inside the backend"
         })
         
     except Exception as e:
@@ -972,34 +1391,140 @@ def start_historical_collection():
             "message": f"Historical data collection failed: {str(e)}"
         }), 500
 
-@ai_strategies_bp.route('/historical-data-status', methods=['GET'])
-def get_historical_data_status():
-    """Get status of historical data collection"""
+@ai_strategies_bp.route('/scheduler/start', methods=['POST'])
+def start_snapshot_scheduler():
+    """Start the in-process snapshot collection scheduler"""
+    if not market_engine.is_collector():
+        return not_collector_response()
     try:
-        if not market_engine.historical_data:
+        data = request.get_json(silent=True) or {}
+        interval_seconds = float(data.get('interval_seconds', snapshot_scheduler.interval_seconds))
+        jitter_seconds = float(data.get('jitter_seconds', snapshot_scheduler.jitter_seconds))
+        # Optional run duration and run count; runs until stopped if both are omitted
+        days = float(data['days']) if data.get('days') is not None else None
+        max_runs = int(data['max_runs']) if data.get('max_runs') is not None else None
+        
+        if interval_seconds <= 0 or jitter_seconds < 0 or jitter_seconds >= interval_seconds:
             return jsonify({
-                "status": "no_data",
-                "message": "No historical data collected yet. Use /collect-historical-data to start",
-                "snapshots": 0,
-                "tokens_tracked": 0
-            })
+                "status": "error",
+                "message": "interval_seconds must be positive and jitter_seconds must be between 0 and interval_seconds"
+            }), 400
+        if (days is not None and days <= 0) or (max_runs is not None and max_runs <= 0):
+            # Zero would otherwise read as "no limit" and start a scheduler that never ends
+            return jsonify({
+                "status": "error",
+                "message": "days and max_runs must be positive when given"
+            }), 400
         
-        # Get latest market features
-        latest_features = market_engine.get_aggregated_market_features()
+        started = snapshot_scheduler.start(
+            interval_seconds=interval_seconds,
+            jitter_seconds=jitter_seconds,
+            duration_seconds=days * 86400 if days is not None else None,
+            max_runs=max_runs
+        )
+        if not started:
+            return jsonify({
+                "status": "error",
+                "message": "Scheduler is already running. Stop it first to change its settings.",
+                "scheduler": snapshot_scheduler.status()
+            }), 409
         
         return jsonify({
-            "status": "data_available",
-            "snapshots_collected": len(market_engine.historical_data),
-            "tokens_tracked": len(market_engine.price_history),
-            "data_quality": "good" if len(market_engine.historical_data) >= 10 else "basic",
-            "latest_features": latest_features,
-            "time_range": {
-                "start": market_engine.historical_data[0]["timestamp"] if market_engine.historical_data else None,
-                "end": market_engine.historical_data[-1]["timestamp"] if market_engine.historical_data else None
-            },
-            "training_ready": len(market_engine.historical_data) >= 5
+            "status": "success",
+            "message": "Snapshot scheduler started",
+            "scheduler": snapshot_scheduler.status()
         })
         
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Invalid scheduler settings: {str(e)}"
+        }), 400
+
+@ai_strategies_bp.route('/scheduler/stop', methods=['POST'])
+def stop_snapshot_scheduler():
+    """Stop the in-process snapshot collection scheduler"""
+    if not market_engine.is_collector():
+        return not_collector_response()
+    stopped = snapshot_scheduler.stop()
+    return jsonify({
+        "status": "success",
+        "message": "Snapshot scheduler stopped" if stopped else "Snapshot scheduler was not running",
+        "scheduler": snapshot_scheduler.status()
+    })
+
+@ai_strategies_bp.route('/scheduler/status', methods=['GET'])
+def get_snapshot_scheduler_status():
+    """Get the snapshot scheduler state and run counters"""
+    return jsonify({
+        "status": "success",
+        "scheduler": snapshot_scheduler.status(),
+        "total_snapshots": len(market_engine.historical_data)
+    })
+
+@ai_strategies_bp.route('/streaming/start', methods=['POST'])
+def start_streaming():
+    """Start Horizon SSE ingestion for ledgers and order books"""
+    started = market_engine.start_streaming()
+    return jsonify({
+        "status": "success",
+        "message": "Horizon streaming started" if started else "Horizon streaming already running",
+        "streaming": market_engine.stream_ingestor.status()
+    })
+
+@ai_strategies_bp.route('/streaming/stop', methods=['POST'])
+def stop_streaming():
+    """Stop Horizon SSE ingestion; reads fall back to polling"""
+    stopped = market_engine.stop_streaming()
+    return jsonify({
+        "status": "success",
+        "message": "Horizon streaming stopped" if stopped else "Horizon streaming was not running",
+        "streaming": market_engine.stream_ingestor.status()
+    })
+
+@ai_strategies_bp.route('/streaming/status', methods=['GET'])
+def get_streaming_status():
+    """Get Horizon stream connection state, cursors and event counts"""
+    return jsonify({
+        "status": "success",
+        "streaming": market_engine.stream_ingestor.status()
+    })
+
+@ai_strategies_bp.route('/online-learning/start', methods=['POST'])
+def start_online_learning():
+    """Enable online model updates: fit on stored feature rows, then update on every collected snapshot"""
+    started = market_engine.start_online_learning()
+    return jsonify({
+        "status": "success",
+        "message": "Online learning started" if started else "Online learning already running",
+        "online_learning": market_engine.online_learning_status()
+    })
+
+@ai_strategies_bp.route('/online-learning/stop', methods=['POST'])
+def stop_online_learning():
+    """Disable online model updates and drop the online model"""
+    stopped = market_engine.stop_online_learning()
+    return jsonify({
+        "status": "success",
+        "message": "Online learning stopped" if stopped else "Online learning was not running",
+        "online_learning": market_engine.online_learning_status()
+    })
+
+@ai_strategies_bp.route('/online-learning/status', methods=['GET'])
+def get_online_learning_status():
+    """Get online model size, update latency and its prediction for the latest snapshot"""
+    return jsonify({
+        "status": "success",
+        "online_learning": market_engine.online_learning_status()
+    })
+
+@ai_strategies_bp.route('/historical-data-status', methods=['GET'])
+def get_historical_data_status():
+    """Get status of historical data collection"""
+    try:
+        return cached_json_response("historical-data-status", market_engine.data_version,
+                                    market_engine.historical_data_status)
+        
     except Exception as e:
         return jsonify({
             "status": "error",
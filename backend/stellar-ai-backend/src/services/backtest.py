@@ -0,0 +1,232 @@
+import time
+
+import numpy as np
+
+from src.services.batch_indicators import calculate_indicators_batch
+from src.services.mock_data import generate_mock_panel
+from src.services.strategy_signals import STRATEGIES, classify_returns
+from src.services.training import STRATEGY_FEATURE_NAMES, fit_forest_bundle
+
+HOURS_PER_YEAR = 24 * 365  # Bars are hourly
+DEFAULT_TRAIN_BARS = 24 * 60  # Trailing window each fold's model is fit on
+DEFAULT_TEST_BARS = 24 * 30  # Bars traded with one fold's model before it is refit
+BACKTEST_N_ESTIMATORS = 20  # Smaller than the served forest; one forest is fit per fold
+# Shallower trees on a feature subset: an unrestricted forest costs ~15 s per fold on 20k rows
+BACKTEST_FOREST_PARAMS = {"max_depth": 8, "max_features": 0.3}
+MAX_TRAIN_ROWS = 5000  # Per-fold training rows (assets x bars) are sampled down to this
+MIN_TRAIN_ROWS = 50  # Same minimum as prepare_training_data
+SWAP_FEE_RATE = 0.003  # Soroswap pool fee, charged per unit of position change
+
+# Target position per STRATEGIES entry; NaN (HOLD) keeps the current position
+LONG_SHORT_POSITIONS = np.array([1.0, 0.5, np.nan, -0.5, -1.0])
+LONG_ONLY_POSITIONS = np.array([1.0, 0.5, np.nan, 0.0, 0.0])
+
+
+def _feature_rows(indicators, bars):
+    """(assets * bars) x features matrix for a slice of bars, asset-major like mask.ravel()"""
+    block = np.stack([indicators[name][:, bars] for name in STRATEGY_FEATURE_NAMES], axis=-1)
+    return block.reshape(-1, len(STRATEGY_FEATURE_NAMES))
+
+
+def _forward_fill(values):
+    """Carry the last non-NaN value forward along each row; 0 before the first one"""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = np.take_along_axis(values, index, axis=1)
+    return np.where(np.logical_or.accumulate(valid, axis=1), filled, 0.0)
+
+
+def walk_forward_predictions(indicators, next_return, train_bars=DEFAULT_TRAIN_BARS, test_bars=DEFAULT_TEST_BARS,
+                             n_estimators=BACKTEST_N_ESTIMATORS, max_train_rows=MAX_TRAIN_ROWS, random_state=42,
+                             job=None):
+    """Out-of-sample predicted returns (NaN where nothing was predicted) and the fold windows.
+
+    Each fold fits one forest on the trailing `train_bars` of every asset, then predicts the next
+    `test_bars`; the model never sees a target from its own test window. A training-job context
+    gets progress per fold and can cancel between folds.
+    """
+    n_assets, n_bars = next_return.shape
+    finite_features = np.ones((n_assets, n_bars), dtype=bool)
+    for name in STRATEGY_FEATURE_NAMES:
+        finite_features &= np.isfinite(indicators[name])
+
+    rng = np.random.default_rng(random_state)
+    predicted = np.full((n_assets, n_bars), np.nan)
+    folds = []
+    # The last bar has no next return to trade on
+    test_starts = range(train_bars, n_bars - 1, test_bars)
+    for fold_index, test_start in enumerate(test_starts):
+        if job is not None:
+            job.check_cancelled()
+            job.report(fold_index / len(test_starts), f"fold {fold_index + 1}/{len(test_starts)}")
+        test_end = min(test_start + test_bars, n_bars - 1)
+        train = slice(test_start - train_bars, test_start)
+        mask = finite_features[:, train] & np.isfinite(next_return[:, train])
+        y = next_return[:, train][mask]
+        if len(y) < MIN_TRAIN_ROWS:
+            continue
+        X = _feature_rows(indicators, train)[mask.ravel()]
+        if len(y) > max_train_rows:
+            sample = rng.choice(len(y), max_train_rows, replace=False)
+            X, y = X[sample], y[sample]
+
+        bundle, _ = fit_forest_bundle(X, y, STRATEGY_FEATURE_NAMES, n_estimators=n_estimators,
+                                      random_state=random_state, **BACKTEST_FOREST_PARAMS)
+
+        test = slice(test_start, test_end)
+        test_mask = finite_features[:, test]
+        block = np.full(test_mask.shape, np.nan)
+        if test_mask.any():
+            rows = _feature_rows(indicators, test)[test_mask.ravel()]
+            block[test_mask] = bundle["model"].predict(bundle["scaler"].transform(rows))
+        predicted[:, test] = block
+        folds.append({
+            "train_start": test_start - train_bars,
+            "test_start": test_start,
+            "test_end": test_end,
+            "training_rows": len(y)
+        })
+    return predicted, folds
+
+
+def _performance(returns):
+    """Return and risk metrics for each row of a (series x bars) array of per-bar returns"""
+    equity = np.cumprod(1 + returns, axis=1)
+    total_return = equity[:, -1] - 1
+    mean, std = returns.mean(axis=1), returns.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(equity[:, -1] > 0, equity[:, -1], 0.0) ** (HOURS_PER_YEAR / returns.shape[1])
+        sharpe = np.where(std > 0, mean / std * np.sqrt(HOURS_PER_YEAR), 0.0)
+    return {
+        "total_return": total_return,
+        "annualized_return": growth - 1,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+    }
+
+
+def _hit_rate(exposed, hits, axis=None):
+    # Share of bars holding a position whose position earned a positive return
+    exposed_bars = exposed.sum(axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(exposed_bars > 0, hits.sum(axis=axis) / exposed_bars, np.nan)
+
+
+def backtest_signals(close, predicted, fee_rate=SWAP_FEE_RATE, allow_short=False, config=None):
+    """Vectorized position and PnL accounting for predicted returns over a (assets x bars) close panel.
+
+    Predictions become strategies with the recommendation thresholds in `config`, strategies become
+    target positions (HOLD keeps the previous one), and a position taken at a bar's close earns
+    the next bar's return less fees on the change in position.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    traded = ~np.isnan(predicted)
+    traded[:, -1] = False  # No next bar to earn a return on
+    bars = np.flatnonzero(traded.any(axis=0))
+    if len(bars) == 0:
+        return None
+    window = slice(bars[0], bars[-1] + 1)
+
+    codes = classify_returns(predicted[:, window], config)
+    position_map = LONG_SHORT_POSITIONS if allow_short else LONG_ONLY_POSITIONS
+    targets = np.where(traded[:, window], position_map[codes], np.nan)
+    positions = _forward_fill(targets)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        asset_returns = np.nan_to_num(close[:, window.start + 1:window.stop + 1] / close[:, window] - 1)
+    turnover = np.abs(np.diff(positions, axis=1, prepend=0.0))
+    strategy_returns = positions * asset_returns - fee_rate * turnover
+
+    exposed = positions != 0
+    hits = exposed & (positions * asset_returns > 0)
+    per_asset = {
+        **_performance(strategy_returns),
+        "hit_rate": _hit_rate(exposed, hits, axis=1),
+        "exposure": exposed.mean(axis=1)
+    }
+    # Equal-weight portfolio, rebalanced every bar
+    portfolio = {
+        **_performance(strategy_returns.mean(axis=0, keepdims=True)),
+        "hit_rate": np.atleast_1d(_hit_rate(exposed, hits)),
+        "exposure": np.atleast_1d(exposed.mean())
+    }
+    buy_and_hold = close[:, window.stop] / close[:, window.start] - 1
+
+    def as_json(value):
+        return None if not np.isfinite(value) else round(float(value), 6)
+
+    counts = np.bincount(codes[traded[:, window]], minlength=len(STRATEGIES))
+    return {
+        "start_bar": int(window.start),
+        "end_bar": int(window.stop),
+        "backtest_bars": int(window.stop - window.start),
+        "portfolio": {
+            **{key: as_json(values[0]) for key, values in portfolio.items()},
+            "buy_and_hold_return": as_json(buy_and_hold.mean()),
+            "trades": int((turnover > 0).sum()),
+            "fees_paid": as_json(fee_rate * turnover.sum() / len(close))
+        },
+        "per_asset": [
+            {
+                **{key: as_json(values[asset]) for key, values in per_asset.items()},
+                "buy_and_hold_return": as_json(buy_and_hold[asset]),
+                "trades": int((turnover[asset] > 0).sum())
+            }
+            for asset in range(len(close))
+        ],
+        "signal_counts": {strategy: int(count) for strategy, count in zip(STRATEGIES, counts)}
+    }
+
+
+def walk_forward_backtest(close, high, low, volume, train_bars=DEFAULT_TRAIN_BARS, test_bars=DEFAULT_TEST_BARS,
+                          n_estimators=BACKTEST_N_ESTIMATORS, max_train_rows=MAX_TRAIN_ROWS,
+                          fee_rate=SWAP_FEE_RATE, allow_short=False, config=None, random_state=42, job=None):
+    """Replay (assets x bars) hourly OHLCV through the indicator pipeline, walk-forward models and
+    the strategy thresholds; returns performance metrics, or None if there is too little data"""
+    started = time.perf_counter()
+    close = np.asarray(close, dtype=np.float64)
+    indicators = calculate_indicators_batch(close, high, low, volume)
+    indicators_seconds = time.perf_counter() - started
+
+    next_return = np.full(close.shape, np.nan)
+    next_return[:, :-1] = close[:, 1:] / close[:, :-1] - 1
+    predicted, folds = walk_forward_predictions(
+        indicators, next_return, train_bars=train_bars, test_bars=test_bars,
+        n_estimators=n_estimators, max_train_rows=max_train_rows, random_state=random_state, job=job
+    )
+    models_seconds = time.perf_counter() - started - indicators_seconds
+
+    result = backtest_signals(close, predicted, fee_rate=fee_rate, allow_short=allow_short, config=config)
+    if result is None:
+        return None
+    return {
+        **result,
+        "assets": int(close.shape[0]),
+        "bars": int(close.shape[1]),
+        "folds": folds,
+        "settings": {
+            "train_bars": train_bars,
+            "test_bars": test_bars,
+            "n_estimators": n_estimators,
+            "max_train_rows": max_train_rows,
+            "fee_rate": fee_rate,
+            "allow_short": allow_short
+        },
+        "timings": {
+            "indicators_seconds": round(indicators_seconds, 3),
+            "models_seconds": round(models_seconds, 3),
+            "total_seconds": round(time.perf_counter() - started, 3)
+        }
+    }
+
+
+def run_backtest_job(prices=None, n_assets=None, n_bars=None, seed=42, job=None, **settings):
+    """Training-job entry point: walk-forward backtest of posted (assets x bars) price arrays, or of a
+    mock panel generated in the worker so it never travels between processes"""
+    if prices is not None:
+        panel = {key: np.atleast_2d(np.asarray(prices[key], dtype=np.float64))
+                 for key in ("close", "high", "low", "volume")}
+    else:
+        panel = generate_mock_panel(n_assets, n_bars, seed=seed)
+    return walk_forward_backtest(panel["close"], panel["high"], panel["low"], panel["volume"], job=job, **settings)
@@ -0,0 +1,194 @@
+import numpy as np
+from scipy.signal import lfilter
+
+# Same columns, in the same order, as AIStrategyEngine.calculate_technical_indicators adds to a DataFrame
+INDICATOR_NAMES = (
+    'sma_7', 'sma_14', 'sma_21', 'sma_50',
+    'ema_12', 'ema_26',
+    'macd', 'macd_signal', 'macd_histogram',
+    'rsi',
+    'bb_middle', 'bb_upper', 'bb_lower', 'bb_width', 'bb_position',
+    'volume_sma', 'volume_ratio',
+    'momentum_5', 'momentum_10', 'momentum_20',
+    'atr', 'volatility_20',
+    'support', 'resistance', 'support_distance', 'resistance_distance',
+    'higher_highs', 'lower_lows'
+)
+DEFAULT_CHUNK_TOKENS = 128  # Tokens processed together; bounds temporaries to a few (chunk x time) arrays
+MAX_LOOKBACK = 50  # Longest window (sma_50); every windowed indicator depends on at most this many points
+
+
+def _window_sums(csum, window):
+    """(tokens x time) trailing-window sums from a cumulative sum, NaN before the first full window"""
+    out = np.full(csum.shape, np.nan)
+    if csum.shape[1] < window:
+        return out
+    out[:, window - 1] = csum[:, window - 1]
+    out[:, window:] = csum[:, window:] - csum[:, :-window]
+    return out
+
+
+def rolling_mean(x, window):
+    """pandas rolling(window).mean() along axis 1, via cumulative sums of row-centered data"""
+    center = x[:, :1]  # Centering keeps the cumulative sums small, so long series don't lose precision
+    return _window_sums(np.cumsum(x - center, axis=1), window) / window + center
+
+
+def rolling_std(x, window):
+    """pandas rolling(window).std() (ddof=1) along axis 1.
+
+    Two-pass (deviations from each window's mean), so a small spread on a drifting level keeps
+    full precision; sum-of-squares differences lose digits over long series.
+    """
+    n = x.shape[1]
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    mean = rolling_mean(x, window)[:, window - 1:]
+    squares = np.zeros(mean.shape)
+    for lag in range(window):
+        deviation = x[:, lag:n - window + 1 + lag] - mean
+        squares += deviation * deviation
+    out[:, window - 1:] = np.sqrt(squares / (window - 1))
+    return out
+
+
+def rolling_sum(x, window):
+    """pandas rolling(window).sum() along axis 1 for NaN-free input"""
+    return _window_sums(np.cumsum(x, axis=1), window)
+
+
+def _rolling_extreme(x, window, reduce):
+    """Trailing-window min/max from power-of-two windows built by doubling (log2(window) passes)"""
+    n = x.shape[1]
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    span = 1
+    level = x  # level[:, i] = reduce(x[:, i:i + span])
+    while span * 2 <= window:
+        level = reduce(level[:, :-span], level[:, span:])
+        span *= 2
+    # Two overlapping power-of-two windows cover [i, i + window)
+    out[:, window - 1:] = reduce(level[:, :n - window + 1], level[:, window - span:])
+    return out
+
+
+def rolling_min(x, window):
+    return _rolling_extreme(x, window, np.minimum)
+
+
+def rolling_max(x, window):
+    return _rolling_extreme(x, window, np.maximum)
+
+
+def ewm_mean(x, span):
+    """pandas ewm(span=span).mean() (adjust=True) along axis 1 for NaN-free input"""
+    decay = 1 - 2.0 / (span + 1)
+    numerator = lfilter([1.0], [1.0, -decay], x, axis=1)
+    denominator = lfilter([1.0], [1.0, -decay], np.ones(x.shape[1]))
+    return numerator / denominator
+
+
+def shift(x, periods):
+    """pandas shift(periods) along axis 1 (periods > 0)"""
+    out = np.full(x.shape, np.nan)
+    out[:, periods:] = x[:, :-periods]
+    return out
+
+
+def _indicator_block(close, high, low, volume, start=0):
+    """Indicators for time steps start.. of a (chunk x time) block.
+
+    EWMs (adjust=True) weight the whole history, so they always run over every point; windowed
+    indicators only need MAX_LOOKBACK points before `start`.
+    """
+    out = {}
+    ema_12 = ewm_mean(close, 12)
+    ema_26 = ewm_mean(close, 26)
+    macd = ema_12 - ema_26
+    macd_signal = ewm_mean(macd, 9)
+
+    # Points before `offset` can't influence any windowed value from `start` on
+    offset = max(start - MAX_LOOKBACK, 0)
+    close, high, low, volume = close[:, offset:], high[:, offset:], low[:, offset:], volume[:, offset:]
+    out['ema_12'] = ema_12[:, offset:]
+    out['ema_26'] = ema_26[:, offset:]
+    out['macd'] = macd[:, offset:]
+    out['macd_signal'] = macd_signal[:, offset:]
+    out['macd_histogram'] = out['macd'] - out['macd_signal']
+
+    out['sma_7'] = rolling_mean(close, 7)
+    out['sma_14'] = rolling_mean(close, 14)
+    out['sma_21'] = rolling_mean(close, 21)
+    out['sma_50'] = rolling_mean(close, 50)
+
+    # diff() is NaN at t=0, which where(delta > 0, 0) turns into a zero gain/loss
+    delta = np.zeros(close.shape)
+    delta[:, 1:] = np.diff(close, axis=1)
+    avg_gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+    avg_loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+    rs = avg_gain / avg_loss
+    out['rsi'] = 100 - (100 / (1 + rs))
+
+    # pandas gives a constant window its exact mean and a zero std; cumulative sums leave rounding error
+    # there, which would turn a flat stretch's 0/0 band position into a finite or infinite value
+    flat_20 = rolling_max(close, 20) == rolling_min(close, 20)
+    out['bb_middle'] = np.where(flat_20, close, rolling_mean(close, 20))
+    std_20 = np.where(flat_20, 0.0, rolling_std(close, 20))
+    out['bb_upper'] = out['bb_middle'] + std_20 * 2
+    out['bb_lower'] = out['bb_middle'] - std_20 * 2
+    out['bb_width'] = out['bb_upper'] - out['bb_lower']
+    out['bb_position'] = (close - out['bb_lower']) / (out['bb_upper'] - out['bb_lower'])
+
+    out['volume_sma'] = rolling_mean(volume, 20)
+    out['volume_ratio'] = volume / out['volume_sma']
+
+    out['momentum_5'] = (close / shift(close, 5) - 1) * 100
+    out['momentum_10'] = (close / shift(close, 10) - 1) * 100
+    out['momentum_20'] = (close / shift(close, 20) - 1) * 100
+
+    # True range is NaN at t=0 because the previous close is unknown
+    previous_close = shift(close, 1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    out['atr'] = np.full(close.shape, np.nan)
+    out['atr'][:, 1:] = rolling_mean(true_range[:, 1:], 14)
+    out['volatility_20'] = std_20 / out['bb_middle']
+
+    out['support'] = rolling_min(low, 20)
+    out['resistance'] = rolling_max(high, 20)
+    out['support_distance'] = (close - out['support']) / close
+    out['resistance_distance'] = (out['resistance'] - close) / close
+
+    higher = np.zeros(close.shape)
+    higher[:, 1:] = high[:, 1:] > high[:, :-1]
+    lower = np.zeros(close.shape)
+    lower[:, 1:] = low[:, 1:] < low[:, :-1]
+    out['higher_highs'] = rolling_sum(higher, 5)
+    out['lower_lows'] = rolling_sum(lower, 5)
+    return {name: values[:, start - offset:] for name, values in out.items()}
+
+
+def calculate_indicators_batch(close, high, low, volume, last_n=None, chunk_size=DEFAULT_CHUNK_TOKENS):
+    """Full indicator set for a (tokens x time) panel in one vectorized pass.
+
+    Returns {name: (tokens x time) array}, or only the last `last_n` time steps of each
+    when set (e.g. last_n=1 for the current tick of every token).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if close.ndim != 2:
+        raise ValueError("Expected a 2-D (tokens x time) array")
+    n_tokens, n_points = close.shape
+    width = n_points if last_n is None else min(last_n, n_points)
+
+    result = {name: np.empty((n_tokens, width)) for name in INDICATOR_NAMES}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, n_tokens, chunk_size):
+            rows = slice(start, start + chunk_size)
+            block = _indicator_block(close[rows], high[rows], low[rows], volume[rows], start=n_points - width)
+            for name in INDICATOR_NAMES:
+                result[name][rows] = block[name]
+    return result
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, loader, ttl_seconds, stale_seconds, is_cacheable=None):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.is_cacheable = is_cacheable or (lambda value: True)
+        self._value = None
+        self._fetched_at = None  # time.monotonic() of the last successful load
+        self._fetched_at_wall = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # Serializes synchronous loads on a miss
+        self._refreshing = False
+        self.version = 0  # Bumped on every store or invalidation, for caches derived from the value
+
+    def _store(self, value):
+        """Keep a freshly loaded value if it is worth caching"""
+        if not self.is_cacheable(value):
+            return False
+        with self._lock:
+            self._value = value
+            self._fetched_at = time.monotonic()
+            self._fetched_at_wall = datetime.now()
+            self.version += 1
+        return True
+
+    def _info(self, state):
+        age = time.monotonic() - self._fetched_at if self._fetched_at is not None else 0.0
+        return {
+            "state": state,
+            "age_seconds": round(age, 3),
+            "fetched_at": self._fetched_at_wall.isoformat() if self._fetched_at_wall else None,
+            "version": self.version,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds
+        }
+
+    def _background_refresh(self):
+        try:
+            self._store(self.loader())
+        except Exception as e:
+            print(f"Background cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self):
+        """Return (value, cache info); serves stale values while one background refresh runs"""
+        with self._lock:
+            age = time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+            if age is not None and age <= self.ttl_seconds:
+                return self._value, self._info("fresh")
+
+            if age is not None and age <= self.ttl_seconds + self.stale_seconds:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._background_refresh, daemon=True).start()
+                return self._value, self._info("stale")
+
+        # Nothing usable cached: load synchronously, letting concurrent callers share one load
+        with self._load_lock:
+            with self._lock:
+                if self._fetched_at is not None and time.monotonic() - self._fetched_at <= self.ttl_seconds:
+                    return self._value, self._info("fresh")
+
+            value = self.loader()
+            if self._store(value):
+                return value, self._info("miss")
+            return value, {"state": "uncached", "age_seconds": 0.0, "fetched_at": None, "version": None,
+                           "ttl_seconds": self.ttl_seconds, "stale_seconds": self.stale_seconds}
+
+    def peek(self, max_age_seconds=None):
+        """Cached value no older than max_age_seconds, or None; never loads or refreshes"""
+        with self._lock:
+            if self._fetched_at is None:
+                return None
+            if max_age_seconds is not None and time.monotonic() - self._fetched_at > max_age_seconds:
+                return None
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._fetched_at = None
+            self._fetched_at_wall = None
+            self.version += 1
+
+
+class LRUCache:
+    """Bounded, thread-safe mapping that evicts the least recently used key"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached value for key (marking it most recently used), or None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None
+            }
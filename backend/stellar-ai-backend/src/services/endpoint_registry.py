@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+NEGATIVE_CACHE_SECONDS = 600  # How long a 404 keeps an endpoint out of probes
+REPROBE_INTERVAL_SECONDS = 30  # Minimum gap between re-probes while nothing works
+MAX_PROBE_WORKERS = 8
+
+
+class EndpointRegistry:
+    def __init__(self, base_url, candidates, client, timeout=10,
+                 negative_cache_seconds=NEGATIVE_CACHE_SECONDS, max_probe_workers=MAX_PROBE_WORKERS):
+        self.base_url = base_url
+        self.candidates = list(candidates)  # In priority order
+        self.client = client
+        self.timeout = timeout
+        self.negative_cache_seconds = negative_cache_seconds
+        self.max_probe_workers = max_probe_workers
+        self._active = None  # Endpoint that last returned usable data
+        self._not_found = {}  # endpoint -> monotonic expiry of its negative cache entry
+        self._probing = False
+        self._last_probe = None
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+
+    def _request(self, endpoint, timeout=None, retries=None):
+        """GET one endpoint, returning the response or the request exception"""
+        try:
+            return self.client.get(f"{self.base_url}{endpoint}", timeout=timeout or self.timeout, retries=retries)
+        except requests.exceptions.RequestException as e:
+            return e
+
+    def _parse(self, response):
+        """Return decoded JSON for a usable response, otherwise None"""
+        if isinstance(response, Exception) or response.status_code != 200:
+            return None
+        if not response.text or response.text.strip() == "":
+            return None
+        try:
+            return response.json()
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    def observe(self, endpoint, response):
+        """Record a 404 (negative cache) or success for an endpoint"""
+        with self._lock:
+            if not isinstance(response, Exception) and response.status_code == 404:
+                self._not_found[endpoint] = time.monotonic() + self.negative_cache_seconds
+            elif not isinstance(response, Exception) and response.status_code == 200:
+                self._not_found.pop(endpoint, None)
+
+    def _is_negative(self, endpoint):
+        expiry = self._not_found.get(endpoint)
+        if expiry is None:
+            return False
+        if expiry <= time.monotonic():
+            del self._not_found[endpoint]
+            return False
+        return True
+
+    def probe(self, endpoints, timeout=None, retries=0):
+        """Probe endpoints in parallel, returning [(endpoint, response or exception)] in input order"""
+        if not endpoints:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_probe_workers, len(endpoints))) as executor:
+            responses = list(executor.map(lambda ep: self._request(ep, timeout=timeout, retries=retries), endpoints))
+
+        for endpoint, response in zip(endpoints, responses):
+            self.observe(endpoint, response)
+        return list(zip(endpoints, responses))
+
+    def discover(self):
+        """Probe all non-negative candidates in parallel and remember the best working one"""
+        with self._probe_lock:
+            with self._lock:
+                endpoints = [ep for ep in self.candidates if not self._is_negative(ep)]
+
+            found = None
+            for endpoint, response in self.probe(endpoints):
+                data = self._parse(response)
+                if data is not None:
+                    found = (endpoint, data)
+                    break
+
+            with self._lock:
+                self._active = found[0] if found else None
+                self._last_probe = time.monotonic()
+            if found:
+                print(f"Soroswap endpoint discovered: {self.base_url}{found[0]}")
+            return found
+
+    def _background_discover(self):
+        try:
+            self.discover()
+        except Exception as e:
+            print(f"Endpoint re-probe failed: {e}")
+        finally:
+            with self._lock:
+                self._probing = False
+
+    def fetch(self):
+        """Fetch from the remembered endpoint; returns (endpoint, data) or (None, None)"""
+        with self._lock:
+            endpoint = self._active
+            probing = self._probing
+            last_probe = self._last_probe
+
+        if endpoint is None:
+            if last_probe is None:
+                found = self.discover()
+                return found if found else (None, None)
+            # Nothing works right now; re-probe occasionally but never on the request path
+            if not probing and time.monotonic() - last_probe >= REPROBE_INTERVAL_SECONDS:
+                self._start_background_discover()
+            return None, None
+
+        response = self._request(endpoint)
+        self.observe(endpoint, response)
+        data = self._parse(response)
+        if data is not None:
+            return endpoint, data
+
+        # Remembered endpoint started failing: forget it and re-probe off the request path
+        print(f"Soroswap endpoint {endpoint} stopped responding, re-probing in background")
+        with self._lock:
+            if self._active == endpoint:
+                self._active = None
+        self._start_background_discover()
+        return None, None
+
+    def _start_background_discover(self):
+        with self._lock:
+            if self._probing:
+                return
+            self._probing = True
+        threading.Thread(target=self._background_discover, daemon=True).start()
+
+    def status(self):
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "active_endpoint": self._active,
+                "probing": self._probing,
+                "negative_cache": {
+                    ep: round(expiry - now, 1) for ep, expiry in self._not_found.items() if expiry > now
+                }
+            }
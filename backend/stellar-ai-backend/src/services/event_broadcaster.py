@@ -0,0 +1,103 @@
+import json
+import threading
+from collections import deque
+
+KEEPALIVE_MESSAGE = b": keepalive\n\n"  # SSE comment line; keeps proxies from closing idle streams
+
+
+def format_event(event_id, event, data):
+    """One server-sent event, encoded"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class Subscription:
+    """One client's bounded queue of encoded events; when full the oldest event is dropped"""
+
+    def __init__(self, max_queued):
+        self._queue = deque(maxlen=max_queued)
+        self._ready = threading.Condition()
+        self.dropped = 0
+
+    def push(self, message):
+        with self._ready:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(message)
+            self._ready.notify()
+
+    def drain(self, timeout):
+        """Every queued event, waiting up to timeout seconds for the first one"""
+        with self._ready:
+            if not self._queue:
+                self._ready.wait(timeout)
+            messages = list(self._queue)
+            self._queue.clear()
+        return messages
+
+
+class EventBroadcaster:
+    """Fans events out to subscribers, encoding each one once however many clients are connected"""
+
+    def __init__(self, max_queued, max_subscribers=None):
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers  # None: unlimited
+        self._subscribers = set()
+        self._latest = {}  # Event name -> last encoded event, replayed to new subscribers
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0  # Events dropped from queues of subscribers that have since left
+
+    def subscribe(self):
+        """New subscription primed with the latest events, or None once max_subscribers are connected"""
+        subscription = Subscription(self.max_queued)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+            for message in self._latest.values():
+                subscription.push(message)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.discard(subscription)
+                self.dropped += subscription.dropped
+
+    def publish(self, event, data):
+        """Queue an event for every subscriber; returns how many received it"""
+        with self._lock:
+            message = format_event(self._next_id, event, data)
+            self._next_id += 1
+            self._latest[event] = message
+            self.published += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.push(message)
+        return len(subscribers)
+
+    def stream(self, subscription, keepalive_seconds):
+        """Generator of SSE bytes for one subscription; unsubscribes when closed"""
+        try:
+            while True:
+                messages = subscription.drain(keepalive_seconds)
+                yield b"".join(messages) if messages else KEEPALIVE_MESSAGE
+        finally:
+            self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            dropped = self.dropped
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "dropped": dropped + sum(subscription.dropped for subscription in subscribers),
+            "max_queued_per_subscriber": self.max_queued,
+            "max_subscribers": self.max_subscribers
+        }
@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1000  # Rows kept, matching the in-memory snapshot history
+MARKET_FEATURE_COLUMNS = (
+    "total_tokens", "total_market_cap", "average_price_change",
+    "total_volume", "positive_movers", "negative_movers"
+)
+INTEGER_COLUMNS = ("total_tokens", "positive_movers", "negative_movers")
+MAJOR_TOKENS = ("XLM", "USDC", "BTC")  # Tokens whose indicators are stored with every row
+
+
+def market_feature_row(snapshot, indicators=None):
+    """Aggregate market features for one snapshot, plus <token>_<indicator> columns for major tokens"""
+    tokens = snapshot["tokens"]
+    changes = [t["change_24h"] for t in tokens]
+    row = {
+        "total_tokens": len(tokens),
+        "total_market_cap": sum(t["market_cap"] for t in tokens),
+        "average_price_change": sum(changes) / len(tokens),
+        "total_volume": sum(t["volume"] for t in tokens),
+        "positive_movers": sum(1 for change in changes if change > 0),
+        "negative_movers": sum(1 for change in changes if change < 0)
+    }
+    if indicators is not None:
+        for token in MAJOR_TOKENS:
+            for key, value in (indicators.get(token) or {}).items():
+                row[f"{token}_{key}"] = value
+    return row
+
+
+class FeatureStore:
+    """Feature rows computed once per snapshot at ingestion, kept column-wise and keyed by snapshot id.
+
+    Columns are fixed-size float64 ring buffers; a feature first seen in a later row gets a new
+    column that is NaN for earlier rows. Rows are never recomputed, only appended and evicted.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._snapshot_ids = np.zeros(self.capacity, dtype=np.int64)
+            self._timestamps = [None] * self.capacity  # ISO strings
+            self._columns = {}  # feature name -> float64 array, NaN where a row lacks the feature
+            self._slots = {}  # snapshot id -> slot
+            self._next = 0  # Next write slot
+            self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, snapshot_id):
+        return snapshot_id in self._slots
+
+    def append(self, snapshot_id, timestamp, features):
+        """O(features) append; the oldest row is evicted once the store is full"""
+        with self._lock:
+            slot = self._next
+            if self._size == self.capacity:
+                del self._slots[int(self._snapshot_ids[slot])]
+            else:
+                self._size += 1
+            for column in self._columns.values():
+                column[slot] = np.nan
+            for name, value in features.items():
+                column = self._columns.get(name)
+                if column is None:
+                    column = self._columns[name] = np.full(self.capacity, np.nan)
+                column[slot] = np.nan if value is None else value
+            self._snapshot_ids[slot] = snapshot_id
+            self._timestamps[slot] = timestamp
+            self._slots[snapshot_id] = slot
+            self._next = (slot + 1) % self.capacity
+
+    def _order(self):
+        # Slots oldest first
+        return np.arange(self._next - self._size, self._next) % self.capacity
+
+    def _row(self, slot):
+        row = {"snapshot_id": int(self._snapshot_ids[slot]), "market_timestamp": self._timestamps[slot]}
+        for name, column in self._columns.items():
+            value = column[slot]
+            if not np.isnan(value):
+                row[name] = int(value) if name in INTEGER_COLUMNS else float(value)
+        return row
+
+    def row(self, snapshot_id):
+        """Feature dict for one snapshot, or None if it was never stored or has been evicted"""
+        with self._lock:
+            slot = self._slots.get(snapshot_id)
+            return None if slot is None else self._row(slot)
+
+    def latest(self):
+        with self._lock:
+            if self._size == 0:
+                return None
+            return self._row((self._next - 1) % self.capacity)
+
+    def columns(self, names=None):
+        """{name: array} copies oldest first, plus "snapshot_id"; names defaults to every column"""
+        with self._lock:
+            order = self._order()
+            names = list(self._columns) if names is None else names
+            result = {name: self._columns[name][order] if name in self._columns else np.full(len(order), np.nan)
+                      for name in names}
+            result["snapshot_id"] = self._snapshot_ids[order]
+            return result
+
+    def time_range(self):
+        with self._lock:
+            if self._size == 0:
+                return {"start": None, "end": None}
+            order = self._order()
+            return {"start": self._timestamps[order[0]], "end": self._timestamps[order[-1]]}
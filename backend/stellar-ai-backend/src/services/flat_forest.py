@@ -0,0 +1,74 @@
+import numpy as np
+
+TREE_LEAF = -1  # sklearn's children_left / children_right marker for leaves
+
+
+class FlatForest:
+    """A fitted forest regressor (plus optional StandardScaler) exported to flat node arrays.
+
+    All trees share one set of arrays, indexed by global node id; leaves point at themselves, so
+    every row walks max_depth steps with a handful of NumPy gathers and no per-tree Python calls.
+    Results are bit-identical to scaler.transform + model.predict: the same float64 scaling,
+    the same float32 feature comparisons as sklearn's trees, and tree outputs summed in order.
+    """
+
+    def __init__(self, model, scaler=None):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        self.n_trees = len(trees)
+        self.n_features = model.n_features_in_
+        self.roots = offsets.astype(np.intp)
+        self.feature = np.concatenate([np.maximum(tree.feature, 0) for tree in trees]).astype(np.intp)
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+        self.value = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+
+        left, right = [], []
+        for tree, offset in zip(trees, offsets):
+            node_ids = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == TREE_LEAF
+            left.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = np.column_stack([np.concatenate(left), np.concatenate(right)]).ravel().astype(np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+        # Where NaN features go (sklearn >= 1.3); older trees send NaN right, as "NaN <= t" is false
+        self.missing_go_left = (np.concatenate([tree.missing_go_to_left for tree in trees]).astype(bool)
+                                if hasattr(trees[0], "missing_go_to_left") else np.zeros(len(self.value), dtype=bool))
+
+        self.mean = None if scaler is None or scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = None if scaler is None or scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+
+    def predict(self, X):
+        """Predictions for a (rows x features) array, identical to scaler.transform + model.predict"""
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but the model expects {self.n_features}")
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        # sklearn trees compare float32 features against float64 thresholds
+        X = X.astype(np.float32)
+        if np.isinf(X).any():
+            # Rejected by sklearn's input validation too (NaN is allowed and routed per node)
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32')")
+
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)  # (trees x rows)
+        # Row-major flat index of X[row, feature] is row * n_features + feature
+        row_starts = np.arange(len(X)) * self.n_features
+        X = X.ravel()
+        has_missing = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            values = X[row_starts + self.feature[nodes]]
+            go_right = values > self.threshold[nodes]
+            if has_missing:
+                go_right = np.where(np.isnan(values), ~self.missing_go_left[nodes], go_right)
+            nodes = self.children[2 * nodes + go_right]
+        # Reducing over the leading axis adds tree by tree, matching the forest's accumulation order
+        return self.value[nodes].sum(axis=0) / self.n_trees
+
+    def nbytes(self):
+        arrays = (self.roots, self.feature, self.threshold, self.value, self.children, self.missing_go_left)
+        return sum(array.nbytes for array in arrays)
@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+RECONNECT_BASE_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+STREAM_READ_TIMEOUT = 60  # Seconds without any bytes (events or keep-alives) before reconnecting
+STREAM_CONNECT_TIMEOUT = 10
+
+
+def iter_stream_lines(raw, chunk_size=65536):
+    """Yield lines as soon as they arrive (read1 returns whatever bytes are available)"""
+    buffer = b""
+    while True:
+        chunk = raw.read1(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+def iter_sse_events(lines):
+    """Parse a text/event-stream line iterator into {"event", "data", "id", "retry"} dicts"""
+    event = {"event": "message", "data": [], "id": None, "retry": None}
+    for raw_line in lines:
+        line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+        line = line.rstrip("\r")
+
+        if line == "":
+            # Blank line dispatches the event (if it carried anything)
+            if event["data"] or event["id"] is not None:
+                yield {**event, "data": "\n".join(event["data"])}
+            event = {"event": "message", "data": [], "id": None, "retry": None}
+            continue
+        if line.startswith(":"):
+            continue  # Comment / keep-alive
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+
+        if field == "data":
+            event["data"].append(value)
+        elif field == "event":
+            event["event"] = value
+        elif field == "id":
+            event["id"] = value
+        elif field == "retry" and value.isdigit():
+            event["retry"] = int(value)
+
+
+class SSESubscription:
+    def __init__(self, name, url, params, on_record, client, cursor="now"):
+        self.name = name
+        self.url = url
+        self.params = {k: v for k, v in (params or {}).items() if v is not None}
+        self.on_record = on_record
+        self.client = client
+        self.cursor = cursor  # Horizon paging token of the last event we processed
+        self.events_received = 0
+        self.reconnects = 0
+        self.last_event_at = None
+        self.last_error = None
+        self.connected = False
+        self._retry_seconds = None  # Server-requested reconnect delay
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._response = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"sse-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            # Closing the response unblocks the reader thread
+            response.close()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                self._consume()
+                failures = 0
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                self.last_error = str(e)
+                failures += 1
+            finally:
+                self.connected = False
+                self._response = None
+
+            if self._stop_event.is_set():
+                break
+            self.reconnects += 1
+            delay = self._retry_seconds if self._retry_seconds is not None else min(
+                RECONNECT_MAX_SECONDS, RECONNECT_BASE_SECONDS * (2 ** max(failures - 1, 0)))
+            if failures == 0 and self._retry_seconds is None:
+                delay = 0  # Clean server close: resume from the cursor right away
+            self._stop_event.wait(delay)
+
+    def _consume(self):
+        headers = {"Accept": "text/event-stream"}
+        params = dict(self.params)
+        if self.cursor is not None:
+            params["cursor"] = self.cursor
+            if self.cursor != "now":
+                headers["Last-Event-ID"] = self.cursor
+
+        response = self.client.get(self.url, params=params, headers=headers, stream=True, retries=0,
+                                   timeout=(STREAM_CONNECT_TIMEOUT, STREAM_READ_TIMEOUT))
+        self._response = response
+        if response.status_code != 200:
+            response.close()
+            raise requests.exceptions.HTTPError(f"Stream {self.name} returned {response.status_code}")
+
+        self.connected = True
+        self.last_error = None
+        for event in iter_sse_events(iter_stream_lines(response.raw)):
+            if self._stop_event.is_set():
+                break
+            if event["retry"] is not None:
+                self._retry_seconds = event["retry"] / 1000.0
+            if not event["data"]:
+                continue
+
+            try:
+                record = json.loads(event["data"])
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue  # Horizon's "hello" / "byebye" control messages
+
+            self.on_record(record)
+            if event["id"]:
+                self.cursor = event["id"]
+            self.events_received += 1
+            self.last_event_at = datetime.now().isoformat()
+        response.close()
+
+    def status(self):
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "cursor": self.cursor,
+            "events_received": self.events_received,
+            "reconnects": self.reconnects,
+            "last_event_at": self.last_event_at,
+            "last_error": self.last_error
+        }
+
+
+class HorizonStreamIngestor:
+    def __init__(self, base_url, client):
+        self.base_url = base_url
+        self.client = client
+        self.latest_ledger = None
+        self.order_books = {}  # key -> {"bids", "asks", "ledger", "version", "received_at"}
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self.started_at = None
+
+    def subscribe_ledgers(self, cursor="now"):
+        # Re-subscribing keeps the existing subscription so a restart resumes from its cursor
+        if "ledgers" in self._subscriptions:
+            return
+        self._subscriptions["ledgers"] = SSESubscription(
+            "ledgers", f"{self.base_url}/ledgers", {}, self._on_ledger, self.client, cursor=cursor
+        )
+
+    def subscribe_order_book(self, key, params):
+        # Order book streams send the full book on every change, so no cursor is needed
+        if f"order_book:{key}" in self._subscriptions:
+            return
+        self._subscriptions[f"order_book:{key}"] = SSESubscription(
+            f"order_book:{key}", f"{self.base_url}/order_book", params,
+            lambda record: self._on_order_book(key, record), self.client, cursor=None
+        )
+
+    def _on_ledger(self, record):
+        with self._lock:
+            self.latest_ledger = {
+                "sequence": record.get("sequence", 0),
+                "base_fee_in_stroops": record.get("base_fee_in_stroops", 100),
+                "operation_count": record.get("operation_count", 0),
+                "transaction_count": record.get("transaction_count", 0),
+                "closed_at": record.get("closed_at"),
+                "received_at": time.monotonic()
+            }
+
+    def _on_order_book(self, key, record):
+        with self._lock:
+            ledger = self.latest_ledger["sequence"] if self.latest_ledger else None
+            previous = self.order_books.get(key)
+            self.order_books[key] = {
+                "bids": record.get("bids", []),
+                "asks": record.get("asks", []),
+                "ledger": ledger,
+                "version": previous["version"] + 1 if previous else 1,  # Bumped on every book update
+                "received_at": time.monotonic()
+            }
+
+    def start(self):
+        self.started_at = datetime.now().isoformat()
+        for subscription in self._subscriptions.values():
+            subscription.start()
+
+    def stop(self):
+        for subscription in self._subscriptions.values():
+            subscription.stop()
+        for subscription in self._subscriptions.values():
+            subscription.join(timeout=5)
+        self.started_at = None
+
+    def is_running(self):
+        return self.started_at is not None
+
+    def get_latest_ledger(self, max_age_seconds=None):
+        """Latest streamed ledger, or None if not streaming / too old"""
+        with self._lock:
+            ledger = self.latest_ledger
+        if ledger is None or not self.is_running():
+            return None
+        if max_age_seconds is not None and time.monotonic() - ledger["received_at"] > max_age_seconds:
+            return None
+        return ledger
+
+    def get_order_book(self, key, max_age_seconds=None):
+        """Latest streamed order book for a key, or None if not streaming / disconnected / too old"""
+        with self._lock:
+            book = self.order_books.get(key)
+        if book is None or not self.is_running():
+            return None
+        # A dropped stream misses every update until it reconnects, so its last book may be outdated
+        subscription = self._subscriptions.get(f"order_book:{key}")
+        if subscription is None or not subscription.connected:
+            return None
+        if max_age_seconds is not None and time.monotonic() - book["received_at"] > max_age_seconds:
+            return None
+        return book
+
+    def status(self):
+        return {
+            "running": self.is_running(),
+            "started_at": self.started_at,
+            "latest_ledger": self.latest_ledger["sequence"] if self.latest_ledger else None,
+            "order_books": len(self.order_books),
+            "subscriptions": {name: sub.status() for name, sub in self._subscriptions.items()}
+        }
@@ -0,0 +1,127 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connection pool settings (per upstream host)
+DEFAULT_POOL_MAXSIZE = 10  # Keep-alive connections kept open per host
+HOST_POOL_SIZES = {}  # Per-host overrides, e.g. {"horizon.stellar.org": 20}
+PER_HOST_CONCURRENCY = 4  # Max in-flight requests to any single upstream host
+
+# Retry settings
+DEFAULT_TIMEOUT = 10  # Seconds, used when a call doesn't pass its own timeout
+DEFAULT_MAX_RETRIES = 2
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PooledHttpClient:
+    def __init__(self, pool_maxsize=DEFAULT_POOL_MAXSIZE, host_pool_sizes=None,
+                 max_concurrency_per_host=PER_HOST_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE_SECONDS, backoff_max=BACKOFF_MAX_SECONDS, timeout=DEFAULT_TIMEOUT):
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes)
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._hosts = {}  # host -> {"session", "adapter", "semaphore", "stats"}
+        self._lock = threading.Lock()
+
+    def _get_host(self, url):
+        """Get (or lazily create) the keep-alive session and limits for a URL's host"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                pool_size = self.host_pool_sizes.get(host, self.pool_maxsize)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._hosts[host] = {
+                    "session": session,
+                    "adapter": adapter,
+                    "pool_size": pool_size,
+                    "semaphore": threading.BoundedSemaphore(self.max_concurrency_per_host),
+                    "stats": {"requests": 0, "retries": 0, "errors": 0}
+                }
+            return self._hosts[host]
+
+    def _backoff_delay(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, params=None, headers=None, timeout=None, retries=None, stream=False):
+        """GET through the host's pooled session, retrying connection errors and retryable statuses"""
+        host = self._get_host(url)
+        retries = self.max_retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+
+        attempt = 0
+        while True:
+            try:
+                with host["semaphore"]:
+                    response = host["session"].get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+                with self._lock:
+                    host["stats"]["requests"] += 1
+
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                response.close()
+
+            except requests.exceptions.RequestException:
+                with self._lock:
+                    host["stats"]["requests"] += 1
+                    host["stats"]["errors"] += 1
+                if attempt >= retries:
+                    raise
+
+            with self._lock:
+                host["stats"]["retries"] += 1
+            time.sleep(self._backoff_delay(attempt))
+            attempt += 1
+
+    def stats(self):
+        """Per-host request counts and connection reuse rates"""
+        with self._lock:
+            hosts = dict(self._hosts)
+
+        report = {}
+        for host, entry in hosts.items():
+            connections_opened = 0
+            pool_requests = 0
+            # urllib3 keeps one pool per scheme/host/port behind the adapter
+            pools = entry["adapter"].poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections_opened += pool.num_connections
+                    pool_requests += pool.num_requests
+
+            reused = max(pool_requests - connections_opened, 0)
+            report[host] = {
+                **entry["stats"],
+                "pool_size": entry["pool_size"],
+                "connections_opened": connections_opened,
+                "connections_reused": reused,
+                "reuse_rate": round(reused / pool_requests, 3) if pool_requests else 0.0
+            }
+
+        return {
+            "hosts": report,
+            "settings": {
+                "default_pool_size": self.pool_maxsize,
+                "max_concurrency_per_host": self.max_concurrency_per_host,
+                "max_retries": self.max_retries,
+                "default_timeout": self.timeout
+            }
+        }
+
+
+# Shared client used by both strategy engines
+http_client = PooledHttpClient()
@@ -0,0 +1,185 @@
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+SMA_WINDOWS = (7, 14, 21)
+BOLLINGER_WINDOW = 20
+RSI_PERIOD = 14
+VOLUME_WINDOW = 7
+MOMENTUM_LAG = 4  # momentum_5 compares the last price with the one 4 steps earlier (5-point window)
+MIN_POINTS = 14  # No indicators are reported before this many points
+RESYNC_EVERY = 1000  # Recompute running sums from the window this often to cancel float drift
+RSI_LOSS_FLOOR = 0.001  # Keeps RS finite when there were no losses
+
+
+class TokenIndicators:
+    """Indicators for one token, updated in O(1) per appended point"""
+
+    def __init__(self):
+        self.count = 0
+        self._prices = deque(maxlen=max(SMA_WINDOWS + (BOLLINGER_WINDOW, MOMENTUM_LAG + 1)))
+        self._volumes = deque(maxlen=VOLUME_WINDOW)
+        self._price_sums = {window: 0.0 for window in SMA_WINDOWS}
+        self._volume_sum = 0.0
+        # Windowed Welford state for the Bollinger window
+        self._bb_mean = 0.0
+        self._bb_m2 = 0.0
+        # Wilder RSI state: simple average over the first RSI_PERIOD changes, then smoothed
+        self._changes = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def append(self, price, volume):
+        prices = self._prices
+        previous = prices[-1] if prices else None
+
+        for window in SMA_WINDOWS:
+            self._price_sums[window] += price
+            if len(prices) >= window:
+                self._price_sums[window] -= prices[-window]
+
+        if len(prices) >= BOLLINGER_WINDOW:
+            outgoing = prices[-BOLLINGER_WINDOW]
+            old_mean = self._bb_mean
+            self._bb_mean += (price - outgoing) / BOLLINGER_WINDOW
+            self._bb_m2 += (price - outgoing) * (price - self._bb_mean + outgoing - old_mean)
+        else:
+            n = len(prices) + 1
+            delta = price - self._bb_mean
+            self._bb_mean += delta / n
+            self._bb_m2 += delta * (price - self._bb_mean)
+
+        if previous is not None:
+            change = price - previous
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            self._changes += 1
+            if self._changes <= RSI_PERIOD:
+                self._avg_gain += (gain - self._avg_gain) / self._changes
+                self._avg_loss += (loss - self._avg_loss) / self._changes
+            else:
+                self._avg_gain = (self._avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self._avg_loss = (self._avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+
+        self._volume_sum += volume
+        if len(self._volumes) == VOLUME_WINDOW:
+            self._volume_sum -= self._volumes[0]
+
+        prices.append(price)
+        self._volumes.append(volume)
+        self.count += 1
+        if self.count % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        window = np.fromiter(self._prices, dtype=np.float64)
+        for size in SMA_WINDOWS:
+            self._price_sums[size] = float(window[-size:].sum())
+        bb = window[-BOLLINGER_WINDOW:]
+        self._bb_mean = float(bb.mean())
+        self._bb_m2 = float(((bb - self._bb_mean) ** 2).sum())
+        self._volume_sum = float(sum(self._volumes))
+
+    def snapshot(self):
+        """Current indicators (same keys as the batch calculation), or None with too little history"""
+        n = self.count
+        if n < MIN_POINTS:
+            return None
+
+        indicators = {}
+        for window in SMA_WINDOWS:
+            if n >= window:
+                indicators[f"sma_{window}"] = self._price_sums[window] / window
+
+        if self._changes >= RSI_PERIOD:
+            rs = self._avg_gain / (self._avg_loss or RSI_LOSS_FLOOR)
+            indicators["rsi"] = 100 - (100 / (1 + rs))
+
+        last_price = self._prices[-1]
+        if n >= BOLLINGER_WINDOW:
+            std_dev = math.sqrt(max(self._bb_m2, 0.0) / BOLLINGER_WINDOW)
+            indicators["bb_upper"] = self._bb_mean + 2 * std_dev
+            indicators["bb_lower"] = self._bb_mean - 2 * std_dev
+            width = indicators["bb_upper"] - indicators["bb_lower"]
+            indicators["bb_position"] = (last_price - indicators["bb_lower"]) / width if width > 0 else 0.5
+
+        if n >= VOLUME_WINDOW:
+            indicators["volume_sma"] = self._volume_sum / VOLUME_WINDOW
+            indicators["volume_ratio"] = self._volumes[-1] / indicators["volume_sma"] if indicators["volume_sma"] > 0 else 1
+
+        if n >= MOMENTUM_LAG + 1:
+            base = self._prices[-(MOMENTUM_LAG + 1)]
+            indicators["momentum_5"] = (last_price - base) / base if base > 0 else 0
+
+        return indicators
+
+
+class IndicatorBook:
+    def __init__(self):
+        self._tokens = {}  # token code -> TokenIndicators
+        self._lock = threading.Lock()
+
+    def __contains__(self, token):
+        return token in self._tokens
+
+    def append(self, token, price, volume):
+        indicators = self._tokens.get(token)
+        if indicators is None:
+            with self._lock:
+                indicators = self._tokens.setdefault(token, TokenIndicators())
+        indicators.append(price, volume)
+
+    def get(self, token):
+        indicators = self._tokens.get(token)
+        return indicators.snapshot() if indicators is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._tokens = {}
+
+
+def compute_indicators(prices, volumes):
+    """Batch recomputation over a full price/volume history; reference for the incremental path"""
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    n = prices.size
+    if n < MIN_POINTS:
+        return None
+
+    indicators = {}
+    for window in SMA_WINDOWS:
+        if n >= window:
+            indicators[f"sma_{window}"] = float(prices[-window:].mean())
+
+    changes = np.diff(prices)
+    if changes.size >= RSI_PERIOD:
+        gains = changes.clip(min=0)
+        losses = (-changes).clip(min=0)
+        avg_gain = gains[:RSI_PERIOD].mean()
+        avg_loss = losses[:RSI_PERIOD].mean()
+        for gain, loss in zip(gains[RSI_PERIOD:], losses[RSI_PERIOD:]):
+            avg_gain = (avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+            avg_loss = (avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+        rs = avg_gain / (avg_loss or RSI_LOSS_FLOOR)
+        indicators["rsi"] = float(100 - (100 / (1 + rs)))
+
+    if n >= BOLLINGER_WINDOW:
+        window = prices[-BOLLINGER_WINDOW:]
+        sma = window.mean()
+        std_dev = window.std()
+        indicators["bb_upper"] = float(sma + 2 * std_dev)
+        indicators["bb_lower"] = float(sma - 2 * std_dev)
+        width = indicators["bb_upper"] - indicators["bb_lower"]
+        indicators["bb_position"] = (float(prices[-1]) - indicators["bb_lower"]) / width if width > 0 else 0.5
+
+    if n >= VOLUME_WINDOW:
+        indicators["volume_sma"] = float(volumes[-VOLUME_WINDOW:].mean())
+        indicators["volume_ratio"] = float(volumes[-1]) / indicators["volume_sma"] if indicators["volume_sma"] > 0 else 1
+
+    if n >= MOMENTUM_LAG + 1:
+        base = prices[-(MOMENTUM_LAG + 1)]
+        indicators["momentum_5"] = float((prices[-1] - base) / base) if base > 0 else 0
+
+    return indicators
@@ -0,0 +1,38 @@
+import numpy as np
+
+DEFAULT_BASE_PRICE = 0.1247  # XLM price the mock series is anchored to
+HOURLY_VOLATILITY = 0.015
+DAILY_TREND = 0.0001
+CYCLE_AMPLITUDE = 0.003  # 24-hour price cycle
+BASE_VOLUME = 500000
+MIN_PRICE = 0.01
+
+
+def generate_mock_panel(n_assets, periods, seed=None, base_prices=DEFAULT_BASE_PRICE):
+    """Hourly mock OHLCV for many assets in one vectorized pass.
+
+    Returns {"open", "high", "low", "close", "volume"} as (n_assets x periods) float64 arrays.
+    Uses its own np.random.Generator, so calls never touch or depend on the global RNG.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.broadcast_to(np.asarray(base_prices, dtype=np.float64).reshape(-1, 1), (n_assets, 1))
+
+    hours = np.arange(periods, dtype=np.float64)
+    trend = DAILY_TREND * hours / 24  # Small daily trend
+    cycle = CYCLE_AMPLITUDE * np.sin(2 * np.pi * hours / 24)  # Daily pattern
+
+    price_change = rng.normal(0, HOURLY_VOLATILITY, (n_assets, periods))
+    price_change[:, 0] = 0
+    close = np.maximum(base + trend + cycle + price_change * base, MIN_PRICE)
+
+    # Higher volume on bigger moves
+    volume = BASE_VOLUME * (1 + np.abs(price_change) * 10) * rng.uniform(0.3, 2.5, (n_assets, periods))
+
+    # Intraday range around the close, then enforce High >= Open/Close >= Low
+    open_ = np.empty_like(close)
+    open_[:, 0] = close[:, 0]
+    open_[:, 1:] = close[:, :-1]
+    high = np.maximum(close * rng.uniform(1.001, 1.02, (n_assets, periods)), np.maximum(open_, close))
+    low = np.minimum(close * rng.uniform(0.98, 0.999, (n_assets, periods)), np.minimum(open_, close))
+
+    return {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
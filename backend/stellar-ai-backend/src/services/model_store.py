@@ -0,0 +1,98 @@
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+
+import joblib
+
+BUNDLE_FILE = "model.joblib"
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"  # Holds the version name the server should serve
+VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+class ModelStore:
+    """Versioned model artifacts on disk: <root>/v0001/{model.joblib, metadata.json} plus a CURRENT pointer"""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _versions(self):
+        versions = [name for name in os.listdir(self.root)
+                    if VERSION_PATTERN.match(name) and os.path.isfile(os.path.join(self.root, name, METADATA_FILE))]
+        return sorted(versions, key=lambda name: int(VERSION_PATTERN.match(name).group(1)))
+
+    def _write_pointer(self, version):
+        tmp_path = os.path.join(self.root, CURRENT_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+
+    def _read_metadata(self, version):
+        with open(os.path.join(self.root, version, METADATA_FILE)) as f:
+            return json.load(f)
+
+    def save(self, bundle, metadata):
+        """Write a new version and make it current; returns its metadata (with "version" and "created_at")"""
+        with self._lock:
+            versions = self._versions()
+            last = int(VERSION_PATTERN.match(versions[-1]).group(1)) if versions else 0
+            version = f"v{last + 1:04d}"
+            metadata = {**metadata, "version": version, "created_at": datetime.now().isoformat()}
+
+            # Build in a temp dir and rename, so a half-written version is never listed
+            tmp_dir = os.path.join(self.root, f".{version}.tmp")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            # Uncompressed so numpy arrays inside the model can be memory-mapped on load
+            joblib.dump(bundle, os.path.join(tmp_dir, BUNDLE_FILE))
+            with open(os.path.join(tmp_dir, METADATA_FILE), "w") as f:
+                json.dump(metadata, f, indent=2)
+            os.rename(tmp_dir, os.path.join(self.root, version))
+
+            self._write_pointer(version)
+            return metadata
+
+    def current_version(self):
+        """Version named by CURRENT, else the newest one, else None"""
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        versions = self._versions()
+        if os.path.exists(pointer):
+            with open(pointer) as f:
+                version = f.read().strip()
+            if version in versions:
+                return version
+        return versions[-1] if versions else None
+
+    def load(self, version=None, mmap=True):
+        """(bundle, metadata) for a version (current by default), or (None, None) if there is none"""
+        version = version or self.current_version()
+        if version is None:
+            return None, None
+        if version not in self._versions():
+            raise KeyError(f"Unknown model version {version}")
+        bundle = joblib.load(os.path.join(self.root, version, BUNDLE_FILE), mmap_mode="r" if mmap else None)
+        return bundle, self._read_metadata(version)
+
+    def set_current(self, version):
+        with self._lock:
+            if version not in self._versions():
+                raise KeyError(f"Unknown model version {version}")
+            self._write_pointer(version)
+
+    def previous_version(self):
+        """Version saved just before the current one, or None"""
+        versions = self._versions()
+        current = self.current_version()
+        if current is None:
+            return None
+        index = versions.index(current)
+        return versions[index - 1] if index > 0 else None
+
+    def list_versions(self):
+        current = self.current_version()
+        return [{**self._read_metadata(version), "current": version == current} for version in self._versions()]
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+ONLINE_MAX_TREES = 30  # Growing a tree past this retires the oldest one
+ONLINE_WINDOW_ROWS = 5000  # New trees are fit on a bootstrap sample of only the most recent rows
+ONLINE_ROWS_PER_TREE = 1  # New rows needed before another tree is grown
+ONLINE_MIN_ROWS = 10  # Rows needed before the first tree
+
+
+class OnlineForest:
+    """Rolling random forest for streaming rows.
+
+    partial_fit() adds rows to a fixed window and grows trees on bootstrap samples of that window,
+    retiring the oldest trees past max_trees. Update cost depends on the window size, never on
+    how many rows have been seen in total.
+    """
+
+    def __init__(self, max_trees=ONLINE_MAX_TREES, window_rows=ONLINE_WINDOW_ROWS,
+                 rows_per_tree=ONLINE_ROWS_PER_TREE, min_rows=ONLINE_MIN_ROWS, random_state=None):
+        self.max_trees = max_trees
+        self.window_rows = window_rows
+        self.rows_per_tree = rows_per_tree
+        self.min_rows = min_rows
+        self._rng = np.random.default_rng(random_state)
+        self._X = None  # (window_rows x n_features) ring buffer, allocated on the first rows
+        self._y = np.zeros(window_rows, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+        self._pending = 0  # Rows added since the last tree was grown
+        self._trees = ()  # Replaced as a whole so predict() never sees a half-updated forest
+        self._lock = threading.Lock()
+        self.rows_seen = 0
+        self.trees_grown = 0
+        self.last_update_ms = None
+
+    def _store(self, X, y):
+        # Rows older than the window would be overwritten straight away
+        X, y = X[-self.window_rows:], y[-self.window_rows:]
+        if self._X is None:
+            self._X = np.zeros((self.window_rows, X.shape[1]), dtype=np.float64)
+        slots = (self._next + np.arange(len(y))) % self.window_rows
+        self._X[slots] = X
+        self._y[slots] = y
+        self._next = (self._next + len(y)) % self.window_rows
+        self._size = min(self._size + len(y), self.window_rows)
+
+    def _grow_tree(self):
+        sample = self._rng.integers(0, self._size, self._size)  # Bootstrap, as in RandomForestRegressor
+        tree = DecisionTreeRegressor(random_state=int(self._rng.integers(np.iinfo(np.int32).max)))
+        tree.fit(self._X[sample], self._y[sample])
+        self._trees = (self._trees + (tree,))[-self.max_trees:]
+        self.trees_grown += 1
+
+    def partial_fit(self, X, y):
+        """Add rows and grow one tree per rows_per_tree new rows; returns the number of trees grown"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64).ravel()
+        with self._lock:
+            started = time.perf_counter()
+            self._store(X, y)
+            self.rows_seen += len(y)
+            self._pending += len(y)
+
+            grown = 0
+            if self._size >= self.min_rows:
+                # Trees beyond max_trees would be retired by the same update
+                grown = min(self._pending // self.rows_per_tree, self.max_trees)
+                for _ in range(grown):
+                    self._grow_tree()
+                self._pending = self._pending % self.rows_per_tree if grown < self.max_trees else 0
+            self.last_update_ms = round((time.perf_counter() - started) * 1000, 3)
+            return grown
+
+    @property
+    def is_ready(self):
+        return len(self._trees) > 0
+
+    def predict(self, X):
+        """Mean of the current trees' predictions, or None before the first tree"""
+        trees = self._trees
+        if not trees:
+            return None
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return np.mean([tree.predict(X) for tree in trees], axis=0)
+
+    def status(self):
+        return {
+            "trees": len(self._trees),
+            "max_trees": self.max_trees,
+            "window_rows": self._size,
+            "max_window_rows": self.window_rows,
+            "rows_seen": self.rows_seen,
+            "trees_grown": self.trees_grown,
+            "last_update_ms": self.last_update_ms
+        }
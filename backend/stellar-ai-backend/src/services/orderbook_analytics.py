@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_DEPTH_BANDS = (0.005, 0.01, 0.02, 0.05)  # Distance from mid, as a fraction of mid
+MAX_CACHED_BOOKS = 256
+
+
+def parse_order_book(book):
+    """Parse Horizon bid/ask levels into float64 arrays once: (bid_prices, bid_amounts, ask_prices, ask_amounts)"""
+    bids = book.get("bids", [])
+    asks = book.get("asks", [])
+    return (
+        np.array([level["price"] for level in bids], dtype=np.float64),
+        np.array([level["amount"] for level in bids], dtype=np.float64),
+        np.array([level["price"] for level in asks], dtype=np.float64),
+        np.array([level["amount"] for level in asks], dtype=np.float64)
+    )
+
+
+def analyze_levels(bid_prices, bid_amounts, ask_prices, ask_amounts, bands=DEFAULT_DEPTH_BANDS):
+    """Mid, spread, banded cumulative depth and imbalance for parsed book arrays"""
+    bands = np.asarray(bands, dtype=np.float64)
+    bid_notional = bid_prices * bid_amounts
+    ask_notional = ask_prices * ask_amounts
+
+    result = {
+        "bid_levels": int(bid_prices.size),
+        "ask_levels": int(ask_prices.size),
+        "total_notional": float(bid_notional.sum() + ask_notional.sum()),
+        "mid": None,
+        "spread": None,
+        "spread_bps": None,
+        "depth": {}
+    }
+    if bid_prices.size == 0 or ask_prices.size == 0:
+        return result
+
+    best_bid = bid_prices.max()
+    best_ask = ask_prices.min()
+    mid = (best_bid + best_ask) / 2
+    result["mid"] = float(mid)
+    result["best_bid"] = float(best_bid)
+    result["best_ask"] = float(best_ask)
+    result["spread"] = float(best_ask - best_bid)
+    result["spread_bps"] = float((best_ask - best_bid) / mid * 10000) if mid > 0 else None
+
+    # One (bands x levels) mask per side gives the cumulative depth inside every band at once
+    bid_in_band = bid_prices[np.newaxis, :] >= (mid * (1 - bands))[:, np.newaxis]
+    ask_in_band = ask_prices[np.newaxis, :] <= (mid * (1 + bands))[:, np.newaxis]
+    bid_depth = bid_in_band @ bid_notional
+    ask_depth = ask_in_band @ ask_notional
+    total_depth = bid_depth + ask_depth
+    with np.errstate(invalid="ignore", divide="ignore"):
+        imbalance = np.where(total_depth > 0, (bid_depth - ask_depth) / total_depth, 0.0)
+
+    for band, bid, ask, imb in zip(bands, bid_depth, ask_depth, imbalance):
+        result["depth"][f"{band * 100:g}%"] = {
+            "bid": float(bid),
+            "ask": float(ask),
+            "imbalance": float(imb)
+        }
+    return result
+
+
+class OrderBookAnalytics:
+    def __init__(self, bands=DEFAULT_DEPTH_BANDS, max_cached=MAX_CACHED_BOOKS):
+        self.bands = tuple(bands)
+        self.max_cached = max_cached
+        self._cache = OrderedDict()  # (pair, version) -> analytics, LRU ordered
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, pair, book, version=None):
+        """Analyze a book; results are reused per (pair, version) when a version is known"""
+        key = (pair, version)
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return cached
+
+        result = analyze_levels(*parse_order_book(book), bands=self.bands)
+        result["version"] = version
+
+        with self._lock:
+            self.misses += 1
+            if version is not None:
+                self._cache[key] = result
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"cached_books": len(self._cache), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,326 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.services.batch_indicators import calculate_indicators_batch
+from src.services.flat_forest import FlatForest
+from src.services.strategy_signals import (
+    DEFAULT_STRATEGY_CONFIG, MODEL_CONFIG_KEYS, SIGNAL_CONFIG_KEYS, STRATEGY_DIRECTIONS,
+    classify_returns, signal_confidence
+)
+from src.services.training import STRATEGY_FEATURE_NAMES, fit_forest_bundle
+
+# Values tried per setting; keys are DEFAULT_STRATEGY_CONFIG keys
+DEFAULT_SEARCH_SPACE = {
+    "n_estimators": [25, 50, 100],
+    "max_depth": [None, 8],
+    "strong_signal_return": [0.01, 0.02, 0.03],
+    "moderate_signal_return": [0.0025, 0.005, 0.01],
+    "reversal_confidence_boost": [1.0, 1.2, 1.4],
+    "neutral_rsi_confidence_factor": [0.6, 0.8, 1.0],
+    "high_volume_confidence_boost": [1.0, 1.1, 1.2],
+    "low_volume_confidence_factor": [0.6, 0.8, 1.0]
+}
+MAX_CANDIDATES = 20000  # Grid size accepted per sweep
+TRAIN_FRACTION = 0.7  # Earlier bars of every asset train the models, later bars score them
+MIN_TRAIN_ROWS = 50  # Same minimum as prepare_training_data
+LATENCY_ROWS = 100  # Test rows predicted one at a time, the way the engine serves a recommendation
+LATENCY_REPEATS = 3  # Best of, to damp scheduler noise
+INFERENCE_BACKENDS = ("flat", "sklearn")  # Same choices as the strategy engine's inference_backend
+TOP_CANDIDATES = 20  # Candidates listed in a sweep's status next to the Pareto front
+MAX_FINISHED_SWEEPS = 20
+TERMINAL_STATES = ("succeeded", "failed")
+
+_timing_lock = None  # Set in pool workers: one worker times predictions at a time
+
+RSI_COLUMN = STRATEGY_FEATURE_NAMES.index("rsi")
+VOLUME_RATIO_COLUMN = STRATEGY_FEATURE_NAMES.index("volume_ratio")
+
+
+def expand_search(space=None, mode="grid", n_samples=None, seed=None):
+    """Candidate configs: the full grid over `space`, or `n_samples` of them drawn at random"""
+    space = {**DEFAULT_SEARCH_SPACE, **(space or {})}
+    unknown = set(space) - set(DEFAULT_STRATEGY_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    if mode not in ("grid", "random"):
+        raise ValueError("mode must be 'grid' or 'random'")
+    values = [list(options) if isinstance(options, (list, tuple)) else [options] for options in space.values()]
+    if any(not options for options in values):
+        raise ValueError("Every sweep parameter needs at least one value")
+    n_grid = int(np.prod([len(options) for options in values]))
+    if n_grid > MAX_CANDIDATES:
+        raise ValueError(f"Grid of {n_grid} candidates exceeds the limit of {MAX_CANDIDATES}")
+
+    candidates = [dict(zip(space, combination)) for combination in itertools.product(*values)]
+    # A moderate threshold at or above the strong one leaves no MODERATE_* band
+    candidates = [c for c in candidates if c["moderate_signal_return"] < c["strong_signal_return"]]
+    if mode == "random" and n_samples is not None and n_samples < len(candidates):
+        picked = np.random.default_rng(seed).choice(len(candidates), n_samples, replace=False)
+        candidates = [candidates[i] for i in sorted(picked)]
+    return candidates
+
+
+def group_by_model(candidates):
+    """[(model settings, [signal configs])]: each forest is fit once for all configs that share it"""
+    groups = OrderedDict()
+    for candidate in candidates:
+        key = tuple(candidate[name] for name in MODEL_CONFIG_KEYS)
+        groups.setdefault(key, []).append({name: candidate[name] for name in SIGNAL_CONFIG_KEYS})
+    return [(dict(zip(MODEL_CONFIG_KEYS, key)), configs) for key, configs in groups.items()]
+
+
+def build_sweep_dataset(close, high, low, volume, train_fraction=TRAIN_FRACTION):
+    """Feature rows and next-period returns from (assets x bars) OHLCV, split by time into train/test"""
+    close = np.asarray(close, dtype=np.float64)
+    indicators = calculate_indicators_batch(close, high, low, volume)
+    next_return = np.full(close.shape, np.nan)
+    next_return[:, :-1] = close[:, 1:] / close[:, :-1] - 1
+    features = np.stack([indicators[name] for name in STRATEGY_FEATURE_NAMES], axis=-1)
+    valid = np.isfinite(features).all(axis=-1) & np.isfinite(next_return)
+    is_train = np.arange(close.shape[1]) < int(close.shape[1] * train_fraction)
+    return {
+        "X_train": features[valid & is_train],
+        "y_train": next_return[valid & is_train],
+        "X_test": features[valid & ~is_train],
+        "y_test": next_return[valid & ~is_train]
+    }
+
+
+def share_arrays(arrays):
+    """Copy arrays into shared memory once; returns (blocks to close/unlink, spec workers attach with)"""
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+def attach_arrays(spec):
+    """Zero-copy views of shared arrays; close the blocks only after dropping every view"""
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+
+def score_signals(predicted, realized, rsi, volume_ratio, config):
+    """Confidence-weighted directional accuracy of the actionable signals one config produces"""
+    direction = STRATEGY_DIRECTIONS[classify_returns(predicted, config)]
+    actionable = direction != 0
+    correct = direction * realized > 0
+    confidence = signal_confidence(predicted, rsi, volume_ratio, config) * actionable
+    weight = confidence.sum()
+    return {
+        "accuracy": round(float((confidence * correct).sum() / weight), 6) if weight > 0 else 0.0,
+        "hit_rate": round(float(correct[actionable].mean()), 6) if actionable.any() else 0.0,
+        "coverage": round(float(actionable.mean()), 6)
+    }
+
+
+def serving_predictor(bundle, inference_backend):
+    """Single-row predict function for a fitted bundle, as the strategy engine would serve it"""
+    if inference_backend == "flat":
+        return FlatForest(bundle["model"], bundle["scaler"]).predict
+    if inference_backend == "sklearn":
+        model, scaler = bundle["model"], bundle["scaler"]
+        return lambda X: model.predict(scaler.transform(X))
+    raise ValueError(f"inference_backend must be one of {', '.join(INFERENCE_BACKENDS)}")
+
+
+def measure_inference_latency(predict, rows, repeats=LATENCY_REPEATS):
+    """Microseconds per prediction when every row is predicted on its own, best of `repeats` passes"""
+    rows = [row[None, :] for row in rows]
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for row in rows:
+            predict(row)
+        timings.append(time.perf_counter() - started)
+    return min(timings) / len(rows) * 1e6
+
+
+def _score_model(data, model_settings, signal_configs, random_state, inference_backend):
+    started = time.perf_counter()
+    bundle, _ = fit_forest_bundle(data["X_train"], data["y_train"], STRATEGY_FEATURE_NAMES,
+                                  random_state=random_state, **model_settings)
+    fit_seconds = time.perf_counter() - started
+
+    X_test = data["X_test"]
+    predicted = bundle["model"].predict(bundle["scaler"].transform(X_test))
+    predict = serving_predictor(bundle, inference_backend)
+    with _timing_lock or nullcontext():
+        latency_us = measure_inference_latency(predict, X_test[:LATENCY_ROWS])
+
+    rsi, volume_ratio = X_test[:, RSI_COLUMN], X_test[:, VOLUME_RATIO_COLUMN]
+    return [
+        {
+            **model_settings,
+            **config,
+            **score_signals(predicted, data["y_test"], rsi, volume_ratio, config),
+            "inference_us_per_row": round(latency_us, 3),
+            "fit_seconds": round(fit_seconds, 3)
+        }
+        for config in signal_configs
+    ]
+
+
+def _init_worker(timing_lock):
+    global _timing_lock
+    _timing_lock = timing_lock
+
+
+def evaluate_model(spec, model_settings, signal_configs, random_state=42, inference_backend="flat"):
+    """Worker task: fit one forest on the shared training rows and score every signal config with it.
+
+    Latency is timed on single rows through `inference_backend` while holding the pool's timing lock,
+    so two workers never time at once; only the scores leave the worker, never the forest.
+    """
+    blocks, data = attach_arrays(spec)
+    try:
+        return _score_model(data, model_settings, signal_configs, random_state, inference_backend)
+    finally:
+        data.clear()  # Views must go before their buffers close
+        for block in blocks:
+            block.close()
+
+
+def pareto_front(candidates):
+    """Candidates no other candidate beats on both accuracy (higher) and inference latency (lower)"""
+    front, best_accuracy = [], -np.inf
+    for candidate in sorted(candidates, key=lambda c: (c["inference_us_per_row"], -c["accuracy"])):
+        if candidate["accuracy"] > best_accuracy:
+            front.append(candidate)
+            best_accuracy = candidate["accuracy"]
+    return front
+
+
+class SweepRunner:
+    """Runs sweeps in background threads; each sweep fans its model fits out over a process pool"""
+
+    def __init__(self, max_workers=None, mp_context="spawn"):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._context = multiprocessing.get_context(mp_context)
+        self._sweeps = OrderedDict()  # sweep id -> record, oldest first
+        self._lock = threading.Lock()
+
+    def submit(self, panel, space=None, mode="grid", n_samples=None, seed=42, inference_backend="flat"):
+        """Start a sweep over `panel` ({"close", "high", "low", "volume"} arrays); raises ValueError on a bad space.
+
+        Latency is timed through `inference_backend`, which should be the backend the engine serves with.
+        """
+        if inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"inference_backend must be one of {', '.join(INFERENCE_BACKENDS)}")
+        candidates = expand_search(space, mode=mode, n_samples=n_samples, seed=seed)
+        if not candidates:
+            raise ValueError("The search space produced no candidates")
+        groups = group_by_model(candidates)
+        sweep_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._sweeps[sweep_id] = {
+                "sweep_id": sweep_id,
+                "status": "queued",
+                "mode": mode,
+                "inference_backend": inference_backend,
+                "candidates": len(candidates),
+                "models": len(groups),
+                "models_done": 0,
+                "progress": 0.0,
+                # Every key exists from the start: status() copies the record while _run updates it
+                "training_rows": None,
+                "test_rows": None,
+                "submitted_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "error": None,
+                "_results": None
+            }
+        threading.Thread(target=self._run, args=(sweep_id, panel, groups, seed, inference_backend),
+                         name=f"sweep-{sweep_id}", daemon=True).start()
+        return self.status(sweep_id)
+
+    def _run(self, sweep_id, panel, groups, seed, inference_backend):
+        record = self._sweeps[sweep_id]
+        record["status"] = "running"
+        blocks = []
+        try:
+            dataset = build_sweep_dataset(panel["close"], panel["high"], panel["low"], panel["volume"])
+            if len(dataset["y_train"]) < MIN_TRAIN_ROWS or len(dataset["y_test"]) == 0:
+                raise ValueError("Not enough data for a sweep: need more bars with complete indicators")
+            record["training_rows"] = len(dataset["y_train"])
+            record["test_rows"] = len(dataset["y_test"])
+            # One copy of the feature matrix for every worker instead of one pickle per task
+            blocks, spec = share_arrays(dataset)
+            del dataset
+
+            results = []
+            workers = min(self.max_workers, len(groups))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=self._context, initializer=_init_worker,
+                                     initargs=(self._context.Lock(),)) as pool:
+                futures = [pool.submit(evaluate_model, spec, settings, configs, seed, inference_backend)
+                           for settings, configs in groups]
+                for future in as_completed(futures):
+                    results.extend(future.result())
+                    record["models_done"] += 1
+                    record["progress"] = round(record["models_done"] / len(groups), 4)
+            for candidate_id, candidate in enumerate(results):
+                candidate["candidate_id"] = candidate_id
+            record["_results"] = results
+            record["status"] = "succeeded"
+        except Exception as e:
+            record["status"] = "failed"
+            record["error"] = str(e)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            record["finished_at"] = datetime.now().isoformat()
+            self._trim()
+
+    def _trim(self):
+        with self._lock:
+            finished = [sweep_id for sweep_id, sweep in self._sweeps.items() if sweep["status"] in TERMINAL_STATES]
+            for sweep_id in finished[:max(len(finished) - MAX_FINISHED_SWEEPS, 0)]:
+                del self._sweeps[sweep_id]
+
+    def status(self, sweep_id, top=TOP_CANDIDATES):
+        """Sweep record with its Pareto front and most accurate candidates once it has finished"""
+        sweep = self._sweeps.get(sweep_id)
+        if sweep is None:
+            return None
+        record = {key: value for key, value in sweep.items() if not key.startswith("_")}
+        results = sweep["_results"]
+        if results:
+            record["pareto_front"] = pareto_front(results)
+            record["top_candidates"] = sorted(results, key=lambda c: -c["accuracy"])[:top]
+        return record
+
+    def list_sweeps(self):
+        return [self.status(sweep_id, top=0) for sweep_id in reversed(list(self._sweeps))]
+
+    def candidate(self, sweep_id, candidate_id=None):
+        """One candidate of a finished sweep; by default the most accurate point of its Pareto front"""
+        sweep = self._sweeps.get(sweep_id)
+        if sweep is None or not sweep["_results"]:
+            return None
+        results = sweep["_results"]
+        if candidate_id is None:
+            return pareto_front(results)[-1]
+        return results[candidate_id] if 0 <= candidate_id < len(results) else None
+
+
+# Shared by the strategy routes
+parameter_sweeps = SweepRunner()
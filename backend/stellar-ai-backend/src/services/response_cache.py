@@ -0,0 +1,63 @@
+import gzip
+import hashlib
+
+from src.services.cache import LRUCache
+
+
+class CachedResponse:
+    """Encoded response body with its strong ETag; the gzip encoding is built on first use"""
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+        self.length = len(body)
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self._gzip_body = None
+
+    def gzip_body(self, level):
+        # Concurrent first uses may both compress; either result is correct
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, level)
+        return self._gzip_body
+
+
+class ResponseCache:
+    """Encoded bodies per (endpoint, parameters), reused until the data version they were built from moves on"""
+
+    def __init__(self, max_entries):
+        self._entries = LRUCache(max_entries)
+        self.hits = 0
+        self.builds = 0
+        self.rebuilds = 0  # Builds that replaced an entry from an older version
+
+    def get(self, key, version, build):
+        """Cached response for key at this version, else encode build()'s bytes and cache them.
+
+        Read the version before building: a write that lands mid-build then just forces one more rebuild.
+        """
+        cached = self._entries.get(key)
+        if cached is not None and cached.version == version:
+            self.hits += 1
+            return cached
+        self.builds += 1
+        if cached is not None:
+            self.rebuilds += 1
+        cached = CachedResponse(version, build())
+        self._entries.put(key, cached)
+        return cached
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        entries = self._entries.stats()
+        lookups = self.hits + self.builds
+        return {
+            "entries": entries["entries"],
+            "max_entries": entries["max_entries"],
+            "evictions": entries["evictions"],
+            "hits": self.hits,
+            "builds": self.builds,
+            "rebuilds": self.rebuilds,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
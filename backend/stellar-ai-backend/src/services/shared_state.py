@@ -0,0 +1,110 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime
+
+DEFAULT_LEASE_SECONDS = 15  # A leader that stops renewing is replaced after this long
+LOCK_TIMEOUT_SECONDS = 5  # Wait for SQLite's write lock; well under the lease so a blocked leader steps down in time
+
+
+class SharedState:
+    """Versioned JSON values in SQLite, shared by every worker process using the same database"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS shared_state ("
+                "name TEXT PRIMARY KEY, "
+                "version INTEGER NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "payload TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=LOCK_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def put(self, name, value):
+        """Store a JSON-serializable value and return its new version (1 for a new name)"""
+        payload = json.dumps(value, separators=(",", ":"))
+        with closing(self._connect()) as conn, conn:
+            # The upsert takes the write lock, so concurrent writers get distinct versions
+            conn.execute(
+                "INSERT INTO shared_state (name, version, updated_at, payload) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET version = version + 1, "
+                "updated_at = excluded.updated_at, payload = excluded.payload",
+                (name, time.time(), payload)
+            )
+            (version,) = conn.execute("SELECT version FROM shared_state WHERE name = ?", (name,)).fetchone()
+        return version
+
+    def version(self, name):
+        """Current version of name, 0 if it was never stored; cheaper than get()"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT version FROM shared_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def get(self, name):
+        """(version, value) for name, or (0, None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT version, payload FROM shared_state WHERE name = ?", (name,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else (0, None)
+
+
+class LeaderLease:
+    """Time-limited leadership recorded in SQLite: one holder per name until it stops renewing"""
+
+    def __init__(self, db_path, name, ttl_seconds=DEFAULT_LEASE_SECONDS, holder=None):
+        self.db_path = db_path
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leader_leases ("
+                "name TEXT PRIMARY KEY, "
+                "holder TEXT NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        # A renewal may not outlast the lease it renews; on timeout the holder steps down
+        return sqlite3.connect(self.db_path, timeout=min(LOCK_TIMEOUT_SECONDS, self.ttl_seconds / 3))
+
+    def acquire(self):
+        """Take the lease if it is free or expired, renew it if already held; True while this holder leads"""
+        # Wall-clock time: expiry has to mean the same thing in every process
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO leader_leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                "WHERE leader_leases.holder = excluded.holder OR leader_leases.expires_at < ?",
+                (self.name, self.holder, now + self.ttl_seconds, now)
+            )
+            (holder,) = conn.execute("SELECT holder FROM leader_leases WHERE name = ?", (self.name,)).fetchone()
+        return holder == self.holder
+
+    def release(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM leader_leases WHERE name = ? AND holder = ?", (self.name, self.holder))
+
+    def status(self):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT holder, expires_at FROM leader_leases WHERE name = ?", (self.name,)).fetchone()
+        holder, expires_at = row if row else (None, None)
+        return {
+            "name": self.name,
+            "holder": self.holder,
+            "leader": holder,
+            "is_leader": holder == self.holder and expires_at >= time.time(),
+            "expires_at": datetime.fromtimestamp(expires_at).isoformat() if expires_at else None,
+            "ttl_seconds": self.ttl_seconds
+        }
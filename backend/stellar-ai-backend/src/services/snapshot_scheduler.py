@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_INTERVAL_SECONDS = 3600  # Hourly snapshots
+DEFAULT_JITTER_SECONDS = 60  # Spread runs so many backends don't hit Horizon in lockstep
+
+
+class SnapshotScheduler:
+    def __init__(self, job, interval_seconds=DEFAULT_INTERVAL_SECONDS, jitter_seconds=DEFAULT_JITTER_SECONDS):
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.max_runs = None
+        self.stops_at = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._run_lock = threading.Lock()  # Held while a collection runs; prevents overlap
+        self._state_lock = threading.Lock()
+        self._stats = self._empty_stats()
+
+    def _empty_stats(self):
+        return {
+            "runs": 0,
+            "skipped": 0,
+            "failures": 0,
+            "last_run_started": None,
+            "last_run_finished": None,
+            "last_duration_seconds": None,
+            "last_status": None,
+            "next_run_at": None
+        }
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval_seconds=None, jitter_seconds=None, duration_seconds=None, max_runs=None):
+        """Start the background loop; returns False if it is already running"""
+        with self._state_lock:
+            if self.is_running():
+                return False
+            if interval_seconds is not None:
+                self.interval_seconds = interval_seconds
+            if jitter_seconds is not None:
+                self.jitter_seconds = jitter_seconds
+            self.max_runs = max_runs
+            self.stops_at = (datetime.now() + timedelta(seconds=duration_seconds)
+                             if duration_seconds is not None else None)
+            self._stats = self._empty_stats()
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._loop, args=(self._stop_event,), daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """Stop the loop; a collection already in progress is allowed to finish"""
+        with self._state_lock:
+            if not self.is_running():
+                return False
+            self._stop_event.set()
+            self._stats["next_run_at"] = None
+            return True
+
+    def _next_delay(self):
+        jitter = random.uniform(-self.jitter_seconds, self.jitter_seconds) if self.jitter_seconds else 0
+        return max(0.0, self.interval_seconds + jitter)
+
+    def _loop(self, stop_event):
+        # First run fires immediately, later runs every interval (+/- jitter)
+        delay = 0.0
+        started_runs = 0
+        while True:
+            self._stats["next_run_at"] = (datetime.now() + timedelta(seconds=delay)).isoformat()
+            if stop_event.wait(delay):
+                break
+            if self.stops_at and datetime.now() >= self.stops_at:
+                break
+
+            if self._run_lock.acquire(blocking=False):
+                started_runs += 1
+                threading.Thread(target=self._run_locked, daemon=True).start()
+            else:
+                # Previous collection is still going: skip this tick instead of stacking runs
+                self._stats["skipped"] += 1
+
+            if self.max_runs is not None and started_runs >= self.max_runs:
+                break
+
+            delay = self._next_delay()
+
+        self._stats["next_run_at"] = None
+
+    def _run_locked(self):
+        try:
+            self._execute()
+        finally:
+            self._run_lock.release()
+
+    def _execute(self):
+        started = time.monotonic()
+        self._stats["last_run_started"] = datetime.now().isoformat()
+        try:
+            result = self.job()
+            status = result.get("status", "success") if isinstance(result, dict) else "success"
+        except Exception as e:
+            print(f"Scheduled snapshot collection failed: {e}")
+            result = {"status": "error", "message": str(e)}
+            status = "error"
+
+        self._stats["runs"] += 1
+        if status != "success":
+            self._stats["failures"] += 1
+        self._stats["last_status"] = status
+        self._stats["last_run_finished"] = datetime.now().isoformat()
+        self._stats["last_duration_seconds"] = round(time.monotonic() - started, 3)
+        return result
+
+    def run_now(self):
+        """Run one collection on the caller's thread, waiting for any in-progress run first"""
+        with self._run_lock:
+            return self._execute()
+
+    def status(self):
+        return {
+            "running": self.is_running(),
+            "interval_seconds": self.interval_seconds,
+            "jitter_seconds": self.jitter_seconds,
+            "max_runs": self.max_runs,
+            "stops_at": self.stops_at.isoformat() if self.stops_at else None,
+            "collection_in_progress": self._run_lock.locked(),
+            **self._stats
+        }
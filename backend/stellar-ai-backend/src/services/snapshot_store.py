@@ -0,0 +1,149 @@
+import atexit
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+DEFAULT_BATCH_SIZE = 10  # Snapshots buffered before a write transaction
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0  # Upper bound on how long a snapshot sits in the buffer
+
+
+class SnapshotStore:
+    def __init__(self, db_path, batch_size=DEFAULT_BATCH_SIZE, flush_interval_seconds=DEFAULT_FLUSH_INTERVAL_SECONDS):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.rows_written = 0
+        self.batches_written = 0
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS market_snapshots ("
+                "id INTEGER PRIMARY KEY, "
+                "ts REAL NOT NULL, "
+                "payload TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_market_snapshots_ts ON market_snapshots (ts)")
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="snapshot-store-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def append(self, snapshot):
+        """Queue a snapshot for the next batched write"""
+        row = (
+            snapshot["snapshot_id"],
+            datetime.fromisoformat(snapshot["timestamp"]).timestamp(),
+            json.dumps(snapshot, separators=(",", ":"))
+        )
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def insert(self, snapshot):
+        """Write a snapshot now under an id SQLite assigns; sets and returns snapshot["snapshot_id"].
+
+        Used when several processes write: ids handed out by SQLite can't collide the way ids from
+        each writer's own counter can.
+        """
+        self.flush()  # Keeps ids increasing in write order
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO market_snapshots (ts, payload) VALUES (?, '')",
+                (datetime.fromisoformat(snapshot["timestamp"]).timestamp(),)
+            )
+            snapshot["snapshot_id"] = cursor.lastrowid
+            # Same transaction, so readers never see the row without its payload
+            conn.execute("UPDATE market_snapshots SET payload = ? WHERE id = ?",
+                         (json.dumps(snapshot, separators=(",", ":")), cursor.lastrowid))
+        self.rows_written += 1
+        self.batches_written += 1
+        return snapshot["snapshot_id"]
+
+    def flush(self):
+        """Write all buffered snapshots in one transaction"""
+        with self._write_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            with closing(self._connect()) as conn, conn:
+                # Plain INSERT: a reused id fails loudly instead of replacing a stored snapshot
+                conn.executemany("INSERT INTO market_snapshots (id, ts, payload) VALUES (?, ?, ?)", rows)
+            self.rows_written += len(rows)
+            self.batches_written += 1
+            return len(rows)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Snapshot store flush failed: {e}")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+    def load_recent(self, limit):
+        """Newest `limit` snapshots, oldest first"""
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM market_snapshots ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in reversed(rows)]
+
+    def load_since(self, snapshot_id, limit):
+        """Up to `limit` snapshots with an id above snapshot_id, oldest first"""
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM market_snapshots WHERE id > ? ORDER BY id LIMIT ?", (snapshot_id, limit)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def load_range(self, start, end):
+        """Snapshots with start <= timestamp < end (datetimes), oldest first, via the time index"""
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM market_snapshots WHERE ts >= ? AND ts < ? ORDER BY ts",
+                (start.timestamp(), end.timestamp())
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            count, first_ts, last_ts = conn.execute(
+                "SELECT COUNT(*), MIN(ts), MAX(ts) FROM market_snapshots"
+            ).fetchone()
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "stored_snapshots": count,
+            "pending_writes": pending,
+            "rows_written": self.rows_written,
+            "batches_written": self.batches_written,
+            "first_snapshot": datetime.fromtimestamp(first_ts).isoformat() if first_ts else None,
+            "last_snapshot": datetime.fromtimestamp(last_ts).isoformat() if last_ts else None
+        }
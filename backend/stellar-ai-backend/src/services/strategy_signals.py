@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+
+# Signal thresholds, confidence multipliers and forest settings shared by live recommendations,
+# backtests and parameter sweeps. A sweep can promote a new set (saved as JSON).
+DEFAULT_STRATEGY_CONFIG = {
+    "strong_signal_return": 0.02,  # Beyond +/- this: AGGRESSIVE_BUY / SELL
+    "moderate_signal_return": 0.005,  # Beyond +/- this: MODERATE_BUY / MODERATE_SELL, else HOLD
+    "reversal_confidence_boost": 1.2,  # Prediction against an oversold / overbought RSI
+    "neutral_rsi_confidence_factor": 0.8,  # RSI between 40 and 60
+    "high_volume_confidence_boost": 1.1,  # Volume ratio above 1.5 confirms the signal
+    "low_volume_confidence_factor": 0.8,  # Volume ratio below 0.5
+    "n_estimators": 100,
+    "max_depth": None
+}
+MODEL_CONFIG_KEYS = ("n_estimators", "max_depth")  # Need a retrain; the rest apply to the next prediction
+SIGNAL_CONFIG_KEYS = tuple(key for key in DEFAULT_STRATEGY_CONFIG if key not in MODEL_CONFIG_KEYS)
+
+CONFIDENCE_PER_UNIT_RETURN = 20  # Base confidence is |predicted return| x this
+MAX_CONFIDENCE = 0.95
+
+STRATEGIES = ("AGGRESSIVE_BUY", "MODERATE_BUY", "HOLD", "MODERATE_SELL", "SELL")
+HOLD = STRATEGIES.index("HOLD")
+STRATEGY_DIRECTIONS = np.array([1, 1, 0, -1, -1])  # Side each strategy bets on
+
+
+def load_strategy_config(path):
+    """Saved config merged over the defaults, or the defaults if nothing was saved"""
+    if path is None or not os.path.exists(path):
+        return dict(DEFAULT_STRATEGY_CONFIG)
+    with open(path) as f:
+        return {**DEFAULT_STRATEGY_CONFIG, **json.load(f)}
+
+
+def save_strategy_config(path, config):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def classify_returns(predicted_returns, config=None):
+    """Strategy index into STRATEGIES for every predicted return (any shape), same rules as recommendations"""
+    config = config or DEFAULT_STRATEGY_CONFIG
+    strong, moderate = config["strong_signal_return"], config["moderate_signal_return"]
+    predicted_returns = np.asarray(predicted_returns, dtype=np.float64)
+    return np.select(
+        [
+            predicted_returns > strong,
+            predicted_returns > moderate,
+            predicted_returns < -strong,
+            predicted_returns < -moderate
+        ],
+        [0, 1, 4, 3],
+        default=HOLD
+    )
+
+
+def signal_confidence(predicted_returns, rsi, volume_ratio, config=None):
+    """Recommendation confidence from the predicted return, RSI and volume ratio (scalars or arrays)"""
+    config = config or DEFAULT_STRATEGY_CONFIG
+    predicted_returns = np.asarray(predicted_returns, dtype=np.float64)
+    rsi = np.asarray(rsi, dtype=np.float64)
+    volume_ratio = np.asarray(volume_ratio, dtype=np.float64)
+
+    confidence = np.minimum(np.abs(predicted_returns) * CONFIDENCE_PER_UNIT_RETURN, MAX_CONFIDENCE)
+    # RSI: higher confidence for oversold/overbought reversals, lower in the neutral zone
+    reversal = ((predicted_returns > 0) & (rsi < 30)) | ((predicted_returns < 0) & (rsi > 70))
+    neutral = (rsi >= 40) & (rsi <= 60)
+    confidence = confidence * np.where(reversal, config["reversal_confidence_boost"],
+                                       np.where(neutral, config["neutral_rsi_confidence_factor"], 1.0))
+    # Volume confirmation
+    confidence = confidence * np.where(volume_ratio > 1.5, config["high_volume_confidence_boost"],
+                                       np.where(volume_ratio < 0.5, config["low_volume_confidence_factor"], 1.0))
+    return np.minimum(confidence, MAX_CONFIDENCE)
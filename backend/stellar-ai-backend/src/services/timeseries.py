@@ -0,0 +1,92 @@
+import threading
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1000  # Points kept per token, matching the snapshot history cap
+
+
+class PriceRingBuffer:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        # Every point is written twice (at i and i + capacity) so any trailing window is one contiguous slice
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)  # Epoch seconds
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._volumes = np.zeros(2 * capacity, dtype=np.float64)
+        self._next = 0  # Next write position in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, price, volume):
+        """O(1) append; the oldest point is overwritten once the buffer is full"""
+        i = self._next
+        j = i + self.capacity
+        self._timestamps[i] = self._timestamps[j] = timestamp
+        self._prices[i] = self._prices[j] = price
+        self._volumes[i] = self._volumes[j] = volume
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _window(self, array, n):
+        n = self._size if n is None else min(n, self._size)
+        end = self._next + self.capacity
+        view = array[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n=None):
+        """Zero-copy view of the last n timestamps (all if n is None), oldest first"""
+        return self._window(self._timestamps, n)
+
+    def prices(self, n=None):
+        """Zero-copy view of the last n prices (all if n is None), oldest first"""
+        return self._window(self._prices, n)
+
+    def volumes(self, n=None):
+        """Zero-copy view of the last n volumes (all if n is None), oldest first"""
+        return self._window(self._volumes, n)
+
+    def last_price(self):
+        if self._size == 0:
+            return None
+        return float(self._prices[self._next + self.capacity - 1])
+
+    def nbytes(self):
+        return self._timestamps.nbytes + self._prices.nbytes + self._volumes.nbytes
+
+
+class PriceHistory:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._series = {}  # token code -> PriceRingBuffer
+        self._lock = threading.Lock()
+
+    def __contains__(self, token):
+        return token in self._series
+
+    def __getitem__(self, token):
+        return self._series[token]
+
+    def __len__(self):
+        return len(self._series)
+
+    def __iter__(self):
+        return iter(list(self._series))
+
+    def get(self, token):
+        return self._series.get(token)
+
+    def append(self, token, timestamp, price, volume):
+        series = self._series.get(token)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(token, PriceRingBuffer(self.capacity))
+        series.append(timestamp, price, volume)
+
+    def clear(self):
+        with self._lock:
+            self._series = {}
+
+    def nbytes(self):
+        return sum(series.nbytes() for series in self._series.values())
@@ -0,0 +1,117 @@
+# Training steps run inside training job worker processes: plain picklable data in and out,
+# and no route imports. Spawned workers also re-import the launching script as __mp_main__, which is why
+# main.py keeps app setup in create_app(); a worker then only pays for Flask, NumPy and scikit-learn.
+from datetime import datetime
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+TREES_PER_STEP = 10  # Forest is grown in steps of this many trees so progress and cancellation are observable
+TOP_FEATURES = 5  # Importance ranking kept with the model for recommendation responses
+
+# AIStrategyEngine model inputs, all produced by the technical indicator pipeline
+STRATEGY_FEATURE_NAMES = [
+    'sma_7', 'sma_14', 'sma_21', 'sma_50',  # Moving averages
+    'ema_12', 'ema_26',  # Exponential moving averages
+    'macd', 'macd_signal', 'macd_histogram',  # MACD indicators
+    'rsi',  # Relative Strength Index
+    'bb_position', 'bb_width',  # Bollinger Bands
+    'volume_ratio',  # Volume analysis
+    'momentum_5', 'momentum_10', 'momentum_20',  # Momentum indicators
+    'atr', 'volatility_20',  # Volatility measures
+    'support_distance', 'resistance_distance',  # Support/Resistance
+    'higher_highs', 'lower_lows'  # Market strength
+]
+
+MARKET_FEATURE_NAMES = [
+    "total_tokens", "market_cap_millions", "avg_price_change",
+    "volume_millions", "positive_movers", "negative_movers"
+]
+
+
+def fit_forest_bundle(X, y, feature_names, n_estimators=100, random_state=42, job=None, **forest_params):
+    """Fit a fresh scaler + random forest and return them as one bundle.
+
+    Trees are added TREES_PER_STEP at a time with warm_start; the seeds drawn per tree are the
+    same as a single fit, so the forest is identical to fitting n_estimators in one call.
+    Extra keyword arguments (max_depth, max_features, ...) go to RandomForestRegressor.
+    """
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    model = RandomForestRegressor(n_estimators=0, warm_start=True, random_state=random_state, **forest_params)
+    while model.n_estimators < n_estimators:
+        if job is not None:
+            job.check_cancelled()
+        model.n_estimators = min(model.n_estimators + TREES_PER_STEP, n_estimators)
+        model.fit(X_scaled, y)
+        if job is not None:
+            job.report(model.n_estimators / n_estimators, f"{model.n_estimators}/{n_estimators} trees")
+    model.warm_start = False
+
+    bundle = {
+        "model": model,
+        "scaler": scaler,
+        "feature_names": list(feature_names),
+        "top_features": rank_feature_importances(model, feature_names)
+    }
+    metadata = {
+        "model_type": type(model).__name__,
+        "n_estimators": n_estimators,
+        **forest_params,
+        "training_samples": len(X_scaled),
+        "n_features": len(feature_names),
+        "trained_at": datetime.now().isoformat()
+    }
+    return bundle, metadata
+
+
+def rank_feature_importances(model, feature_names, top=TOP_FEATURES):
+    """[(name, importance)] for the most important features, highest first"""
+    ranked = sorted(zip(feature_names, model.feature_importances_), key=lambda x: x[1], reverse=True)
+    return [(name, float(importance)) for name, importance in ranked[:top]]
+
+
+def market_feature_vector(features):
+    """One MARKET_FEATURE_NAMES row from a feature store row / aggregated features dict"""
+    return [
+        features["total_tokens"],
+        features["total_market_cap"] / 1000000,  # Normalize
+        features["average_price_change"],
+        features["total_volume"] / 1000000,  # Normalize
+        features["positive_movers"],
+        features["negative_movers"]
+    ]
+
+
+def build_market_training_set(columns, latest_features=None, job=None):
+    """Feature rows and next-period targets from feature store columns (simple engine).
+
+    `columns` holds the MARKET_FEATURE_COLUMNS arrays, oldest snapshot first. The second-to-last
+    row uses `latest_features` (live aggregated features) when given.
+    """
+    if job is not None:
+        job.check_cancelled()
+        job.report(0.0, f"{len(columns['average_price_change'])} feature rows")
+
+    average_change = np.asarray(columns["average_price_change"], dtype=np.float64)
+    features = np.column_stack([
+        columns["total_tokens"],
+        np.asarray(columns["total_market_cap"]) / 1000000,  # Normalize
+        average_change,
+        np.asarray(columns["total_volume"]) / 1000000,  # Normalize
+        columns["positive_movers"],
+        columns["negative_movers"]
+    ])[:-1]  # Exclude last for prediction
+    if latest_features and len(features):
+        features[-1] = market_feature_vector(latest_features)
+
+    # Target: whether the market improved (1) or declined (0) in the next period
+    targets = (average_change[1:] > features[:, 2]).astype(int)
+
+    return {
+        "features": features.tolist(),
+        "targets": targets.tolist(),
+        "feature_names": list(MARKET_FEATURE_NAMES)
+    }
@@ -0,0 +1,182 @@
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+DEFAULT_MAX_WORKERS = 1  # Training is CPU bound; one job at a time keeps the API process responsive
+MAX_FINISHED_JOBS = 50  # Finished jobs kept for status queries
+TERMINAL_STATES = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Passed to a job function in its worker process for progress reports and cooperative cancellation"""
+
+    def __init__(self, job_id, progress, cancel_requests):
+        self.job_id = job_id
+        self._progress = progress  # Manager dict proxies shared with the API process
+        self._cancel_requests = cancel_requests
+
+    def report(self, fraction, message=None):
+        self._progress[self.job_id] = {"progress": round(float(fraction), 4), "message": message}
+
+    def check_cancelled(self):
+        if self.job_id in self._cancel_requests:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+
+def _run_job(fn, args, kwargs, job):
+    job.report(0.0, "started")
+    return fn(*args, job=job, **kwargs)
+
+
+class TrainingJobManager:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, mp_context="spawn"):
+        self.max_workers = max_workers
+        # spawn: workers never inherit the API process's threads, sockets or locks
+        self._context = multiprocessing.get_context(mp_context)
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._cancel_requests = None
+        self._jobs = OrderedDict()  # job id -> job record, oldest first
+        self._lock = threading.Lock()
+        self._listeners = []  # Called with the job's status record on submit, cancel and finish
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def _notify(self, record):
+        for callback in self._listeners:
+            try:
+                callback(record)
+            except Exception as e:
+                print(f"Training job listener failed: {e}")
+
+    def _ensure_pool(self):
+        # Started on first use so importing the routes doesn't fork any processes
+        if self._manager is None:
+            self._manager = self._context.Manager()
+            self._progress = self._manager.dict()
+            self._cancel_requests = self._manager.dict()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+
+    def submit(self, kind, fn, *args, on_success=None, **kwargs):
+        """Queue fn(*args, job=JobContext, **kwargs) in a worker process and return the job record.
+
+        on_success(result) runs in this process once the job finishes; its return value
+        becomes the job's "result".
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._ensure_pool()
+            job = {
+                "job_id": job_id,
+                "kind": kind,
+                "status": "queued",
+                "progress": 0.0,
+                "message": None,
+                "cancel_requested": False,
+                "submitted_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "result": None,
+                "error": None
+            }
+            self._jobs[job_id] = job
+            context = JobContext(job_id, self._progress, self._cancel_requests)
+            future = self._executor.submit(_run_job, fn, args, kwargs, context)
+            job["_future"] = future
+        future.add_done_callback(lambda done: self._finish(job_id, done, on_success))
+        record = self.status(job_id)
+        self._notify(record)
+        return record
+
+    def _finish(self, job_id, future, on_success):
+        job = self._jobs[job_id]
+        try:
+            if future.cancelled():
+                job["status"] = "cancelled"
+            else:
+                result = future.result()
+                job["result"] = on_success(result) if on_success else None
+                job["progress"] = 1.0
+                job["status"] = "succeeded"
+        except JobCancelled:
+            job["status"] = "cancelled"
+        except BrokenProcessPool as e:
+            job["status"] = "failed"
+            job["error"] = f"Training worker died: {e}"
+            with self._lock:
+                self._executor = None  # Recreated on the next submit
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            try:
+                last = self._progress.pop(job_id, None)
+                if last is not None and job["status"] != "succeeded":
+                    job["progress"] = last["progress"]
+                    job["message"] = last["message"]
+                self._cancel_requests.pop(job_id, None)
+            except Exception:
+                pass  # Manager already shut down
+            record = self.status(job_id)
+            self._trim()
+            self._notify(record)
+
+    def _trim(self):
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job["status"] in TERMINAL_STATES]
+            for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+                del self._jobs[job_id]
+
+    def status(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        record = {key: value for key, value in job.items() if not key.startswith("_")}
+        if record["status"] not in TERMINAL_STATES:
+            try:
+                progress = self._progress.get(job_id)
+            except Exception:
+                progress = None
+            if progress is not None:
+                record["status"] = "running"
+                record["progress"] = progress["progress"]
+                record["message"] = progress["message"]
+        return record
+
+    def list_jobs(self):
+        return [self.status(job_id) for job_id in reversed(list(self._jobs))]
+
+    def cancel(self, job_id):
+        """Cancel a queued job outright, or ask a running one to stop at its next checkpoint"""
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] in TERMINAL_STATES:
+            return False
+        if not job["_future"].cancel():
+            self._cancel_requests[job_id] = True
+        job["cancel_requested"] = True
+        self._notify(self.status(job_id))
+        return True
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+
+# Shared by both strategy engines
+training_jobs = TrainingJobManager()
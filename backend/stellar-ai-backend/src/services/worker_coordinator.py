@@ -0,0 +1,100 @@
+import os
+import threading
+from datetime import datetime
+
+DEFAULT_SYNC_INTERVAL_SECONDS = 2  # Lease renewal and shared-state sync period; well under the lease TTL
+
+
+class WorkerCoordinator:
+    """Per-worker loop that keeps one worker leading (via a LeaderLease) and every worker synced.
+
+    on_elected / on_demoted run when this worker gains or loses the lease; sync runs every pass.
+    """
+
+    def __init__(self, lease, sync, on_elected=None, on_demoted=None, interval_seconds=DEFAULT_SYNC_INTERVAL_SECONDS):
+        self.lease = lease
+        self.sync = sync
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.interval_seconds = interval_seconds
+        self.is_leader = False
+        self.syncs = 0
+        self.sync_failures = 0
+        self.last_sync_at = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return False
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._loop, args=(self._stop_event,), name="worker-coordinator",
+                                        daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the loop and hand the lease over straight away instead of letting it expire"""
+        if not self.is_running():
+            return False
+        self._stop_event.set()
+        self._thread.join()
+        if self.is_leader:
+            self._set_leader(False)
+        self.lease.release()
+        return True
+
+    def _loop(self, stop_event):
+        # First pass runs immediately so a fresh worker serves synced state as soon as possible
+        while True:
+            self.run_once()
+            if stop_event.wait(self.interval_seconds):
+                break
+
+    def _set_leader(self, leading):
+        self.is_leader = leading
+        callback = self.on_elected if leading else self.on_demoted
+        if callback is not None:
+            callback()
+
+    def run_once(self):
+        """Renew or contend for the lease and sync; failures are counted, never raised.
+
+        A lost lease is given up before the sync, a won one only taken up after it, so a new leader
+        starts from the state the previous one left.
+        """
+        try:
+            leading = self.lease.acquire()
+        except Exception as e:
+            print(f"Leader lease check failed: {e}")
+            leading = False  # Can't prove the lease is still ours, so stop acting as leader
+        if self.is_leader and not leading:
+            self._set_leader(False)
+
+        self._sync()
+        if leading and not self.is_leader:
+            self._set_leader(True)
+
+    def _sync(self):
+        try:
+            self.sync()
+            self.syncs += 1
+            self.last_sync_at = datetime.now().isoformat()
+        except Exception as e:
+            self.sync_failures += 1
+            print(f"Shared state sync failed: {e}")
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "running": self.is_running(),
+            "is_leader": self.is_leader,
+            "interval_seconds": self.interval_seconds,
+            "syncs": self.syncs,
+            "sync_failures": self.sync_failures,
+            "last_sync_at": self.last_sync_at,
+            "lease": self.lease.status()
+        }
@@ -0,0 +1,16 @@
+"""
+Production entry point for several worker processes (see gunicorn.conf.py):
+
+    cd backend/stellar-ai-backend && gunicorn -c gunicorn.conf.py
+
+Each worker imports this module after the fork, so engine threads and SQLite connections are per process;
+snapshots, training sets and job status are shared through the SQLite database.
+"""
+
+from src.main import DATABASE_PATH, create_app
+from src.routes.ai_strategies import ai_engine
+from src.routes.ai_strategies_simple import enable_multi_worker
+
+app = create_app()
+# Saved models and promoted configs live on disk; each worker reloads them when another one changes them
+enable_multi_worker(DATABASE_PATH, extra_syncs=(ai_engine.sync_with_store,))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: single-row prediction latency, sklearn forest vs the flat-array evaluator
+
+Usage: python bench_flat_forest.py [--repeats 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies import AIStrategyEngine
+from src.services.flat_forest import FlatForest
+
+
+def time_per_call(fn, repeats):
+    """Median seconds per call after a warm-up call"""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=500)
+    args = parser.parse_args()
+
+    # The served model: 100-tree forest on 30 days of mock hourly data
+    engine = AIStrategyEngine(inference_backend="sklearn")
+    engine.train_model(engine.calculate_technical_indicators(engine.generate_mock_historical_data(30)))
+    model, scaler = engine.active_model["model"], engine.active_model["scaler"]
+
+    started = time.perf_counter()
+    flat = FlatForest(model, scaler)
+    export_ms = (time.perf_counter() - started) * 1000
+    print(f"Forest: {flat.n_trees} trees, max depth {flat.max_depth}, {len(flat.value)} nodes, "
+          f"{flat.nbytes() / 1024:.0f} KiB exported in {export_ms:.1f} ms")
+
+    rows = np.random.default_rng(0).normal(0, 1, (1000, flat.n_features)) * scaler.scale_ + scaler.mean_
+    assert np.array_equal(flat.predict(rows), model.predict(scaler.transform(rows))), "Flat forest diverged"
+    print("Predictions identical to scaler.transform + model.predict on 1000 rows")
+
+    row = rows[:1]
+    sklearn_seconds = time_per_call(lambda: model.predict(scaler.transform(row)), args.repeats)
+    flat_seconds = time_per_call(lambda: flat.predict(row), args.repeats)
+    print(f"Single row, sklearn: {sklearn_seconds * 1e6:9.1f} us")
+    print(f"Single row, flat:    {flat_seconds * 1e6:9.1f} us  ({sklearn_seconds / flat_seconds:.1f}x faster)")
+
+    batch_sklearn = time_per_call(lambda: model.predict(scaler.transform(rows)), max(args.repeats // 10, 1))
+    batch_flat = time_per_call(lambda: flat.predict(rows), max(args.repeats // 10, 1))
+    print(f"1000 rows, sklearn:  {batch_sklearn * 1e3:9.2f} ms")
+    print(f"1000 rows, flat:     {batch_flat * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-DataFrame technical indicators vs the batched (tokens x time) NumPy engine
+
+Usage: python bench_indicators.py [--tokens 1000] [--points 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies import AIStrategyEngine
+from src.services.batch_indicators import INDICATOR_NAMES
+
+
+def make_panel(n_tokens, n_points, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 0.12 * np.exp(np.cumsum(rng.normal(0, 0.015, (n_tokens, n_points)), axis=1))
+    high = close * rng.uniform(1.001, 1.02, close.shape)
+    low = close * rng.uniform(0.98, 0.999, close.shape)
+    volume = 500000 * rng.uniform(0.3, 2.5, close.shape)
+    return close, high, low, volume
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = AIStrategyEngine()
+    close, high, low, volume = make_panel(args.tokens, args.points)
+    print(f"Panel: {args.tokens} tokens x {args.points} points, {len(INDICATOR_NAMES)} indicators")
+
+    # Current path: one DataFrame per token, latest row kept (what a per-tick update needs)
+    started = time.perf_counter()
+    latest_rows = []
+    for k in range(args.tokens):
+        df = pd.DataFrame({"close": close[k], "high": high[k], "low": low[k], "volume": volume[k]})
+        latest_rows.append(engine.calculate_technical_indicators(df).iloc[-1])
+    per_frame = time.perf_counter() - started
+    print(f"Per-DataFrame path: {per_frame:8.2f} s")
+
+    started = time.perf_counter()
+    batch = engine.calculate_technical_indicators_batch(close, high, low, volume, last_n=1)
+    batched = time.perf_counter() - started
+    print(f"Batched path:       {batched:8.2f} s  ({per_frame / batched:.1f}x faster)")
+
+    expected = np.array([[row[name] for name in INDICATOR_NAMES] for row in latest_rows])
+    actual = np.column_stack([batch[name][:, -1] for name in INDICATOR_NAMES])
+    # pandas' online rolling variance drifts by ~1e-6 relative over long series; the batch path is two-pass
+    assert np.allclose(actual, expected, rtol=1e-6, atol=1e-6, equal_nan=True), "Batched indicators diverged"
+    print("Latest indicators match the per-DataFrame path for every token")
+
+
+if __name__ == "__main__":
+    main()
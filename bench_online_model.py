@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: online model update latency vs full random forest refits as history grows
+
+Usage: python bench_online_model.py [--sizes 10000 100000 1000000] [--updates 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.online_model import ONLINE_MAX_TREES, ONLINE_WINDOW_ROWS, OnlineForest
+from src.services.training import MARKET_FEATURE_NAMES
+
+
+def make_rows(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 1, (n_rows, len(MARKET_FEATURE_NAMES)))
+    y = (X[:, 2] + 0.5 * X[:, 4] + rng.normal(0, 0.5, n_rows) > 0).astype(float)
+    return X, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--updates", type=int, default=20, help="single-row updates timed per size")
+    args = parser.parse_args()
+
+    print(f"Forest: {ONLINE_MAX_TREES} trees, online window {ONLINE_WINDOW_ROWS} rows, "
+          f"{len(MARKET_FEATURE_NAMES)} features")
+    print(f"{'rows':>10}  {'full refit':>12}  {'online update':>14}  {'speedup':>9}")
+    for n_rows in args.sizes:
+        X, y = make_rows(n_rows + args.updates)
+        history_X, history_y = X[:n_rows], y[:n_rows]
+
+        # Full refit: what a retrain does today when one more snapshot arrives
+        started = time.perf_counter()
+        RandomForestRegressor(n_estimators=ONLINE_MAX_TREES, random_state=42).fit(history_X, history_y)
+        full_refit = time.perf_counter() - started
+
+        # Online: seed with the history once, then time each newly arriving row
+        model = OnlineForest(random_state=42)
+        model.partial_fit(history_X, history_y)
+        latencies = []
+        for i in range(n_rows, n_rows + args.updates):
+            started = time.perf_counter()
+            model.partial_fit(X[i:i + 1], y[i:i + 1])
+            latencies.append(time.perf_counter() - started)
+        online = float(np.median(latencies))
+
+        print(f"{n_rows:>10}  {full_refit * 1000:>10.1f}ms  {online * 1000:>12.2f}ms  {full_refit / online:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
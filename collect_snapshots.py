@@ -1,41 +1,37 @@
 #!/usr/bin/env python3
 """
-Quick script to collect 5 historical data snapshots for AI training
+Quick script to schedule 5 historical data snapshots for AI training
 """
 
 import requests
-import time
-import json
 
 BASE_URL = "http://localhost:5000/api/ai"
 
-def collect_snapshots(count=5):
-    print(f"🚀 Collecting {count} historical data snapshots for AI training")
+def collect_snapshots(count=5, interval_seconds=2):
+    print(f"🚀 Scheduling {count} historical data snapshots for AI training")
     print("=" * 60)
     
-    for i in range(count):
-        print(f"\n📊 Collecting snapshot {i+1}/{count}...")
-        
-        try:
-            response = requests.post(f"{BASE_URL}/collect-historical-data")
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ Success! Total snapshots: {result['total_snapshots']}")
-                print(f"   📈 Tokens tracked: {result['tokens_being_tracked']}")
-            else:
-                error = response.json()
-                print(f"   ❌ Error: {error['message']}")
-                
-        except Exception as e:
-            print(f"   ❌ Connection error: {e}")
+    # The backend owns the collection loop; this script only starts it
+    try:
+        response = requests.post(f"{BASE_URL}/scheduler/start", json={
+            "interval_seconds": interval_seconds,
+            "jitter_seconds": 0,
+            "max_runs": count
+        })
+        result = response.json()
+        if response.status_code == 200:
+            scheduler = result["scheduler"]
+            print(f"   ✅ Scheduler started: {count} snapshots, one every {scheduler['interval_seconds']}s")
+        else:
+            print(f"   ❌ Error: {result['message']}")
+            return
             
-        # Wait a bit between collections (simulate time passing)
-        if i < count - 1:
-            print("   ⏳ Waiting 2 seconds...")
-            time.sleep(2)
+    except Exception as e:
+        print(f"   ❌ Connection error: {e}")
+        return
     
-    print(f"\n🎉 Collection complete! Now you can train the AI model.")
-    print("💡 Tip: Click 'Train Model' button in the dashboard to train with this data.")
+    print(f"\n🎉 Collection is running in the backend. Check /api/ai/scheduler/status for progress.")
+    print("💡 Tip: Click 'Train Model' button in the dashboard once the snapshots are in.")
 
 if __name__ == "__main__":
     collect_snapshots()
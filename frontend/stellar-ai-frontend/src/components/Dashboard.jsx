@@ -17,6 +17,9 @@ import {
 } from 'lucide-react';
 
 const API_BASE = 'http://localhost:5000/api/ai';
+const TRAINING_POLL_INTERVAL_MS = 1000;
+const MAX_MISSED_JOB_POLLS = 30; // Give up if no worker knows the job for this many polls
+const STREAM_RETRY_MS = 30000; // A worker at its stream limit answers 503; poll once and retry this often
 
 const Dashboard = () => {
   const [modelTrained, setModelTrained] = useState(false);
@@ -25,23 +28,50 @@ const Dashboard = () => {
   const [marketData, setMarketData] = useState(null);
   const [portfolioAnalysis, setPortfolioAnalysis] = useState(null);
   const [historicalDataStatus, setHistoricalDataStatus] = useState(null);
+  const [trainingProgress, setTrainingProgress] = useState(null);
 
   useEffect(() => {
-    checkModelStatus();
-    fetchMarketData();
-    checkHistoricalDataStatus();
+    // One push channel replaces polling /health, /historical-data-status and /market-data;
+    // the backend replays the latest of each event on connect
+    let events = null;
+    let retryTimer = null;
+    let unmounted = false;
+
+    const pollOnce = async () => {
+      try {
+        const [health, snapshot, market] = await Promise.all(
+          ['health', 'historical-data-status', 'market-data'].map((path) => fetch(`${API_BASE}/${path}`).then((r) => r.json()))
+        );
+        setModelTrained(health.model_trained);
+        setHistoricalDataStatus(snapshot);
+        setMarketData(market);
+      } catch (error) {
+        console.error('Error polling status:', error);
+      }
+    };
+
+    const connect = () => {
+      events = new EventSource(`${API_BASE}/stream`);
+      events.addEventListener('model-status', (event) => setModelTrained(JSON.parse(event.data).model_trained));
+      events.addEventListener('snapshot', (event) => setHistoricalDataStatus(JSON.parse(event.data)));
+      events.addEventListener('market-overview', (event) => setMarketData(JSON.parse(event.data)));
+      events.onerror = () => {
+        // Dropped connections reconnect by themselves; a refused one (503) is closed for good
+        if (events.readyState === EventSource.CLOSED && !unmounted) {
+          pollOnce();
+          retryTimer = setTimeout(connect, STREAM_RETRY_MS);
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      unmounted = true;
+      clearTimeout(retryTimer);
+      events.close();
+    };
   }, []);
 
-  const checkModelStatus = async () => {
-    try {
-      const response = await fetch(`${API_BASE}/health`);
-      const data = await response.json();
-      setModelTrained(data.model_trained);
-    } catch (error) {
-      console.error('Error checking model status:', error);
-    }
-  };
-
   const checkHistoricalDataStatus = async () => {
     try {
       const response = await fetch(`${API_BASE}/historical-data-status`);
@@ -56,6 +86,7 @@ const Dashboard = () => {
 
   const trainModel = async () => {
     setLoading(true);
+    setTrainingProgress(0);
     try {
       const response = await fetch(`${API_BASE}/train-model`, {
         method: 'POST',
@@ -64,17 +95,43 @@ const Dashboard = () => {
         },
       });
       const data = await response.json();
-      if (data.status === 'success') {
+      if (data.status !== 'accepted') {
+        alert('Training failed: ' + data.message);
+        return;
+      }
+
+      // Training runs as a background job; poll until it finishes
+      let job = data.job;
+      let missedPolls = 0;
+      while (!['succeeded', 'failed', 'cancelled'].includes(job.status)) {
+        await new Promise((resolve) => setTimeout(resolve, TRAINING_POLL_INTERVAL_MS));
+        const jobResponse = await fetch(`${API_BASE}/training-jobs/${data.job_id}`);
+        const polled = (await jobResponse.json()).job;
+        if (!jobResponse.ok || !polled) {
+          // Another worker may not have seen the job yet; keep the last known state and poll again
+          missedPolls += 1;
+          if (missedPolls >= MAX_MISSED_JOB_POLLS) {
+            throw new Error('training job status unavailable');
+          }
+          continue;
+        }
+        missedPolls = 0;
+        job = polled;
+        setTrainingProgress(job.progress);
+      }
+
+      if (job.status === 'succeeded') {
         setModelTrained(true);
         alert('AI Model trained successfully!');
       } else {
-        alert('Training failed: ' + data.message);
+        alert(`Training ${job.status}` + (job.error ? ': ' + job.error : ''));
       }
     } catch (error) {
       console.error('Error training model:', error);
       alert('Training failed: ' + error.message);
     } finally {
       setLoading(false);
+      setTrainingProgress(null);
     }
   };
 
@@ -91,11 +148,7 @@ const Dashboard = () => {
       const data = await response.json();
       console.log('Data collection response:', data);
       if (data.status === 'success') {
-        console.log('Data collection successful, refreshing status...');
-        // Add a small delay to ensure backend has processed the data
-        setTimeout(async () => {
-          await checkHistoricalDataStatus(); // Refresh status
-        }, 500);
+        console.log('Data collection successful, status arrives on the event stream');
         alert(`Data collected! Total snapshots: ${data.total_snapshots}. Collect more data over time to improve AI training.`);
       } else {
         alert('Data collection failed: ' + data.message);
@@ -232,6 +285,9 @@ const Dashboard = () => {
                 {loading ? <RefreshCw className="h-4 w-4 animate-spin" /> : <Brain className="h-4 w-4" />}
                 Train Model
               </Button>
+              {trainingProgress !== null && (
+                <Progress value={trainingProgress * 100} className="mt-2" />
+              )}
             </AlertDescription>
           </Alert>
         )}
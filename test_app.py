@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Tests for the app factory: both strategy blueprints are served, each under its own prefix
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src import main
+from src.routes.ai_strategies_simple import market_engine
+
+
+def test_market_and_strategy_engines_are_both_served(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DATABASE_PATH", str(tmp_path / "app.db"))
+    # create_app attaches a snapshot store to the shared engine; put the previous one back afterwards
+    for name in ("snapshot_store", "historical_data", "data_version"):
+        monkeypatch.setattr(market_engine, name, getattr(market_engine, name))
+    client = main.create_app().test_client()
+
+    market = client.get("/api/ai/health").get_json()
+    engine = client.get("/api/ai/engine/health").get_json()
+    assert "historical_data_points" in market and engine["inference_backend"] == "flat"
+    assert client.get("/api/ai/engine/models").get_json()["status"] == "success"
+    assert client.get("/api/ai/engine/sweeps").get_json()["sweeps"] == []
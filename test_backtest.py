@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized walk-forward backtest against a per-bar reference loop
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.backtest import backtest_signals, run_backtest_job, walk_forward_backtest
+from src.services.mock_data import generate_mock_panel
+from src.services.strategy_signals import classify_returns
+from src.services.training_jobs import JobCancelled
+
+REFERENCE_POSITIONS = {0: 1.0, 1: 0.5, 2: None, 3: -0.5, 4: -1.0}  # None: HOLD keeps the position
+
+
+def reference_backtest(close, predicted, fee_rate):
+    """Per-bar loop over one asset: (total return, max drawdown, hit rate)"""
+    position, equity, peak, max_drawdown, exposed, hits = 0.0, 1.0, 1.0, 0.0, 0, 0
+    for t in range(len(close) - 1):
+        if np.isnan(predicted[t]):
+            continue
+        target = REFERENCE_POSITIONS[int(classify_returns(predicted[t]))]
+        new_position = position if target is None else target
+        asset_return = close[t + 1] / close[t] - 1
+        equity *= 1 + new_position * asset_return - fee_rate * abs(new_position - position)
+        position = new_position
+        peak = max(peak, equity)
+        max_drawdown = min(max_drawdown, equity / peak - 1)
+        if position != 0:
+            exposed += 1
+            hits += position * asset_return > 0
+    return equity - 1, max_drawdown, hits / exposed
+
+
+def test_vectorized_accounting_matches_per_bar_loop():
+    close = generate_mock_panel(3, 400, seed=4)["close"]
+    predicted = np.random.default_rng(0).normal(0, 0.02, close.shape)
+    predicted[:, :60] = np.nan
+
+    result = backtest_signals(close, predicted, fee_rate=0.003, allow_short=True)
+    for asset in range(3):
+        total_return, max_drawdown, hit_rate = reference_backtest(close[asset], predicted[asset], 0.003)
+        metrics = result["per_asset"][asset]
+        assert np.isclose(metrics["total_return"], total_return, rtol=1e-5, atol=1e-6)
+        assert np.isclose(metrics["max_drawdown"], max_drawdown, rtol=1e-5, atol=1e-6)
+        assert np.isclose(metrics["hit_rate"], hit_rate, atol=1e-6)
+    assert sum(result["signal_counts"].values()) == 3 * (400 - 60 - 1)
+
+
+def test_long_only_never_goes_short():
+    close = generate_mock_panel(1, 200, seed=5)["close"]
+    predicted = np.full(close.shape, -0.05)  # Every signal is SELL
+    result = backtest_signals(close, predicted, fee_rate=0.0)
+    assert result["portfolio"]["total_return"] == 0.0
+    assert result["portfolio"]["exposure"] == 0.0
+
+
+def test_walk_forward_only_trades_after_the_first_training_window():
+    panel = generate_mock_panel(2, 24 * 20, seed=6)
+    result = walk_forward_backtest(panel["close"], panel["high"], panel["low"], panel["volume"],
+                                   train_bars=24 * 10, test_bars=24 * 4)
+    assert result["start_bar"] == 24 * 10
+    assert [fold["test_start"] for fold in result["folds"]] == [240, 336, 432]
+    assert all(fold["train_start"] + 24 * 10 == fold["test_start"] for fold in result["folds"])
+    assert result["end_bar"] == 24 * 20 - 1
+
+
+class RecordingJob:
+    """Stands in for a training job context: records progress, cancels after `cancel_after` reports"""
+
+    def __init__(self, cancel_after=None):
+        self.reports = []
+        self.cancel_after = cancel_after
+
+    def report(self, fraction, message=None):
+        self.reports.append((fraction, message))
+
+    def check_cancelled(self):
+        if self.cancel_after is not None and len(self.reports) >= self.cancel_after:
+            raise JobCancelled("cancelled")
+
+
+def test_backtest_job_reports_progress_per_fold_and_can_be_cancelled():
+    job = RecordingJob()
+    result = run_backtest_job(n_assets=2, n_bars=24 * 20, seed=6, job=job, train_bars=24 * 10, test_bars=24 * 4)
+    assert len(result["folds"]) == 3
+    assert job.reports == [(0.0, "fold 1/3"), (1 / 3, "fold 2/3"), (2 / 3, "fold 3/3")]
+
+    try:
+        run_backtest_job(n_assets=2, n_bars=24 * 20, seed=6, job=RecordingJob(cancel_after=1),
+                         train_bars=24 * 10, test_bars=24 * 4)
+        assert False, "Backtest was not cancelled"
+    except JobCancelled:
+        pass
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the vectorized (tokens x time) indicators against the per-token pandas calculation
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies import AIStrategyEngine
+from src.services.batch_indicators import INDICATOR_NAMES, calculate_indicators_batch
+
+engine = AIStrategyEngine()
+
+
+def random_panel(n_tokens, n_points, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 0.12 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_tokens, n_points)), axis=1))
+    spread = rng.uniform(0, 0.01, (2, n_tokens, n_points))
+    volume = rng.uniform(10000, 1000000, (n_tokens, n_points))
+    return close, close * (1 + spread[0]), close * (1 - spread[1]), volume
+
+
+def pandas_indicators(close, high, low, volume):
+    """Per-token reference: {name: (tokens x time) array} from calculate_technical_indicators"""
+    frames = [
+        engine.calculate_technical_indicators(pd.DataFrame({"close": c, "high": h, "low": l, "volume": v}))
+        for c, h, l, v in zip(close, high, low, volume)
+    ]
+    return {name: np.array([frame[name].to_numpy(dtype=np.float64) for frame in frames]) for name in INDICATOR_NAMES}
+
+
+def assert_matches(batch, reference):
+    assert set(batch) == set(INDICATOR_NAMES)
+    for name in INDICATOR_NAMES:
+        assert batch[name].shape == reference[name].shape, name
+        np.testing.assert_allclose(batch[name], reference[name], rtol=1e-7, atol=1e-10, equal_nan=True, err_msg=name)
+
+
+def test_full_series_matches_pandas_for_short_and_long_panels():
+    # Below every window, between the short windows and sma_50, and past it
+    for n_tokens, n_points, seed in [(3, 4, 1), (4, 17, 2), (5, 49, 3), (2, 50, 4), (3, 120, 5)]:
+        panel = random_panel(n_tokens, n_points, seed=seed)
+        assert_matches(calculate_indicators_batch(*panel), pandas_indicators(*panel))
+
+
+def test_chunked_tokens_match_one_pass():
+    panel = random_panel(7, 60, seed=6)
+    assert_matches(calculate_indicators_batch(*panel, chunk_size=3), pandas_indicators(*panel))
+
+
+def test_last_n_matches_the_tail_of_the_full_series():
+    for n_points, last_n in [(30, 1), (80, 5), (120, 60), (10, 25)]:
+        panel = random_panel(4, n_points, seed=n_points)
+        reference = pandas_indicators(*panel)
+        tail = {name: values[:, -min(last_n, n_points):] for name, values in reference.items()}
+        assert_matches(calculate_indicators_batch(*panel, last_n=last_n), tail)
+
+
+def test_flat_stretches_match_pandas():
+    close, high, low, volume = random_panel(2, 70, seed=8)
+    close[0, 20:45] = high[0, 20:45] = low[0, 20:45] = 1.0  # No gains or losses, zero-width bands
+    volume[1, :30] = 500.0
+    assert_matches(calculate_indicators_batch(close, high, low, volume), pandas_indicators(close, high, low, volume))
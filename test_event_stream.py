@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the server-sent events broadcaster and the /stream dashboard channel
+"""
+
+import json
+import os
+import sys
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies_simple import EVENT_QUEUE_SIZE, ai_strategies_bp, market_engine
+from src.services.event_broadcaster import EventBroadcaster
+
+
+def parse_events(chunk):
+    """(event name, data) pairs from SSE bytes"""
+    events = []
+    for block in chunk.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_events_fan_out_once_encoded_and_drop_oldest():
+    broadcaster = EventBroadcaster(max_queued=2)
+    fast, slow = broadcaster.subscribe(), broadcaster.subscribe()
+    assert broadcaster.publish("snapshot", {"n": 1}) == 2
+    first = fast.drain(0)
+    assert parse_events(first[0]) == [("snapshot", {"n": 1})]
+
+    for n in range(2, 5):
+        broadcaster.publish("snapshot", {"n": n})
+    # Identical bytes for every subscriber; the slow one lost the oldest events
+    assert [parse_events(message)[0][1]["n"] for message in slow.drain(0)] == [3, 4]
+    assert slow.dropped == 2 and broadcaster.stats()["dropped"] == 2 + 1
+
+    # Late subscribers get the latest event of each kind straight away
+    broadcaster.publish("model-status", {"model_trained": True})
+    late = broadcaster.subscribe()
+    assert [event for event, _ in parse_events(b"".join(late.drain(0)))] == ["snapshot", "model-status"]
+    broadcaster.unsubscribe(late)
+    assert broadcaster.subscriber_count() == 2
+    assert EventBroadcaster(max_queued=2, max_subscribers=0).subscribe() is None
+
+
+def test_stream_endpoint_pushes_current_state(monkeypatch):
+    market_data = {"status": "success", "overview": {"total_pairs": 3}}
+    monkeypatch.setattr(market_engine.market_data_cache, "get", lambda: (market_data, {"version": 7}))
+    monkeypatch.setattr(market_engine, "events", EventBroadcaster(EVENT_QUEUE_SIZE))
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+
+    response = app.test_client().get("/api/ai/stream", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    stream = iter(response.response)
+    received = {}
+    while len(received) < 3:
+        received.update(parse_events(next(stream)))
+    response.close()
+
+    assert received["market-overview"] == market_data
+    assert received["model-status"]["status"] == "healthy"
+    assert "status" in received["snapshot"]
+    assert market_engine.events.subscriber_count() == 0
+
+
+def test_streams_past_the_worker_cap_get_503(monkeypatch):
+    monkeypatch.setattr(market_engine.market_data_cache, "get", lambda: ({"status": "success"}, {"version": 1}))
+    monkeypatch.setattr(market_engine, "events", EventBroadcaster(EVENT_QUEUE_SIZE, max_subscribers=1))
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+    client = app.test_client()
+
+    first = client.get("/api/ai/stream", buffered=False)
+    rejected = client.get("/api/ai/stream", buffered=False)
+    assert first.status_code == 200
+    assert rejected.status_code == 503 and rejected.headers["Retry-After"]
+    assert market_engine.events.subscriber_count() == 1
+
+    # Closing a stream that never sent anything still frees its slot
+    first.close()
+    assert market_engine.events.subscriber_count() == 0
+    again = client.get("/api/ai/stream", buffered=False)
+    assert again.status_code == 200
+    again.close()
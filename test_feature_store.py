@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the ingestion-time market feature store and training from its columns
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.feature_store import MARKET_FEATURE_COLUMNS, FeatureStore, market_feature_row
+from src.services.training import build_market_training_set
+
+
+def random_snapshots(n, n_tokens=10, seed=3):
+    rng = np.random.default_rng(seed)
+    return [{
+        "snapshot_id": i + 1,
+        "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}",
+        "tokens": [{
+            "code": f"T{j}",
+            "price": float(rng.uniform(0.01, 2)),
+            "volume": float(rng.uniform(10000, 1000000)),
+            "market_cap": float(rng.uniform(1e6, 1e8)),
+            "change_24h": float(rng.uniform(-0.1, 0.1))
+        } for j in range(n_tokens)]
+    } for i in range(n)]
+
+
+def reference_training_set(snapshots, latest_features):
+    """Per-snapshot recomputation the feature store replaces"""
+    features, targets = [], []
+    for i, snapshot in enumerate(snapshots[:-1]):
+        tokens = snapshot["tokens"]
+        row = latest_features if i == len(snapshots) - 2 else {
+            "total_tokens": len(tokens),
+            "total_market_cap": sum(t["market_cap"] for t in tokens),
+            "average_price_change": sum(t["change_24h"] for t in tokens) / len(tokens),
+            "total_volume": sum(t["volume"] for t in tokens),
+            "positive_movers": len([t for t in tokens if t["change_24h"] > 0]),
+            "negative_movers": len([t for t in tokens if t["change_24h"] < 0])
+        }
+        next_tokens = snapshots[i + 1]["tokens"]
+        next_avg_change = sum(t["change_24h"] for t in next_tokens) / len(next_tokens)
+        targets.append(1 if next_avg_change > row["average_price_change"] else 0)
+        features.append([
+            row["total_tokens"], row["total_market_cap"] / 1000000, row["average_price_change"],
+            row["total_volume"] / 1000000, row["positive_movers"], row["negative_movers"]
+        ])
+    return features, targets
+
+
+def test_training_from_columns_matches_per_snapshot_recomputation():
+    snapshots = random_snapshots(200)
+    store = FeatureStore()
+    for snapshot in snapshots:
+        store.append(snapshot["snapshot_id"], snapshot["timestamp"], market_feature_row(snapshot))
+
+    latest = store.latest()
+    training_set = build_market_training_set(store.columns(MARKET_FEATURE_COLUMNS), latest_features=latest)
+    features, targets = reference_training_set(snapshots, latest)
+
+    assert training_set["targets"] == targets
+    assert np.allclose(training_set["features"], features, rtol=1e-12)
+
+
+def test_rows_are_keyed_by_snapshot_id_and_evicted_oldest_first():
+    snapshots = random_snapshots(15)
+    store = FeatureStore(capacity=10)
+    for snapshot in snapshots:
+        store.append(snapshot["snapshot_id"], snapshot["timestamp"], market_feature_row(snapshot))
+
+    assert len(store) == 10
+    assert 5 not in store and store.row(5) is None
+    assert list(store.columns(["total_tokens"])["snapshot_id"]) == list(range(6, 16))
+    row = store.row(9)
+    assert row["market_timestamp"] == snapshots[8]["timestamp"]
+    assert row["total_tokens"] == 10 and isinstance(row["total_tokens"], int)
+    assert store.latest()["snapshot_id"] == 15
+    assert store.time_range() == {"start": snapshots[5]["timestamp"], "end": snapshots[14]["timestamp"]}
+
+
+def test_features_first_seen_later_are_missing_from_earlier_rows():
+    store = FeatureStore()
+    store.append(1, "t1", {"total_tokens": 3})
+    store.append(2, "t2", {"total_tokens": 4, "XLM_rsi": 55.0})
+    store.append(3, "t3", {"total_tokens": 5})
+
+    assert "XLM_rsi" not in store.row(1)
+    assert store.row(2)["XLM_rsi"] == 55.0
+    assert "XLM_rsi" not in store.row(3)
+    assert np.isnan(store.columns(["XLM_rsi"])["XLM_rsi"][[0, 2]]).all()
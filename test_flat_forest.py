@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the flat-array forest evaluator against sklearn
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.flat_forest import FlatForest
+from src.services.training import fit_forest_bundle
+
+
+def fitted_bundle(n_rows=400, n_features=6, seed=3, **forest_params):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 1, (n_rows, n_features)) * np.logspace(-3, 6, n_features)
+    y = X[:, 0] * 0.001 + rng.normal(0, 0.01, n_rows)
+    bundle, _ = fit_forest_bundle(X, y, [f"f{i}" for i in range(n_features)], n_estimators=30, **forest_params)
+    return bundle, rng
+
+
+def test_matches_sklearn_exactly():
+    bundle, rng = fitted_bundle()
+    X = rng.normal(0, 1, (2000, 6)) * np.logspace(-3, 6, 6)
+    expected = bundle["model"].predict(bundle["scaler"].transform(X))
+    flat = FlatForest(bundle["model"], bundle["scaler"])
+    assert np.array_equal(flat.predict(X), expected)
+    assert np.array_equal(flat.predict(X[:1]), expected[:1])
+
+
+def test_depth_limited_forest_without_scaler():
+    bundle, rng = fitted_bundle(max_depth=3)
+    X = rng.normal(0, 1, (500, 6))
+    assert np.array_equal(FlatForest(bundle["model"]).predict(X), bundle["model"].predict(X))
+
+
+def test_missing_values_follow_sklearn_routing():
+    bundle, rng = fitted_bundle()
+    X = rng.normal(0, 1, (500, 6))
+    X[::3, 1] = np.nan
+    X[::4, 4] = np.nan
+    expected = bundle["model"].predict(bundle["scaler"].transform(X))
+    assert np.array_equal(FlatForest(bundle["model"], bundle["scaler"]).predict(X), expected)
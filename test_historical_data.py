@@ -28,23 +28,28 @@ def test_historical_data_collection():
         print(f"   Connection error: {e}")
         return
     
-    # Step 2: Collect historical data (simulate multiple time points)
+    # Step 2: Collect historical data with the backend's snapshot scheduler
     print("\n2. Collecting historical market data...")
-    for i in range(5):
-        print(f"   Collecting snapshot {i+1}/5...")
+    try:
+        response = requests.post(f"{BASE_URL}/scheduler/start", json={"interval_seconds": 1, "jitter_seconds": 0, "max_runs": 5})
+        if response.status_code == 200:
+            print("   ✅ Scheduler started for 5 snapshots")
+        else:
+            print(f"   ❌ Error: {response.status_code}")
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+    
+    # Wait for the scheduled runs to finish
+    for _ in range(60):
         try:
-            response = requests.post(f"{BASE_URL}/collect-historical-data")
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ Snapshot {i+1}: {result['total_snapshots']} total snapshots")
-            else:
-                print(f"   ❌ Error: {response.status_code}")
+            scheduler = requests.get(f"{BASE_URL}/scheduler/status").json()["scheduler"]
+            if not scheduler["running"] and not scheduler["collection_in_progress"]:
+                print(f"   ✅ {scheduler['runs']} snapshots collected")
+                break
         except Exception as e:
             print(f"   ❌ Error: {e}")
-        
-        # Wait a bit between collections (simulate time passing)
-        if i < 4:
-            time.sleep(1)
+            break
+        time.sleep(1)
     
     # Step 3: Check data status after collection
     print("\n3. Checking data status after collection...")
@@ -66,13 +71,24 @@ def test_historical_data_collection():
     print("\n4. Training AI model with collected historical data...")
     try:
         response = requests.post(f"{BASE_URL}/train-model")
-        if response.status_code == 200:
-            result = response.json()
-            print(f"   ✅ Training successful!")
-            print(f"   Training samples: {result['training_samples']}")
-            print(f"   Features used: {result['features_used']}")
-            print(f"   Data quality: {result['data_quality']}")
-            print(f"   Historical snapshots: {result['historical_snapshots_used']}")
+        if response.status_code == 202:
+            job_id = response.json()['job_id']
+            print(f"   Training job started: {job_id}")
+            # Poll the job until it finishes
+            while True:
+                job = requests.get(f"{BASE_URL}/training-jobs/{job_id}").json()['job']
+                if job['status'] in ('succeeded', 'failed', 'cancelled'):
+                    break
+                time.sleep(1)
+            if job['status'] == 'succeeded':
+                result = job['result']
+                print(f"   ✅ Training successful!")
+                print(f"   Training samples: {result['training_samples']}")
+                print(f"   Features used: {result['features_used']}")
+                print(f"   Data quality: {result['data_quality']}")
+                print(f"   Historical snapshots: {result['historical_snapshots_used']}")
+            else:
+                print(f"   ❌ Training {job['status']}: {job['error']}")
         else:
             error = response.json()
             print(f"   ❌ Training failed: {error['message']}")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for Horizon SSE ingestion against a local stand-in SSE server
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes import ai_strategies_simple
+from src.services.horizon_stream import HorizonStreamIngestor, iter_sse_events
+from src.services.http_client import PooledHttpClient
+
+EVENTS_PER_CONNECTION = 3
+
+
+class StandInHorizon(BaseHTTPRequestHandler):
+    """Streams a few ledgers per connection, then drops it like a flaky proxy would"""
+    requests_seen = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        StandInHorizon.requests_seen.append({
+            "path": url.path,
+            "cursor": query.get("cursor", [None])[0],
+            "last_event_id": self.headers.get("Last-Event-ID")
+        })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        self.wfile.write(b'retry: 10\nevent: open\ndata: "hello"\n\n')
+        if url.path == "/ledgers":
+            cursor = query.get("cursor", ["now"])[0]
+            first = 100 if cursor == "now" else int(cursor) + 1
+            for sequence in range(first, first + EVENTS_PER_CONNECTION):
+                record = {"sequence": sequence, "paging_token": str(sequence), "operation_count": 7,
+                          "transaction_count": 3, "base_fee_in_stroops": 100}
+                self.wfile.write(f"id: {sequence}\ndata: {json.dumps(record)}\n\n".encode())
+                self.wfile.flush()
+        elif url.path == "/order_book":
+            book = {"bids": [{"price": "0.99", "amount": "10"}], "asks": [{"price": "1.01", "amount": "5"}]}
+            self.wfile.write(b": keep-alive\n\n")
+            self.wfile.write(f"id: 1-1\ndata: {json.dumps(book)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(0.2)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    StandInHorizon.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHorizon)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_sse_parser_handles_comments_multiline_data_and_retry():
+    lines = [": comment", "retry: 250", "id: 5", "data: {\"a\":", "data: 1}", "", "data: \"hello\"", ""]
+    events = list(iter_sse_events(lines))
+    assert events[0] == {"event": "message", "data": "{\"a\":\n1}", "id": "5", "retry": 250}
+    assert events[1]["data"] == "\"hello\""
+
+
+def test_ledger_stream_reconnects_from_last_cursor():
+    server = start_server()
+    ingestor = HorizonStreamIngestor(f"http://127.0.0.1:{server.server_port}", PooledHttpClient())
+    ingestor.subscribe_ledgers()
+    ingestor.start()
+    try:
+        subscription = ingestor._subscriptions["ledgers"]
+        assert wait_for(lambda: subscription.events_received >= 2 * EVENTS_PER_CONNECTION)
+
+        ledger_requests = [r for r in StandInHorizon.requests_seen if r["path"] == "/ledgers"]
+        assert ledger_requests[0]["cursor"] == "now"
+        assert ledger_requests[0]["last_event_id"] is None
+        # Second connection resumes right after the last event of the first one
+        assert ledger_requests[1]["cursor"] == "102"
+        assert ledger_requests[1]["last_event_id"] == "102"
+        assert subscription.reconnects >= 1
+        assert ingestor.get_latest_ledger()["sequence"] >= 105
+    finally:
+        ingestor.stop()
+        server.shutdown()
+
+    # Reads are only served while the stream is running
+    assert ingestor.get_latest_ledger() is None
+
+
+def test_order_book_stream_keeps_latest_book_in_memory():
+    server = start_server()
+    ingestor = HorizonStreamIngestor(f"http://127.0.0.1:{server.server_port}", PooledHttpClient())
+    ingestor.subscribe_order_book("AQUA", {"selling_asset_code": "AQUA", "selling_asset_issuer": None})
+    ingestor.start()
+    try:
+        books = []
+        assert wait_for(lambda: books.append(ingestor.get_order_book("AQUA")) or books[-1] is not None)
+        book = books[-1]
+        assert book["bids"][0]["price"] == "0.99"
+        assert book["asks"][0]["amount"] == "5"
+
+        book_requests = [r for r in StandInHorizon.requests_seen if r["path"] == "/order_book"]
+        assert book_requests[0]["cursor"] is None
+        assert ingestor.status()["subscriptions"]["order_book:AQUA"]["events_received"] >= 1
+
+        # Once the stream can't reconnect, the last book it delivered is no longer served
+        server.shutdown()
+        server.server_close()
+        assert wait_for(lambda: ingestor.get_order_book("AQUA") is None)
+        assert ingestor.is_running() and "AQUA" in ingestor.order_books
+    finally:
+        ingestor.stop()
+        server.shutdown()
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def test_polled_order_books_are_analyzed_once_per_ledger(monkeypatch):
+    book = {"bids": [{"price": "0.99", "amount": "10"}], "asks": [{"price": "1.01", "amount": "5"}]}
+    responses = {"/assets": {"_embedded": {"records": [{"accounts": {"authorized": 3}}]}}, "/order_book": book}
+    monkeypatch.setattr(ai_strategies_simple.http_client, "get",
+                        lambda url, **kwargs: FakeResponse(responses[urlparse(url).path]))
+    engine = ai_strategies_simple.SimpleMarketDataEngine()
+    ledger = {"sequence": 100}
+    monkeypatch.setattr(engine.market_data_cache, "peek",
+                        lambda max_age_seconds=None: {"stellar_network": {"latest_ledger": ledger["sequence"]}})
+
+    first = engine.get_real_stellar_asset_data("AQUA", "ISSUER")
+    second = engine.get_real_stellar_asset_data("AQUA", "ISSUER")
+    assert first["order_book"] == second["order_book"] and first["order_book"]["spread_bps"] > 0
+    assert engine.orderbook_analytics.stats()["hits"] == 1
+
+    # The next ledger can carry a different book, so it is analyzed again
+    ledger["sequence"] = 101
+    engine.get_real_stellar_asset_data("AQUA", "ISSUER")
+    assert engine.orderbook_analytics.stats() == {"cached_books": 2, "hits": 1, "misses": 2}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the incremental indicator engine against a batch recomputation
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.incremental_indicators import IndicatorBook, TokenIndicators, compute_indicators, RESYNC_EVERY
+
+
+def random_walk(n, seed=7):
+    rng = np.random.default_rng(seed)
+    prices = 0.12 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    volumes = rng.uniform(10000, 1000000, n)
+    return prices, volumes
+
+
+def assert_matches(incremental, batch):
+    assert incremental.keys() == batch.keys()
+    for key, value in batch.items():
+        assert np.isclose(incremental[key], value, rtol=1e-9, atol=1e-12), key
+
+
+def test_matches_batch_recomputation_after_every_append():
+    prices, volumes = random_walk(300)
+    indicators = TokenIndicators()
+    for i, (price, volume) in enumerate(zip(prices, volumes), start=1):
+        indicators.append(price, volume)
+        batch = compute_indicators(prices[:i], volumes[:i])
+        if batch is None:
+            assert indicators.snapshot() is None
+        else:
+            assert_matches(indicators.snapshot(), batch)
+
+
+def test_long_history_stays_in_parity_across_resyncs():
+    prices, volumes = random_walk(3 * RESYNC_EVERY + 17, seed=11)
+    indicators = TokenIndicators()
+    for price, volume in zip(prices, volumes):
+        indicators.append(price, volume)
+    assert_matches(indicators.snapshot(), compute_indicators(prices, volumes))
+
+
+def test_flat_prices_keep_rsi_and_bands_finite():
+    indicators = TokenIndicators()
+    for _ in range(25):
+        indicators.append(1.0, 500.0)
+    snapshot = indicators.snapshot()
+    assert snapshot["rsi"] == 0.0
+    assert snapshot["bb_position"] == 0.5
+    assert_matches(snapshot, compute_indicators(np.ones(25), np.full(25, 500.0)))
+
+
+def test_indicator_book_tracks_tokens_independently():
+    book = IndicatorBook()
+    xlm_prices, xlm_volumes = random_walk(30, seed=1)
+    aqua_prices, aqua_volumes = random_walk(10, seed=2)
+    for price, volume in zip(xlm_prices, xlm_volumes):
+        book.append("XLM", price, volume)
+    for price, volume in zip(aqua_prices, aqua_volumes):
+        book.append("AQUA", price, volume)
+
+    assert_matches(book.get("XLM"), compute_indicators(xlm_prices, xlm_volumes))
+    assert book.get("AQUA") is None  # Fewer than 14 points
+    assert book.get("BTC") is None
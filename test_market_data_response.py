@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for /market-data conditional GET, gzip negotiation and field projection
+"""
+
+import gzip
+import json
+import os
+import sys
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies_simple import RESPONSE_CACHE_SIZE, ai_strategies_bp, market_engine
+from src.services.response_cache import ResponseCache
+
+MARKET_DATA = {
+    "status": "success",
+    "timestamp": "2026-01-01T00:00:00",
+    "stellar_network": {"status": "success", "latest_ledger": 100, "total_assets": 150},
+    "soroswap": {"status": "success", "data": [{"symbol": f"PAIR{i}", "volume_24h": i} for i in range(200)]},
+    "overview": {"total_pairs": 200, "market_status": "Active"}
+}
+
+
+def market_data_client(monkeypatch):
+    cache_info = {"state": "fresh", "age_seconds": 12.5, "version": 1}
+    monkeypatch.setattr(market_engine.market_data_cache, "get", lambda: (MARKET_DATA, cache_info))
+    monkeypatch.setattr(market_engine, "response_cache", ResponseCache(RESPONSE_CACHE_SIZE))
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+    return app.test_client()
+
+
+def test_matching_etag_returns_304(monkeypatch):
+    client = market_data_client(monkeypatch)
+    first = client.get("/api/ai/market-data")
+    assert first.status_code == 200 and first.get_json() == MARKET_DATA
+    assert (first.headers["Age"], first.headers["X-Cache-State"]) == ("12", "fresh")
+
+    etag = first.headers["ETag"]
+    revalidated = client.get("/api/ai/market-data", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.data == b""
+    assert revalidated.headers["ETag"] == etag
+    assert client.get("/api/ai/market-data", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_large_bodies_are_gzipped_when_accepted(monkeypatch):
+    client = market_data_client(monkeypatch)
+    plain = client.get("/api/ai/market-data")
+    compressed = client.get("/api/ai/market-data", headers={"Accept-Encoding": "gzip, deflate"})
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(compressed.data) < len(plain.data)
+    assert json.loads(gzip.decompress(compressed.data)) == MARKET_DATA
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+
+
+def test_fields_projection(monkeypatch):
+    client = market_data_client(monkeypatch)
+    response = client.get("/api/ai/market-data?fields=overview,stellar_network,missing")
+    assert response.get_json() == {
+        "overview": MARKET_DATA["overview"],
+        "stellar_network": MARKET_DATA["stellar_network"]
+    }
+    # Small enough to skip compression
+    assert "Content-Encoding" not in client.get(
+        "/api/ai/market-data?fields=overview", headers={"Accept-Encoding": "gzip"}
+    ).headers
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for versioned model artifacts: the CURRENT pointer, rollback and memory-mapped loads
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies import AIStrategyEngine
+from src.services.model_store import ModelStore
+from src.services.training import fit_forest_bundle
+
+
+def fit(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 4))
+    y = X[:, 0] * 0.01 + rng.normal(0, 0.001, 200)
+    bundle, _ = fit_forest_bundle(X, y, ["a", "b", "c", "d"], n_estimators=5, random_state=seed, max_depth=4)
+    return bundle
+
+
+def predict(bundle, X):
+    return bundle["model"].predict(bundle["scaler"].transform(X))
+
+
+def test_save_rollback_and_reload(tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    assert store.current_version() is None and store.load() == (None, None)
+    first, second = fit(1), fit(2)
+    X = np.random.default_rng(3).normal(size=(20, 4))
+
+    assert store.save(first, {"training_samples": 200})["version"] == "v0001"
+    assert store.save(second, {"training_samples": 200})["version"] == "v0002"
+    assert store.current_version() == "v0002" and store.previous_version() == "v0001"
+
+    store.set_current(store.previous_version())
+    assert store.current_version() == "v0001" and store.previous_version() is None
+    assert [(m["version"], m["current"]) for m in store.list_versions()] == [("v0001", True), ("v0002", False)]
+
+    # A fresh store on the same directory follows the pointer; arrays come back memory-mapped
+    loaded, metadata = ModelStore(str(tmp_path / "models")).load()
+    assert metadata["version"] == "v0001"
+    assert isinstance(loaded["scaler"].mean_, np.memmap)
+    assert not isinstance(store.load("v0001", mmap=False)[0]["scaler"].mean_, np.memmap)
+    assert np.array_equal(predict(loaded, X), predict(first, X))
+    assert np.array_equal(predict(store.load("v0002", mmap=False)[0], X), predict(second, X))
+
+    try:
+        store.set_current("v0009")
+        assert False, "unknown versions must be rejected"
+    except KeyError:
+        pass
+
+
+def test_engine_serves_the_current_version_and_follows_rollbacks(tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    first, second = fit(1), fit(2)
+    store.save(first, {"training_samples": 200})
+    store.save(second, {"training_samples": 200})
+    X = np.random.default_rng(4).normal(size=(5, 4))
+
+    engine = AIStrategyEngine(model_store=store)
+    assert engine.load_artifact() and engine.model_version == "v0002"
+    assert np.array_equal(engine.active_model["flat_model"].predict(X), predict(second, X))
+
+    # Rolled back by another worker: the next sync serves the older model
+    store.set_current("v0001")
+    engine.sync_with_store()
+    assert engine.model_version == "v0001"
+    assert np.array_equal(engine.active_model["flat_model"].predict(X), predict(first, X))
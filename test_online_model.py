@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the rolling online forest used for incremental model updates
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services.online_model import OnlineForest
+
+
+def make_rows(n, seed=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 1, (n, 3))
+    return X, (X[:, 0] > 0).astype(float)
+
+
+def test_no_trees_until_min_rows():
+    X, y = make_rows(20)
+    model = OnlineForest(min_rows=10)
+    assert model.partial_fit(X[:9], y[:9]) == 0
+    assert model.predict(X) is None
+    assert model.partial_fit(X[9:10], y[9:10]) == 10  # Rows held back until min_rows grow trees now
+    assert model.is_ready
+
+
+def test_forest_and_window_stay_bounded():
+    X, y = make_rows(500)
+    model = OnlineForest(max_trees=5, window_rows=100, min_rows=1, random_state=0)
+    model.partial_fit(X[:300], y[:300])
+    for i in range(300, 500):
+        model.partial_fit(X[i:i + 1], y[i:i + 1])
+    status = model.status()
+    assert status["trees"] == 5
+    assert status["window_rows"] == 100
+    assert status["rows_seen"] == 500
+    assert status["trees_grown"] == 5 + 200
+
+
+def test_learns_the_signal_from_recent_rows():
+    X, y = make_rows(2000)
+    model = OnlineForest(window_rows=500, random_state=0)
+    model.partial_fit(X[:1000], y[:1000])
+    for i in range(1000, 1100):
+        model.partial_fit(X[i:i + 1], y[i:i + 1])
+    predicted = model.predict(X[1100:]) > 0.5
+    assert (predicted == y[1100:].astype(bool)).mean() > 0.9
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized order book analytics and their per-version cache
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.services import orderbook_analytics
+from src.services.orderbook_analytics import OrderBookAnalytics
+
+# Levels out of order, amounts as strings, as Horizon sends them
+BOOK = {
+    "bids": [{"price": "0.985", "amount": "200"}, {"price": "0.99", "amount": "100"}, {"price": "0.95", "amount": "1000"}],
+    "asks": [{"price": "1.02", "amount": "100"}, {"price": "1.10", "amount": "10"}, {"price": "1.01", "amount": "50"}]
+}
+
+
+def test_hand_computed_book():
+    result = OrderBookAnalytics().analyze("AQUA", BOOK)
+    assert (result["best_bid"], result["best_ask"], result["mid"]) == (0.99, 1.01, 1.0)
+    assert np.isclose(result["spread"], 0.02) and np.isclose(result["spread_bps"], 200)
+    assert (result["bid_levels"], result["ask_levels"]) == (3, 3)
+    assert np.isclose(result["total_notional"], 99 + 197 + 950 + 50.5 + 102 + 11)
+
+    # Bid notional within mid x (1 - band), ask notional within mid x (1 + band); band edges included
+    expected = {"0.5%": (0, 0), "1%": (99, 50.5), "2%": (296, 152.5), "5%": (1246, 152.5)}
+    assert list(result["depth"]) == list(expected)
+    for band, (bid, ask) in expected.items():
+        depth = result["depth"][band]
+        assert np.isclose(depth["bid"], bid) and np.isclose(depth["ask"], ask), band
+        assert np.isclose(depth["imbalance"], (bid - ask) / (bid + ask) if bid + ask else 0.0), band
+
+
+def test_one_sided_book_has_no_mid():
+    result = OrderBookAnalytics().analyze("AQUA", {"bids": BOOK["bids"], "asks": []})
+    assert result["mid"] is None and result["depth"] == {} and np.isclose(result["total_notional"], 1246)
+
+
+def test_each_version_is_parsed_once(monkeypatch):
+    parsed = []
+    parse = orderbook_analytics.parse_order_book
+    monkeypatch.setattr(orderbook_analytics, "parse_order_book", lambda book: parsed.append(1) or parse(book))
+    analytics = OrderBookAnalytics(max_cached=2)
+
+    first = analytics.analyze("AQUA", BOOK, version=7)
+    assert analytics.analyze("AQUA", BOOK, version=7) is first and len(parsed) == 1
+    analytics.analyze("USDC", BOOK, version=7)  # Same version, other pair
+    analytics.analyze("AQUA", BOOK, version=8)
+    analytics.analyze("AQUA", BOOK)  # Unversioned books are never cached
+    analytics.analyze("AQUA", BOOK)
+    assert len(parsed) == 5
+    assert analytics.stats() == {"cached_books": 2, "hits": 1, "misses": 5}  # Oldest entry evicted
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for parameter sweep search expansion, shared-memory scoring and the Pareto front
+"""
+
+import os
+import sys
+
+import numpy as np
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies import ai_strategies_bp, parameter_sweeps
+from src.services.mock_data import generate_mock_panel
+from src.services.parameter_sweep import (
+    build_sweep_dataset, evaluate_model, expand_search, group_by_model, measure_inference_latency, pareto_front,
+    serving_predictor, share_arrays
+)
+from src.services.strategy_signals import DEFAULT_STRATEGY_CONFIG, signal_confidence
+from src.services.training import STRATEGY_FEATURE_NAMES, fit_forest_bundle
+
+SMALL_SPACE = {
+    "n_estimators": [5, 10],
+    "max_depth": [4],
+    "strong_signal_return": [0.005, 0.02],
+    "moderate_signal_return": [0.001, 0.005],
+    "reversal_confidence_boost": [1.2],
+    "neutral_rsi_confidence_factor": [0.8],
+    "high_volume_confidence_boost": [1.1],
+    "low_volume_confidence_factor": [0.8]
+}
+
+
+def test_grid_skips_inverted_thresholds_and_random_samples_it():
+    grid = expand_search(SMALL_SPACE)
+    assert len(grid) == 2 * 3  # (0.005, 0.005) leaves no moderate band
+    assert all(c["moderate_signal_return"] < c["strong_signal_return"] for c in grid)
+    sample = expand_search(SMALL_SPACE, mode="random", n_samples=4, seed=1)
+    assert len(sample) == 4 and all(c in grid for c in sample)
+    assert [settings for settings, _ in group_by_model(grid)] == [
+        {"n_estimators": 5, "max_depth": 4}, {"n_estimators": 10, "max_depth": 4}
+    ]
+
+
+def test_workers_score_from_shared_memory():
+    panel = generate_mock_panel(2, 24 * 20, seed=2)
+    dataset = build_sweep_dataset(panel["close"], panel["high"], panel["low"], panel["volume"])
+    blocks, spec = share_arrays(dataset)
+    try:
+        settings, configs = group_by_model(expand_search(SMALL_SPACE))[0]
+        results = evaluate_model(spec, settings, configs, inference_backend="sklearn")
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    assert len(results) == len(configs)
+    for result in results:
+        assert 0.0 <= result["accuracy"] <= 1.0 and 0.0 <= result["coverage"] <= 1.0
+        assert result["inference_us_per_row"] > 0
+
+
+def test_latency_is_timed_on_single_rows_through_the_served_backend():
+    panel = generate_mock_panel(2, 24 * 20, seed=3)
+    dataset = build_sweep_dataset(panel["close"], panel["high"], panel["low"], panel["volume"])
+    bundle, _ = fit_forest_bundle(dataset["X_train"], dataset["y_train"], STRATEGY_FEATURE_NAMES,
+                                  n_estimators=5, max_depth=4)
+
+    rows = dataset["X_test"][:10]
+    flat, sklearn = serving_predictor(bundle, "flat"), serving_predictor(bundle, "sklearn")
+    assert np.array_equal(flat(rows), sklearn(rows))
+    calls = []
+    latency = measure_inference_latency(lambda X: calls.append(X.shape) or flat(X), rows, repeats=2)
+    assert latency > 0 and calls == [(1, rows.shape[1])] * 20
+    try:
+        serving_predictor(bundle, "onnx")
+        assert False, "unknown backends must be rejected"
+    except ValueError:
+        pass
+
+
+def test_promote_rejects_a_non_integer_candidate_id(monkeypatch):
+    monkeypatch.setattr(parameter_sweeps, "status", lambda sweep_id, top=0: {"status": "succeeded"})
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+
+    response = app.test_client().post("/api/ai/sweeps/abc123/promote", json={"candidate_id": "abc"})
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_pareto_front_keeps_only_undominated_candidates():
+    candidates = [
+        {"accuracy": 0.60, "inference_us_per_row": 1.0},
+        {"accuracy": 0.55, "inference_us_per_row": 2.0},  # Slower and less accurate
+        {"accuracy": 0.70, "inference_us_per_row": 3.0},
+        {"accuracy": 0.70, "inference_us_per_row": 4.0}  # Slower for the same accuracy
+    ]
+    assert pareto_front(candidates) == [candidates[0], candidates[2]]
+
+
+def test_vectorized_confidence_matches_recommendation_rules():
+    for predicted, rsi, volume_ratio, expected in [
+        (0.01, 25, 1.0, 0.2 * 1.2),  # Reversal from oversold
+        (-0.01, 50, 2.0, 0.2 * 0.8 * 1.1),  # Neutral RSI, high volume
+        (0.02, 65, 0.3, 0.4 * 0.8),  # Low volume
+        (0.2, 20, 2.0, 0.95)  # Capped
+    ]:
+        confidence = signal_confidence(predicted, rsi, volume_ratio, DEFAULT_STRATEGY_CONFIG)
+        assert np.isclose(confidence, expected)
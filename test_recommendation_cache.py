@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU cache and strategy recommendations memoized per ledger, snapshot and model version
+"""
+
+import os
+import sys
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes import ai_strategies_simple
+from src.routes.ai_strategies_simple import ai_strategies_bp, market_engine
+from src.services.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_recommendation_served_from_memory_within_one_ledger(monkeypatch):
+    ledger = {"sequence": 100}
+    market_data_calls = []
+
+    def fake_market_data():
+        market_data_calls.append(ledger["sequence"])
+        return {
+            "stellar_network": {"status": "success", "latest_ledger": ledger["sequence"], "total_assets": 150,
+                                "operations_count": 800, "transaction_count": 200},
+            "soroswap": {"status": "success", "data": [{"symbol": f"P{i}"} for i in range(25)]}
+        }
+
+    monkeypatch.setattr(market_engine, "get_market_data", fake_market_data)
+    monkeypatch.setattr(market_engine, "is_trained", True)
+    monkeypatch.setattr(market_engine, "model_version", 0)
+    monkeypatch.setattr(market_engine, "recommendation_cache", LRUCache(ai_strategies_simple.RECOMMENDATION_CACHE_SIZE))
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+    client = app.test_client()
+
+    first = client.post("/api/ai/strategy-recommendation", json={})
+    second = client.post("/api/ai/strategy-recommendation", json={})
+    assert first.status_code == second.status_code == 200
+    assert (first.headers["X-Cache-State"], second.headers["X-Cache-State"]) == ("miss", "hit")
+    assert first.get_json() == second.get_json()
+
+    # A new ledger or a new model version recomputes
+    ledger["sequence"] = 101
+    assert client.post("/api/ai/strategy-recommendation", json={}).headers["X-Cache-State"] == "miss"
+    market_engine.model_version += 1
+    assert client.post("/api/ai/strategy-recommendation", json={}).headers["X-Cache-State"] == "miss"
+    assert client.post("/api/ai/strategy-recommendation", json={}).headers["X-Cache-State"] == "hit"
+    assert market_engine.recommendation_cache.stats()["entries"] == 3
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for encoded response bodies reused until the data version they were built from changes
+"""
+
+import os
+import sys
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies_simple import RESPONSE_CACHE_SIZE, ai_strategies_bp, market_engine
+from src.services.response_cache import ResponseCache
+
+
+def test_body_is_built_once_per_version():
+    cache = ResponseCache(4)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b'{"value": %d}' % len(builds)
+
+    first = cache.get("health", 1, build)
+    assert cache.get("health", 1, build) is first and len(builds) == 1
+    assert first.length == len(first.body) and len(first.etag) == 32
+
+    rebuilt = cache.get("health", 2, build)
+    assert rebuilt.body == b'{"value": 2}' and rebuilt.etag != first.etag
+    assert cache.stats()["hits"] == 1 and cache.stats()["builds"] == 2 and cache.stats()["rebuilds"] == 1
+
+
+def test_writes_invalidate_cached_endpoints(monkeypatch):
+    monkeypatch.setattr(market_engine, "response_cache", ResponseCache(RESPONSE_CACHE_SIZE))
+    # Restored afterwards, as install_training_set below writes them
+    for name, value in (("data_version", 0), ("model_version", 0), ("is_trained", False), ("training_data", [])):
+        monkeypatch.setattr(market_engine, name, value)
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+    client = app.test_client()
+
+    first = client.get("/api/ai/health")
+    second = client.get("/api/ai/health")
+    assert second.data == first.data and "timestamp" not in first.get_json()
+    assert second.headers["Date"] and second.date >= first.date  # Check time is per response, not cached
+    assert client.get("/api/ai/historical-data-status").status_code == 200
+    assert market_engine.response_cache.stats()["builds"] == 2
+
+    market_engine.install_training_set({"features": [[0.0]], "feature_names": ["x"]}, 1, None)
+    trained = client.get("/api/ai/health")
+    assert trained.get_json()["model_trained"] is True
+    assert trained.headers["ETag"] != first.headers["ETag"]
+    assert client.get("/api/ai/cache-stats").get_json()["response_cache"]["rebuilds"] == 1
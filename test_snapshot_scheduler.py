@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process snapshot scheduler: skipping overlapping runs, run limits and the control routes
+"""
+
+import os
+import sys
+import threading
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies_simple import ai_strategies_bp, snapshot_scheduler
+from src.services.snapshot_scheduler import SnapshotScheduler
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_slow_runs_are_skipped_instead_of_stacked():
+    release = threading.Event()
+    running = []
+
+    def slow_job():
+        running.append(1)
+        release.wait(5)
+        running.pop()
+        return {"status": "success"}
+
+    scheduler = SnapshotScheduler(slow_job, interval_seconds=0.02, jitter_seconds=0)
+    assert scheduler.start() and not scheduler.start()  # Already running
+    try:
+        assert wait_for(lambda: scheduler.status()["skipped"] >= 3)
+        status = scheduler.status()
+        assert status["running"] and status["collection_in_progress"]
+        assert len(running) == 1 and status["runs"] == 0  # Ticks during the slow run never start a second one
+    finally:
+        assert scheduler.stop()
+        release.set()
+    assert wait_for(lambda: not scheduler.is_running())
+    assert wait_for(lambda: scheduler.status()["runs"] == 1)
+    assert scheduler.status()["next_run_at"] is None and not scheduler.stop()
+
+
+def test_max_runs_ends_the_loop():
+    calls = []
+    scheduler = SnapshotScheduler(lambda: calls.append(1), interval_seconds=0.01, jitter_seconds=0)
+    scheduler.start(max_runs=3)
+    assert wait_for(lambda: not scheduler.is_running() and scheduler.status()["runs"] == 3)
+    assert len(calls) == 3 and scheduler.status()["last_status"] == "success"
+
+
+def test_start_route_rejects_non_positive_limits():
+    app = Flask(__name__)
+    app.register_blueprint(ai_strategies_bp, url_prefix="/api/ai")
+    client = app.test_client()
+    for settings in ({"max_runs": 0}, {"days": 0}, {"max_runs": -2}, {"days": "soon"}):
+        response = client.post("/api/ai/scheduler/start", json={"interval_seconds": 60, "jitter_seconds": 1, **settings})
+        assert response.status_code == 400, settings
+    assert not snapshot_scheduler.is_running()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-worker mode: the SQLite leader lease, shared state versions and engine sync
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend", "stellar-ai-backend"))
+
+from src.routes.ai_strategies_simple import SimpleMarketDataEngine
+from src.services.feature_store import MARKET_FEATURE_COLUMNS
+from src.services.shared_state import LeaderLease, SharedState
+from src.services.snapshot_store import SnapshotStore
+from src.services.training import build_market_training_set
+from src.services.training_jobs import TERMINAL_STATES, TrainingJobManager
+from src.services.worker_coordinator import WorkerCoordinator
+
+
+def make_snapshot(snapshot_id):
+    return {
+        "snapshot_id": snapshot_id,
+        "timestamp": f"2026-01-01T{snapshot_id:02d}:00:00",
+        "tokens": [{"code": code, "price": 1.0 + snapshot_id / 100, "volume": 1000.0 * snapshot_id,
+                    "market_cap": 1e6, "change_24h": 0.01 * (snapshot_id % 3 - 1)} for code in ("XLM", "USDC")]
+    }
+
+
+def test_lease_has_one_holder_until_it_expires(tmp_path):
+    db_path = str(tmp_path / "app.db")
+    first = LeaderLease(db_path, "collector", ttl_seconds=0.2, holder="first")
+    second = LeaderLease(db_path, "collector", ttl_seconds=0.2, holder="second")
+    assert first.acquire() and not second.acquire()
+    assert first.acquire()  # Renewal
+    time.sleep(0.3)
+    assert second.acquire() and not first.acquire()
+    second.release()
+    assert first.acquire()
+
+
+def test_coordinator_elects_once_and_hands_over_on_stop(tmp_path):
+    db_path = str(tmp_path / "app.db")
+    events = []
+    workers = [
+        WorkerCoordinator(LeaderLease(db_path, "collector", holder=name), sync=lambda: None,
+                          on_elected=lambda name=name: events.append(("elected", name)),
+                          on_demoted=lambda name=name: events.append(("demoted", name)))
+        for name in ("a", "b")
+    ]
+    for worker in workers:
+        worker.run_once()
+    assert [worker.is_leader for worker in workers] == [True, False]
+    workers[0].start()
+    workers[0].stop()
+    workers[1].run_once()
+    assert events == [("elected", "a"), ("demoted", "a"), ("elected", "b")]
+
+
+def test_shared_state_versions_every_write(tmp_path):
+    state = SharedState(str(tmp_path / "app.db"))
+    assert state.get("model") == (0, None)
+    assert state.put("model", {"n": 1}) == 1 and state.put("model", {"n": 2}) == 2
+    assert state.get("model") == (2, {"n": 2}) and state.version("model") == 2
+
+
+def test_followers_sync_snapshots_model_and_jobs(tmp_path):
+    db_path = str(tmp_path / "app.db")
+    store = SnapshotStore(db_path)
+    leader, follower = SimpleMarketDataEngine(), SimpleMarketDataEngine()
+    try:
+        for engine in (leader, follower):
+            engine.attach_snapshot_store(store)
+            engine.attach_shared_state(SharedState(db_path), coordinator=None)
+
+        for snapshot_id in range(1, 7):
+            store.append(make_snapshot(snapshot_id))
+        leader.sync_from_store()
+        leader.install_training_set({"features": [[1.0]], "targets": [1], "feature_names": ["x"]}, 6, None)
+        follower.sync_from_store()
+
+        assert follower.latest_snapshot_id() == 6 and follower.next_snapshot_id == 7
+        assert len(follower.feature_store) == len(leader.feature_store) == 6
+        assert follower.is_trained and follower.model_version == leader.model_version == 1
+        assert follower.training_data == leader.training_data
+        assert follower.training_job_status("missing") == (None, False)
+    finally:
+        store.close()
+
+
+def test_jobs_are_visible_to_other_workers_as_soon_as_they_change(tmp_path):
+    db_path = str(tmp_path / "app.db")
+    store = SnapshotStore(db_path)
+    submitter, other = SimpleMarketDataEngine(), SimpleMarketDataEngine()
+    submitter.job_manager, other.job_manager = TrainingJobManager(), TrainingJobManager()
+    try:
+        for engine in (submitter, other):
+            engine.attach_snapshot_store(store)
+            engine.attach_shared_state(SharedState(db_path), coordinator=None)
+        for snapshot_id in range(1, 7):
+            store.append(make_snapshot(snapshot_id))
+        submitter.sync_from_store()
+
+        # No sync pass in between: the submit itself publishes the job
+        job = submitter.job_manager.submit(
+            "market_model", build_market_training_set, submitter.feature_store.columns(MARKET_FEATURE_COLUMNS)
+        )
+        seen, local = other.training_job_status(job["job_id"])
+        assert not local and seen["job_id"] == job["job_id"] and seen["status"] == "queued"
+
+        # Nothing runs sync_from_store here, so only the finish notification can publish the outcome
+        deadline = time.monotonic() + 60
+        while other.training_job_status(job["job_id"])[0]["status"] not in TERMINAL_STATES:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert other.training_job_status(job["job_id"])[0]["status"] == "succeeded"
+    finally:
+        submitter.job_manager.shutdown()
+        store.close()
+
+
+def test_collectors_never_reuse_snapshot_ids_across_a_handover(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "app.db")
+    store = SnapshotStore(db_path)
+    first, second = SimpleMarketDataEngine(), SimpleMarketDataEngine()
+    try:
+        for engine in (first, second):
+            engine.attach_snapshot_store(store)
+            engine.attach_shared_state(SharedState(db_path), coordinator=None)
+            # Every asset falls back to generated prices; no network
+            monkeypatch.setattr(engine, "fetch_assets_concurrently", lambda assets: ({}, set()))
+
+        first.collect_historical_data()
+        first.collect_historical_data()
+        # The second worker takes over before it has synced; its id still comes after the first worker's
+        collected = second.collect_historical_data()["current_snapshot"]
+        assert collected["snapshot_id"] == 3
+        first.sync_from_store()
+
+        stored = store.load_recent(10)
+        assert [snapshot["snapshot_id"] for snapshot in stored] == [1, 2, 3]
+        assert stored[1]["timestamp"] == first.historical_data[1]["timestamp"]  # Not overwritten
+        assert list(first.historical_data) == list(second.historical_data) == stored
+        assert len(first.feature_store) == len(second.feature_store) == 3
+
+        # A newly elected coordinator has synced before its on_elected callback runs
+        seen_at_election = []
+        lease = LeaderLease(db_path, "collector", holder="second")
+        store.insert(make_snapshot(0))
+        WorkerCoordinator(lease, sync=second.sync_from_store,
+                          on_elected=lambda: seen_at_election.append(second.latest_snapshot_id())).run_once()
+        assert seen_at_election == [4]
+    finally:
+        store.close()